@@ -1,4 +1,4 @@
-from .fields import DjangoConnectionField, DjangoListField
+from .fields import DjangoConnectionField, DjangoListField, DjangoNodesField
 from .types import DjangoObjectType
 from .utils import bypass_get_queryset
 
@@ -9,5 +9,6 @@ __all__ = [
     "DjangoObjectType",
     "DjangoListField",
     "DjangoConnectionField",
+    "DjangoNodesField",
     "bypass_get_queryset",
 ]
@@ -1 +1,3 @@
 MUTATION_ERRORS_FLAG = "graphene_mutation_has_errors"
+STREAMING_RESPONSE_FLAG = "graphene_streaming_response"
+BATCH_LOADERS_ATTRIBUTE = "graphene_batch_loaders"
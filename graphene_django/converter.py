@@ -1,5 +1,6 @@
 import inspect
 from functools import partial, singledispatch, wraps
+from operator import attrgetter
 
 from django.db import models
 from django.utils.encoding import force_str
@@ -25,7 +26,11 @@ from graphene import (
     Time,
 )
 from graphene.types.json import JSONString
-from graphene.types.resolver import get_default_resolver
+from graphene.types.resolver import (
+    attr_resolver,
+    dict_or_attr_resolver,
+    get_default_resolver,
+)
 from graphene.types.scalars import BigInt
 from graphene.utils.str_converters import to_camel_case
 
@@ -38,44 +43,74 @@ from graphql.pyutils import register_description
 
 from .compat import ArrayField, HStoreField, RangeField, normalize_choices
 from .fields import DjangoConnectionField, DjangoListField
+from .loaders import get_related_object, get_reverse_related_object
 from .settings import graphene_settings
 from .utils.str_converters import to_const
 
 
+def get_resolved_attribute_name(resolver):
+    """
+    Returns the name of the attribute read by ``resolver`` if it is one of
+    graphene's attribute resolvers bound to a field, or ``None``.
+    """
+    if (
+        isinstance(resolver, partial)
+        and resolver.func in (attr_resolver, dict_or_attr_resolver)
+        and len(resolver.args) == 2
+        and not resolver.keywords
+    ):
+        return resolver.args[0]
+    return None
+
+
 class BlankValueField(Field):
+    # Whether the members of `models.Choices` resolve to their value
+    resolve_choices_value = False
+
     def wrap_resolve(self, parent_resolver):
         resolver = self.resolver or parent_resolver
+        resolve_choices_value = self.resolve_choices_value
+
+        # A single wrapper resolving blank values to None, and the members of
+        # `models.Choices` to their value for EnumValueField.
+        attname = get_resolved_attribute_name(resolver)
+        if attname is None:
 
-        # create custom resolver
-        def blank_field_wrapper(func):
-            @wraps(func)
+            @wraps(resolver)
             def wrapped_resolver(*args, **kwargs):
-                return_value = func(*args, **kwargs)
+                return_value = resolver(*args, **kwargs)
                 if return_value == "":
                     return None
+                if resolve_choices_value and isinstance(return_value, models.Choices):
+                    return return_value.value
                 return return_value
 
             return wrapped_resolver
 
-        return blank_field_wrapper(resolver)
+        get_attribute = attrgetter(attname)
 
+        @wraps(resolver)
+        def wrapped_attribute_resolver(root, info, **args):
+            # Read the attribute directly instead of calling the default
+            # resolver, which handles dicts and missing attributes.
+            if isinstance(root, dict):
+                return_value = resolver(root, info, **args)
+            else:
+                try:
+                    return_value = get_attribute(root)
+                except AttributeError:
+                    return_value = resolver(root, info, **args)
+            if return_value == "":
+                return None
+            if resolve_choices_value and isinstance(return_value, models.Choices):
+                return return_value.value
+            return return_value
 
-class EnumValueField(BlankValueField):
-    def wrap_resolve(self, parent_resolver):
-        resolver = super().wrap_resolve(parent_resolver)
+        return wrapped_attribute_resolver
 
-        # create custom resolver
-        def enum_field_wrapper(func):
-            @wraps(func)
-            def wrapped_resolver(*args, **kwargs):
-                return_value = func(*args, **kwargs)
-                if isinstance(return_value, models.Choices):
-                    return_value = return_value.value
-                return return_value
 
-            return wrapped_resolver
-
-        return enum_field_wrapper(resolver)
+class EnumValueField(BlankValueField):
+    resolve_choices_value = True
 
 
 def convert_choice_name(name):
@@ -272,8 +307,6 @@ def convert_time_to_string(field, registry=None):
 
 @convert_django_field.register(models.OneToOneRel)
 def convert_onetoone_field_to_djangomodel(field, registry=None):
-    from graphene.utils.str_converters import to_snake_case
-
     from .types import DjangoObjectType
 
     model = field.related_model
@@ -312,19 +345,11 @@ def convert_onetoone_field_to_djangomodel(field, registry=None):
                         # the default Django resolver
                         return fk_obj
 
-                    field_name = to_snake_case(info.field_name)
-                    reversed_field_name = root.__class__._meta.get_field(
-                        field_name
-                    ).remote_field.name
-                    try:
-                        return _type.get_queryset(
-                            _type._meta.model.objects.filter(
-                                **{reversed_field_name: root.pk}
-                            ),
-                            info,
-                        ).get()
-                    except _type._meta.model.DoesNotExist:
-                        return None
+                    # Fetch the objects pointing to the siblings of root
+                    # with the same query.
+                    return get_reverse_related_object(
+                        _type, info, root, field.remote_field
+                    )
 
                 return custom_resolver
 
@@ -434,7 +459,14 @@ def convert_field_to_djangomodel(field, registry=None):
                         # the default Django resolver
                         return fk_obj
 
-                    instance_from_get_node = _type.get_node(info, object_pk)
+                    if _type.get_node.__func__ is DjangoObjectType.get_node.__func__:
+                        # Fetch the objects referenced by the siblings of
+                        # root with the same query.
+                        instance_from_get_node = get_related_object(
+                            _type, info, root, db_field_key
+                        )
+                    else:
+                        instance_from_get_node = _type.get_node(info, object_pk)
 
                     if instance_from_get_node is None:
                         # no instance to return
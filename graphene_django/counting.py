@@ -0,0 +1,145 @@
+"""
+Strategies counting the rows of the querysets of connections.
+
+The count is only needed to fill the ``length`` of a connection, e.g. for a
+``totalCount`` field. ``DjangoConnectionField`` paginates forward without it,
+so approximate counts never make ``pageInfo`` wrong. Backward pagination still
+counts the rows exactly, since the page is located from the end.
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from .settings import graphene_settings
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+
+
+class CountStrategy(ABC):
+    """
+    Base class of the count strategies. ``exact`` tells whether ``count``
+    always returns the exact number of rows of the queryset.
+    """
+
+    exact = False
+
+    @abstractmethod
+    def count(self, queryset):
+        """
+        Returns the number of rows of ``queryset``.
+        """
+
+
+class ExactCount(CountStrategy):
+    exact = True
+
+    def count(self, queryset):
+        return queryset.count()
+
+
+class CachedCount(CountStrategy):
+    """
+    Caches the exact count of a queryset for ``timeout`` seconds in the Django
+    cache named ``cache_alias``. The cache key is a hash of the SQL of the
+    queryset, which holds the filters of the connection as well as those of
+    ``get_queryset``, so that counts aren't shared by querysets filtered
+    differently, e.g. for different users.
+    """
+
+    def __init__(
+        self, timeout=60, cache_alias=DEFAULT_CACHE_ALIAS, key_prefix="graphene-count"
+    ):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+    def get_cache_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def count(self, queryset):
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.timeout)
+        return count
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Returns the number of rows estimated by the query planner when it is at
+    least ``threshold``, and counts them exactly otherwise, so that small
+    results stay exact. Only PostgreSQL provides estimates, querysets of
+    other databases are counted exactly.
+    """
+
+    def __init__(self, threshold=10000):
+        self.threshold = threshold
+
+    def estimate(self, queryset):
+        """
+        Returns the number of rows of the queryset estimated by ``EXPLAIN``,
+        or ``None`` if the database doesn't provide an estimate.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def count(self, queryset):
+        estimate = self.estimate(queryset)
+        if estimate is not None and estimate >= self.threshold:
+            return estimate
+        return queryset.count()
+
+
+COUNT_STRATEGIES = {
+    COUNT_EXACT: ExactCount,
+    COUNT_CACHED: CachedCount,
+    COUNT_ESTIMATED: EstimatedCount,
+}
+
+
+def get_count_strategy(count=None):
+    """
+    Returns the count strategy of ``count``: ``"exact"``, ``"cached"``,
+    ``"estimated"``, a ``CountStrategy`` instance, or the import path of one.
+    Defaults to the ``RELAY_CONNECTION_COUNT`` setting.
+    """
+    if count is None:
+        count = graphene_settings.RELAY_CONNECTION_COUNT
+    if isinstance(count, str):
+        if count in COUNT_STRATEGIES:
+            return COUNT_STRATEGIES[count]()
+        if "." not in count:
+            raise ValueError(
+                f"Unknown count strategy {count!r}, expected one of "
+                f"{', '.join(map(repr, COUNT_STRATEGIES))} or the import path "
+                "of a CountStrategy."
+            )
+        try:
+            count = import_string(count)
+        except ImportError as e:
+            raise ImportError(f"Could not import count strategy {count!r}: {e}") from e
+    if isinstance(count, type):
+        count = count()
+    assert isinstance(
+        count, CountStrategy
+    ), f"Unknown count strategy {count!r}, expected a CountStrategy."
+    return count
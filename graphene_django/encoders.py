@@ -0,0 +1,190 @@
+"""
+JSON encoders used by GraphQLView to serialize responses.
+
+The encoder is chosen with the ``JSON_ENCODER`` setting. By default the
+fastest available library is used: ``orjson``, then ``ujson``, falling back to
+the standard library. Every encoder serializes values that aren't natively
+supported by JSON (``Decimal``, ``UUID``, dates and times, lazy translation
+strings) the same way as Django's ``DjangoJSONEncoder``.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .settings import graphene_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+_django_json_encoder = DjangoJSONEncoder()
+
+
+def default(o):
+    return _django_json_encoder.default(o)
+
+
+class JSONEncoder(ABC):
+    """
+    Base class of the response encoders.
+    """
+
+    @abstractmethod
+    def encode(self, data, pretty=False):
+        """
+        Returns either ``str`` or ``bytes``, always the same type for a given
+        encoder, compact by default, or indented with sorted keys when
+        ``pretty`` is set.
+        """
+
+    def iterencode(self, data, buffer_size=65536):
+        """
+        Yields the compact encoding of ``data`` as ``bytes`` chunks of roughly
+        ``buffer_size`` bytes. Dicts are walked key by key and list items are
+        encoded one at a time, then released from the list so the memory they
+        hold can be reclaimed while the response is being sent.
+        """
+        buffer = []
+        size = 0
+        for piece in self._iterencode(data):
+            if isinstance(piece, str):
+                piece = piece.encode()
+            buffer.append(piece)
+            size += len(piece)
+            if size >= buffer_size:
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b"".join(buffer)
+
+    def _iterencode(self, data):
+        if isinstance(data, dict):
+            yield "{"
+            for i, (key, value) in enumerate(data.items()):
+                if i:
+                    yield ","
+                yield self.encode(str(key))
+                yield ":"
+                yield from self._iterencode(value)
+            yield "}"
+        elif isinstance(data, list):
+            yield "["
+            for i in range(len(data)):
+                if i:
+                    yield ","
+                yield self.encode(data[i])
+                data[i] = None
+            yield "]"
+        else:
+            yield self.encode(data)
+
+
+class StdlibJSONEncoder(JSONEncoder):
+    def encode(self, data, pretty=False):
+        if pretty:
+            return json.dumps(
+                data,
+                sort_keys=True,
+                indent=2,
+                separators=(",", ": "),
+                cls=DjangoJSONEncoder,
+            )
+        return json.dumps(data, separators=(",", ":"), cls=DjangoJSONEncoder)
+
+
+class OrjsonEncoder(StdlibJSONEncoder):
+    def __init__(self):
+        assert orjson is not None, "orjson must be installed to use OrjsonEncoder."
+        # Datetimes are passed through to `default` to match DjangoJSONEncoder.
+        self.option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def encode(self, data, pretty=False):
+        option = self.option
+        if pretty:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers that don't fit in 64 bits
+            return super().encode(data, pretty=pretty).encode()
+
+
+class UjsonEncoder(StdlibJSONEncoder):
+    def __init__(self):
+        assert ujson is not None, "ujson must be installed to use UjsonEncoder."
+
+    def encode(self, data, pretty=False):
+        if pretty:
+            # ujson indents differently, keep the standard pretty output.
+            return super().encode(data, pretty=True)
+        try:
+            return ujson.dumps(
+                replace_decimals(data),
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+                default=default,
+            )
+        except (TypeError, OverflowError):
+            return super().encode(data)
+
+
+def replace_decimals(data):
+    """
+    Returns ``data`` with its ``Decimal`` values converted to strings like
+    ``DjangoJSONEncoder`` does, since ujson encodes them as numbers without
+    calling ``default``. Containers without decimals are returned as they are.
+    """
+    if isinstance(data, Decimal):
+        return str(data)
+    if isinstance(data, dict):
+        replaced = None
+        for key, value in data.items():
+            new_value = replace_decimals(value)
+            if new_value is not value:
+                if replaced is None:
+                    replaced = dict(data)
+                replaced[key] = new_value
+        return data if replaced is None else replaced
+    if isinstance(data, (list, tuple)):
+        replaced = None
+        for i, value in enumerate(data):
+            new_value = replace_decimals(value)
+            if new_value is not value:
+                if replaced is None:
+                    replaced = list(data)
+                replaced[i] = new_value
+        return data if replaced is None else replaced
+    return data
+
+
+def get_default_json_encoder_class():
+    if orjson is not None:
+        return OrjsonEncoder
+    if ujson is not None:
+        return UjsonEncoder
+    return StdlibJSONEncoder
+
+
+_json_encoder = None
+
+
+def get_json_encoder():
+    """
+    Returns the process-wide instance of the ``JSON_ENCODER`` setting.
+    """
+    global _json_encoder
+    encoder_class = graphene_settings.JSON_ENCODER or get_default_json_encoder_class()
+    if _json_encoder is None or type(_json_encoder) is not encoder_class:
+        _json_encoder = encoder_class()
+    return _json_encoder
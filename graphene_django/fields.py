@@ -10,12 +10,39 @@ from graphql_relay import (
 from promise import Promise
 
 from graphene import Int, NonNull
-from graphene.relay import ConnectionField
+from graphene.relay import ConnectionField, Node
 from graphene.relay.connection import connection_adapter, page_info_adapter
 from graphene.types import Field, List
-
+from graphene.types.utils import get_type
+
+from .constants import STREAMING_RESPONSE_FLAG
+from .counting import ExactCount, get_count_strategy
+from .loaders import (
+    get_execution_loaders,
+    get_prefetch_cache_name,
+    get_prefetched_objects,
+    is_related_manager,
+    register_siblings,
+)
+from .optimizer import (
+    has_custom_get_queryset,
+    optimize_connection_queryset,
+    optimize_queryset,
+)
 from .settings import graphene_settings
 from .utils import maybe_queryset
+from .utils.keyset import (
+    cursor_to_keyset,
+    get_keyset_filter,
+    get_keyset_values,
+    get_ordering_keys,
+    keyset_to_cursor,
+    order_by_keys,
+)
+from .utils.utils import get_selected_field_names
+
+PAGINATION_OFFSET = "offset"
+PAGINATION_KEYSET = "keyset"
 
 
 class DjangoListField(Field):
@@ -57,10 +84,31 @@ class DjangoListField(Field):
         if queryset is None:
             queryset = maybe_queryset(default_manager)
 
+        if isinstance(queryset, QuerySet) and has_custom_get_queryset(
+            django_object_type
+        ):
+            # Filtering the prefetched queryset again would discard its cache
+            prefetched = get_prefetched_objects(
+                django_object_type, info, root, queryset
+            )
+            if prefetched is not None:
+                register_siblings(info, prefetched)
+                return prefetched
+
         if isinstance(queryset, QuerySet):
             # Pass queryset to the DjangoObjectType get_queryset method
             queryset = maybe_queryset(django_object_type.get_queryset(queryset, info))
+            queryset = optimize_queryset(queryset, django_object_type, info)
+
+        if (
+            isinstance(queryset, QuerySet)
+            and getattr(info.context, STREAMING_RESPONSE_FLAG, False) is True
+        ):
+            # Don't keep every model instance in the queryset cache when the
+            # response is streamed
+            return queryset.iterator(chunk_size=graphene_settings.STREAMING_CHUNK_SIZE)
 
+        register_siblings(info, queryset)
         return queryset
 
     def wrap_resolve(self, parent_resolver):
@@ -87,6 +135,13 @@ class DjangoConnectionField(ConnectionField):
             "enforce_first_or_last",
             graphene_settings.RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST,
         )
+        self.pagination = kwargs.pop(
+            "pagination", graphene_settings.RELAY_CONNECTION_PAGINATION
+        )
+        assert self.pagination in (PAGINATION_OFFSET, PAGINATION_KEYSET), (
+            "Unknown pagination {!r}, expected {!r} or {!r}."
+        ).format(self.pagination, PAGINATION_OFFSET, PAGINATION_KEYSET)
+        self.count_strategy = get_count_strategy(kwargs.pop("count_strategy", None))
         kwargs.setdefault("offset", Int())
         super().__init__(*args, **kwargs)
 
@@ -134,10 +189,23 @@ class DjangoConnectionField(ConnectionField):
     @classmethod
     def resolve_queryset(cls, connection, queryset, info, args):
         # queryset is the resolved iterable from ObjectType
-        return connection._meta.node.get_queryset(queryset, info)
+        queryset = connection._meta.node.get_queryset(queryset, info)
+        return optimize_connection_queryset(maybe_queryset(queryset), connection, info)
+
+    # Fields of a connection that can be resolved without knowing its length
+    # when paginating forward.
+    fields_without_total_count = frozenset(("edges", "pageInfo", "__typename"))
 
     @classmethod
-    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+    def requires_total_count(cls, info):
+        """
+        Returns whether the selection made on the connection needs the total
+        number of items, e.g. through a custom `totalCount` field.
+        """
+        return not get_selected_field_names(info) <= cls.fields_without_total_count
+
+    @classmethod
+    def prepare_pagination_args(cls, args, max_limit=None):
         # Remove the offset parameter and convert it to an after cursor.
         offset = args.pop("offset", None)
         after = args.get("after")
@@ -147,10 +215,46 @@ class DjangoConnectionField(ConnectionField):
             # input offset starts at 1 while the graphene offset starts at 0
             args["after"] = offset_to_cursor(offset - 1)
 
+        # Impose the maximum limit via the `first` field if neither first or last are already provided
+        # (note that if any of them is provided they must be under max_limit otherwise an error is raised).
+        if (
+            max_limit is not None
+            and args.get("first", None) is None
+            and args.get("last", None) is None
+        ):
+            args["first"] = max_limit
+
+    @classmethod
+    def resolve_connection(
+        cls,
+        connection,
+        args,
+        iterable,
+        max_limit=None,
+        with_total_count=True,
+        count_strategy=None,
+    ):
+        cls.prepare_pagination_args(args, max_limit)
+
         iterable = maybe_queryset(iterable)
 
+        if isinstance(iterable, QuerySet) and args.get("last") is None:
+            if not with_total_count:
+                return cls.resolve_connection_without_count(connection, args, iterable)
+            if count_strategy is not None and not count_strategy.exact:
+                # The page is located without the count, which may be
+                # approximate, so that pageInfo stays exact.
+                connection = cls.resolve_connection_without_count(
+                    connection, args, iterable
+                )
+                connection.length = count_strategy.count(iterable)
+                return connection
+
         if isinstance(iterable, QuerySet):
-            array_length = iterable.count()
+            if count_strategy is not None and count_strategy.exact:
+                array_length = count_strategy.count(iterable)
+            else:
+                array_length = iterable.count()
         else:
             array_length = len(iterable)
 
@@ -163,15 +267,6 @@ class DjangoConnectionField(ConnectionField):
         )
         array_slice_length = array_length - slice_start
 
-        # Impose the maximum limit via the `first` field if neither first or last are already provided
-        # (note that if any of them is provided they must be under max_limit otherwise an error is raised).
-        if (
-            max_limit is not None
-            and args.get("first", None) is None
-            and args.get("last", None) is None
-        ):
-            args["first"] = max_limit
-
         connection = connection_from_array_slice(
             iterable[slice_start:],
             args,
@@ -186,6 +281,210 @@ class DjangoConnectionField(ConnectionField):
         connection.length = array_length
         return connection
 
+    @classmethod
+    def get_forward_slice(cls, args):
+        """
+        Returns the bounds of the rows to fetch to paginate forward, including
+        one more row than requested to know whether there is a next page.
+        """
+        slice_start = get_offset_with_default(args.get("after"), -1) + 1
+        slice_end = None
+        first = args.get("first")
+        if first is not None:
+            slice_end = slice_start + first + 1
+        before = args.get("before")
+        if before is not None:
+            before_offset = get_offset_with_default(before, 0)
+            slice_end = (
+                before_offset if slice_end is None else min(slice_end, before_offset)
+            )
+            slice_end = max(slice_end, slice_start)
+        return slice_start, slice_end
+
+    @classmethod
+    def connection_from_slice(
+        cls, connection, args, iterable, array_slice, slice_start, length
+    ):
+        # When the total isn't known, the length of the fetched rows stands in
+        # for it: it is only used to find out whether the page is followed by
+        # other rows.
+        connection = connection_from_array_slice(
+            array_slice,
+            args,
+            slice_start=slice_start,
+            array_length=slice_start + len(array_slice) if length is None else length,
+            array_slice_length=len(array_slice),
+            connection_type=partial(connection_adapter, connection),
+            edge_type=connection.Edge,
+            page_info_type=page_info_adapter,
+        )
+        connection.iterable = iterable
+        connection.length = length
+        return connection
+
+    @classmethod
+    def resolve_connection_without_count(cls, connection, args, iterable):
+        """
+        Paginates forward without counting the rows of the queryset.
+        """
+        slice_start, slice_end = cls.get_forward_slice(args)
+        array_slice = list(iterable[slice_start:slice_end])
+        return cls.connection_from_slice(
+            connection, args, iterable, array_slice, slice_start, None
+        )
+
+    @classmethod
+    def resolve_batched_connection(
+        cls,
+        connection,
+        args,
+        manager,
+        queryset_resolver,
+        info,
+        max_limit=None,
+        with_total_count=True,
+        count_strategy=None,
+    ):
+        """
+        Resolves the connection of a reverse foreign key or many-to-many
+        related manager for its instance and the siblings of the instance at
+        once: the rows of all their pages are fetched with one query using a
+        window function, and their totals with one grouped COUNT. Count
+        strategies other than ``"exact"`` count the rows of each instance.
+
+        Returns ``None`` when the connection can't be batched, e.g. when
+        paginating backward, when the instance has no siblings, or when the
+        related objects were already prefetched.
+        """
+        loaders = get_execution_loaders(info)
+        if loaders is None:
+            return None
+        prefetched = manager.get_queryset()
+        if get_prefetch_cache_name(manager.instance, prefetched) is not None:
+            # Paginated from the prefetched objects instead
+            return None
+
+        page_args = dict(args)
+        cls.prepare_pagination_args(page_args, max_limit)
+        if page_args.get("last") is not None:
+            return None
+        slice_start, slice_end = cls.get_forward_slice(page_args)
+
+        def get_queryset():
+            # The related objects of every sibling, filtered once
+            queryset = manager.model._default_manager.all()
+            return maybe_queryset(queryset_resolver(connection, queryset, info, args))
+
+        # Within an execution, the arguments of a field only depend on its
+        # nodes
+        key = ("pages", tuple(id(field_node) for field_node in info.field_nodes))
+        count_in_batch = with_total_count and (
+            count_strategy is None or type(count_strategy) is ExactCount
+        )
+        page = loaders.get_page(
+            key, manager, get_queryset, slice_start, slice_end, count_in_batch
+        )
+        if page is None:
+            return None
+        array_slice, length, iterable = page
+        connection = cls.connection_from_slice(
+            connection, page_args, iterable, array_slice, slice_start, length
+        )
+        if with_total_count and not count_in_batch:
+            connection.length = count_strategy.count(iterable)
+        return connection
+
+    @classmethod
+    def resolve_keyset_connection(
+        cls,
+        connection,
+        args,
+        iterable,
+        max_limit=None,
+        with_total_count=True,
+        count_strategy=None,
+    ):
+        """
+        Paginates a queryset on the values of its ordering keys: the `after`
+        and `before` cursors are turned into filters instead of offsets.
+        Other iterables are paginated with offsets.
+        """
+        iterable = maybe_queryset(iterable)
+        if not isinstance(iterable, QuerySet):
+            return cls.resolve_connection(
+                connection,
+                args,
+                iterable,
+                max_limit,
+                with_total_count,
+                count_strategy,
+            )
+
+        keys = get_ordering_keys(iterable)
+        offset = args.get("offset") or 0
+        first = args.get("first")
+        last = args.get("last")
+        if max_limit is not None and first is None and last is None:
+            first = max_limit
+
+        queryset = iterable
+        after = args.get("after")
+        after_values = cursor_to_keyset(after, keys) if after else None
+        if after_values is not None:
+            queryset = queryset.filter(get_keyset_filter(keys, after_values))
+        before = args.get("before")
+        before_values = cursor_to_keyset(before, keys) if before else None
+        if before_values is not None:
+            queryset = queryset.filter(
+                get_keyset_filter(keys, before_values, reverse=True)
+            )
+
+        has_previous_page = False
+        has_next_page = False
+        if last is not None and first is None and not offset:
+            # Read the page backwards so that only `last` rows are fetched.
+            rows = list(order_by_keys(queryset, keys, reverse=True)[: last + 1])
+            has_previous_page = len(rows) > last
+            rows = rows[:last][::-1]
+        else:
+            queryset = order_by_keys(queryset, keys)
+            rows = list(
+                queryset[offset:]
+                if first is None
+                else queryset[offset : offset + first + 1]
+            )
+            if first is not None:
+                has_next_page = len(rows) > first
+                rows = rows[:first]
+            if last is not None:
+                has_previous_page = len(rows) > last
+                rows = rows[max(len(rows) - last, 0) :]
+
+        edges = [
+            connection.Edge(
+                node=row, cursor=keyset_to_cursor(get_keyset_values(row, keys))
+            )
+            for row in rows
+        ]
+        connection = connection_adapter(
+            connection,
+            edges,
+            page_info_adapter(
+                startCursor=edges[0].cursor if edges else None,
+                endCursor=edges[-1].cursor if edges else None,
+                hasPreviousPage=has_previous_page,
+                hasNextPage=has_next_page,
+            ),
+        )
+        connection.iterable = iterable
+        if not with_total_count:
+            connection.length = None
+        elif count_strategy is not None:
+            connection.length = count_strategy.count(iterable)
+        else:
+            connection.length = iterable.count()
+        return connection
+
     @classmethod
     def connection_resolver(
         cls,
@@ -197,6 +496,8 @@ class DjangoConnectionField(ConnectionField):
         enforce_first_or_last,
         root,
         info,
+        pagination=PAGINATION_OFFSET,
+        count_strategy=None,
         **args,
     ):
         first = args.get("first")
@@ -227,22 +528,53 @@ class DjangoConnectionField(ConnectionField):
                 "You can't provide a `before` value at the same time as an `offset` value to properly paginate the `{}` connection."
             ).format(info.field_name)
 
+        def register(connection):
+            register_siblings(info, [edge.node for edge in connection.edges])
+            return connection
+
+        with_total_count = cls.requires_total_count(info)
+
         # eventually leads to DjangoObjectType's get_queryset (accepts queryset)
         # or a resolve_foo (does not accept queryset)
         iterable = resolver(root, info, **args)
         if iterable is None:
             iterable = default_manager
+        elif pagination == PAGINATION_OFFSET and is_related_manager(iterable):
+            # A nested connection: paginate the siblings of root together
+            batched_connection = cls.resolve_batched_connection(
+                connection,
+                args,
+                iterable,
+                queryset_resolver,
+                info,
+                max_limit=max_limit,
+                with_total_count=with_total_count,
+                count_strategy=count_strategy,
+            )
+            if batched_connection is not None:
+                return register(batched_connection)
+
         # thus the iterable gets refiltered by resolve_queryset
         # but iterable might be promise
         iterable = queryset_resolver(connection, iterable, info, args)
         on_resolve = partial(
-            cls.resolve_connection, connection, args, max_limit=max_limit
+            cls.resolve_keyset_connection
+            if pagination == PAGINATION_KEYSET
+            else cls.resolve_connection,
+            connection,
+            args,
+            max_limit=max_limit,
+            with_total_count=with_total_count,
+            count_strategy=count_strategy,
         )
 
+        def resolve_and_register(iterable):
+            return register(on_resolve(iterable))
+
         if Promise.is_thenable(iterable):
-            return Promise.resolve(iterable).then(on_resolve)
+            return Promise.resolve(iterable).then(resolve_and_register)
 
-        return on_resolve(iterable)
+        return resolve_and_register(iterable)
 
     def wrap_resolve(self, parent_resolver):
         return partial(
@@ -253,7 +585,75 @@ class DjangoConnectionField(ConnectionField):
             self.get_queryset_resolver(),
             self.max_limit,
             self.enforce_first_or_last,
+            pagination=self.pagination,
+            count_strategy=self.count_strategy,
         )
 
     def get_queryset_resolver(self):
         return self.resolve_queryset
+
+
+class DjangoNodesField(Field):
+    """
+    A ``nodes(ids: [ID!]!)`` field returning the objects of a list of global
+    IDs, in the same order. The objects of each type are fetched together
+    through its ``get_nodes`` method, or one at a time through ``get_node``
+    for the types that don't have one.
+    """
+
+    def __init__(self, node=Node, type_=False, **kwargs):
+        assert issubclass(node, Node), "DjangoNodesField can only operate in Nodes"
+        self.node_type = node
+        self.field_type = type_
+        global_id_type = node._meta.global_id_type
+
+        super().__init__(
+            # If we don't specify a type, the field type will be the node interface
+            NonNull(List(type_ or node)),
+            ids=NonNull(
+                List(NonNull(global_id_type.graphene_type)),
+                description="The IDs of the objects",
+            ),
+            **kwargs,
+        )
+
+    def wrap_resolve(self, parent_resolver):
+        return partial(self.nodes_resolver, self.node_type, get_type(self.field_type))
+
+    @staticmethod
+    def nodes_resolver(node, only_type, root, info, ids):
+        types = []
+        ids_by_type = {}
+        for global_id in ids:
+            _type, _id = node.resolve_global_id(info, global_id)
+
+            graphene_type = info.schema.get_type(_type)
+            if graphene_type is None:
+                raise Exception(f'Relay Node "{_type}" not found in schema')
+            graphene_type = graphene_type.graphene_type
+
+            if only_type:
+                assert (
+                    graphene_type == only_type
+                ), f"Must receive a {only_type._meta.name} id."
+
+            # We make sure the ObjectType implements the "Node" interface
+            if node not in graphene_type._meta.interfaces:
+                raise Exception(
+                    f'ObjectType "{_type}" does not implement the "{node}" interface.'
+                )
+
+            types.append((graphene_type, _id))
+            ids_by_type.setdefault(graphene_type, {})[_id] = None
+
+        for graphene_type, objects in ids_by_type.items():
+            type_ids = list(objects)
+            get_nodes = getattr(graphene_type, "get_nodes", None)
+            if get_nodes:
+                objects.update(zip(type_ids, get_nodes(info, type_ids)))
+                continue
+            get_node = getattr(graphene_type, "get_node", None)
+            if get_node:
+                objects.update((_id, get_node(info, _id)) for _id in type_ids)
+
+        return [ids_by_type[graphene_type][_id] for graphene_type, _id in types]
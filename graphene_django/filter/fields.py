@@ -8,6 +8,8 @@ from graphene.types.enum import EnumType
 from graphene.utils.str_converters import to_snake_case
 
 from ..fields import DjangoConnectionField
+from ..settings import graphene_settings
+from .filterset import get_compiled_filterset
 from .utils import get_filtering_args_from_filterset, get_filterset_class
 
 
@@ -91,10 +93,16 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             return kwargs
 
         qs = super().resolve_queryset(connection, iterable, info, args)
+        data = filter_kwargs()
 
-        filterset = filterset_class(
-            data=filter_kwargs(), queryset=qs, request=info.context
-        )
+        if graphene_settings.COMPILE_FILTERSETS:
+            filtered_qs = get_compiled_filterset(filterset_class).filter_queryset(
+                qs, data
+            )
+            if filtered_qs is not None:
+                return filtered_qs
+
+        filterset = filterset_class(data=data, queryset=qs, request=info.context)
         if filterset.is_valid():
             return filterset.qs
         raise ValidationError(filterset.form.errors.as_json())
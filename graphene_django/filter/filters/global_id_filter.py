@@ -1,10 +1,88 @@
+from django.apps import apps
+from django.core.exceptions import FieldError
+from django.db import models
 from django_filters import Filter, MultipleChoiceFilter
-from graphql_relay.node.node import from_global_id
+from django_filters.utils import get_model_field
 
 from ...forms import GlobalIDFormField, GlobalIDMultipleChoiceField
+from ...forms.forms import GlobalIDList, decode_global_id
+from ...registry import get_global_registry
+from ..lookups import get_in_lookup
 
+# The targets of the filters by (model, field_name). Filters are deep-copied
+# for every filterset, so they can't keep them.
+_global_id_targets = {}
 
-class GlobalIDFilter(Filter):
+
+def get_global_id_target(model, field_name):
+    """
+    Returns the models whose global IDs the ``field_name`` of ``model`` can
+    be filtered by, i.e. the model it refers to and its subclasses, and the
+    field their IDs are compared to. Returns ``None`` when the field isn't a
+    model field.
+    """
+    field = get_model_field(model, field_name) if model is not None else None
+    if field is None:
+        return None
+    target_model = field.related_model or field.model
+    target_models = [
+        other_model
+        for other_model in apps.get_models()
+        if issubclass(other_model, target_model)
+    ]
+    target_field = field
+    if field.is_relation:
+        try:
+            target_field = field.target_field
+        except (AttributeError, FieldError):
+            target_field = None
+    return target_models, target_field
+
+
+class GlobalIDFilterMixin:
+    """
+    Converts the decoded global IDs of a filter to the IDs of the objects they
+    can match.
+    """
+
+    def get_global_id_target(self):
+        key = (getattr(self, "model", None), self.field_name)
+        try:
+            return _global_id_targets[key]
+        except KeyError:
+            target = _global_id_targets[key] = get_global_id_target(*key)
+            return target
+
+    def can_match_type(self, type_name):
+        """
+        Returns whether the global IDs of the type named ``type_name`` can
+        match objects the field refers to. Only IDs of types registered for
+        other models can't: unknown type names are filtered by their ID.
+        """
+        target = self.get_global_id_target()
+        if target is None:
+            return True
+        type_models = get_global_registry().get_models_for_type_name(type_name)
+        return not type_models or any(model in target[0] for model in type_models)
+
+    def get_id(self, decoded):
+        """
+        Returns the ID to filter by, coerced to an integer for integer
+        primary keys, or ``None`` when no object can match it.
+        """
+        _type, _id = decoded
+        if not self.can_match_type(_type):
+            return None
+        target = self.get_global_id_target()
+        if target is not None and isinstance(target[1], models.IntegerField):
+            try:
+                return int(_id)
+            except ValueError:
+                return None
+        return _id
+
+
+class GlobalIDFilter(GlobalIDFilterMixin, Filter):
     """
     Filter for Relay global ID.
     """
@@ -12,16 +90,58 @@ class GlobalIDFilter(Filter):
     field_class = GlobalIDFormField
 
     def filter(self, qs, value):
-        """Convert the filter value to a primary key before filtering"""
-        _id = None
-        if value is not None:
-            _, _id = from_global_id(value)
+        """
+        Convert the filter value to a primary key before filtering. Global IDs
+        of another type than the type of the model the field refers to don't
+        match any object, without querying the database.
+        """
+        if value is None:
+            return super().filter(qs, None)
+
+        decoded = decode_global_id(value)
+        _id = None if decoded is None else self.get_id(decoded)
+        if _id is None:
+            return qs if self.exclude else qs.none()
         return super().filter(qs, _id)
 
 
-class GlobalIDMultipleChoiceFilter(MultipleChoiceFilter):
+class GlobalIDMultipleChoiceFilter(GlobalIDFilterMixin, MultipleChoiceFilter):
     field_class = GlobalIDMultipleChoiceField
 
     def filter(self, qs, value):
-        gids = [from_global_id(v)[1] for v in value]
-        return super().filter(qs, gids)
+        """
+        Filter by the IDs of the global IDs decoded by the form field. The
+        global IDs of other types than the type of the model the field refers
+        to don't match any object.
+        """
+        if not value:
+            return qs
+        if not isinstance(value, GlobalIDList):
+            value = GlobalIDList(
+                {
+                    global_id: decode_global_id(global_id) or ("", global_id)
+                    for global_id in value
+                }
+            )
+
+        ids = []
+        for decoded in value.decoded:
+            _id = self.get_id(decoded)
+            if _id is not None:
+                ids.append(_id)
+        if len(ids) < len(value) and not self.exclude:
+            if self.conjoined or not ids:
+                # Some of the objects can't match
+                return qs.none()
+        if (
+            ids
+            and not self.conjoined
+            and self.lookup_expr == "exact"
+            and self.null_value not in ids
+        ):
+            # The same rows as the union of the lookups of the IDs, with long
+            # lists passed to the database as a single parameter
+            lookup = f"{self.field_name}__{get_in_lookup(ids)}"
+            qs = self.get_method(qs)(**{lookup: ids})
+            return qs.distinct() if self.distinct else qs
+        return super().filter(qs, ids)
@@ -1,5 +1,6 @@
 from django_filters.filters import FilterMethod
 
+from ..lookups import get_in_lookup
 from .typed_filter import TypedFilter
 
 
@@ -46,5 +47,11 @@ class ListFilter(TypedFilter):
                 return qs
             else:
                 return qs.none()
+        elif value is not None and self.lookup_expr == "in":
+            # Long lists are passed to the database as a single parameter
+            if self.distinct:
+                qs = qs.distinct()
+            lookup = f"{self.field_name}__{get_in_lookup(value)}"
+            return self.get_method(qs)(**{lookup: value})
         else:
             return super().filter(qs, value)
@@ -1,13 +1,27 @@
 import itertools
+import weakref
 
+from django import forms
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.query import QuerySet
+from django.forms.utils import ErrorDict, ErrorList
+from django_filters import filters
+from django_filters.constants import EMPTY_VALUES
+from django_filters.filters import Filter, FilterMethod, QuerySetRequestMixin
 from django_filters.filterset import (
     FILTER_FOR_DBFIELD_DEFAULTS,
     BaseFilterSet,
     FilterSet,
 )
+from django_filters.widgets import BooleanWidget
 
-from .filters import GlobalIDFilter, GlobalIDMultipleChoiceFilter
+from .filters import (
+    ArrayFilter,
+    GlobalIDFilter,
+    GlobalIDMultipleChoiceFilter,
+    ListFilter,
+)
 
 GRAPHENE_FILTER_SET_OVERRIDES = {
     models.AutoField: {"filter_class": GlobalIDFilter},
@@ -49,3 +63,209 @@ def custom_filterset_factory(model, filterset_base_class=FilterSet, **meta):
         {"Meta": meta_class},
     )
     return filterset
+
+
+# Filterset methods whose overrides may change the filtering, so that the
+# filters of a filterset overriding one of them can't be applied directly
+FILTERSET_METHODS = (
+    "__init__",
+    "is_valid",
+    "errors",
+    "form",
+    "get_form_class",
+    "filter_queryset",
+    "qs",
+)
+
+# Form fields whose cleaning returns the given Python value as is when the
+# field has no validators. graphene already parsed the argument to that type.
+TYPED_FORM_FIELDS = {
+    forms.IntegerField: int,
+    forms.FloatField: float,
+    forms.NullBooleanField: bool,
+}
+
+PASSTHROUGH_WIDGET_METHODS = (
+    forms.Widget.value_from_datadict,
+    forms.NullBooleanSelect.value_from_datadict,
+    BooleanWidget.value_from_datadict,
+)
+
+# The filter methods of django-filter and graphene-django filters, which don't
+# use the filterset the filter is bound to. Other filter methods may read its
+# request, and are only called by a filterset.
+COMPILED_FILTER_METHODS = {
+    Filter.filter,
+    filters.ChoiceFilter.filter,
+    filters.MultipleChoiceFilter.filter,
+    filters.NumericRangeFilter.filter,
+    filters.RangeFilter.filter,
+    filters.DateRangeFilter.filter,
+    filters.LookupChoiceFilter.filter,
+    filters.OrderingFilter.filter,
+    ArrayFilter.filter,
+    GlobalIDFilter.filter,
+    GlobalIDMultipleChoiceFilter.filter,
+    ListFilter.filter,
+}
+
+_compiled_filtersets = weakref.WeakKeyDictionary()
+
+
+class CompiledFilter:
+    """
+    A filter of a filterset class, with its form field, ready to clean an
+    argument and filter a queryset with it.
+    """
+
+    def __init__(self, name, filter_):
+        self.name = name
+        self.filter = filter_
+        self.field = filter_.field
+        self.widget = self.field.widget
+        self.python_type = None
+        if not self.field.validators and (
+            type(self.widget).value_from_datadict in PASSTHROUGH_WIDGET_METHODS
+        ):
+            self.python_type = TYPED_FORM_FIELDS.get(type(self.field))
+
+        self.apply = filter_.filter
+        self.lookup = None
+        if "filter" not in vars(filter_) and type(filter_).filter is Filter.filter:
+            # The lookup of Filter.filter, applied without calling it
+            self.lookup = f"{filter_.field_name}__{filter_.lookup_expr}"
+            self.apply = self.apply_lookup
+
+    def clean(self, data):
+        value = data.get(self.name)
+        if self.python_type is not None and value.__class__ is self.python_type:
+            return value
+        return self.field.clean(self.widget.value_from_datadict(data, {}, self.name))
+
+    def apply_lookup(self, queryset, value):
+        if value in EMPTY_VALUES:
+            return queryset
+        if self.filter.distinct:
+            queryset = queryset.distinct()
+        if self.filter.exclude:
+            return queryset.exclude(**{self.lookup: value})
+        return queryset.filter(**{self.lookup: value})
+
+
+class CompiledFilterSet:
+    """
+    Applies the filters of a filterset class to a queryset without building
+    a filterset and its form for every query.
+
+    Only the filters of the given arguments are cleaned and applied, and the
+    arguments graphene already parsed to the Python type the form field
+    returns are used as they are. ``filter_queryset`` returns ``None`` when a
+    filterset is needed to filter the queryset: when the filterset class, its
+    form or the ``filter`` method of one of its filters customize the
+    validation or the filtering, or when one of the given arguments is
+    filtered by a ``method`` or depends on the request.
+    """
+
+    def __init__(self, filterset_class):
+        self.filterset_class = filterset_class
+        self.filters = []
+        # Names of the filters only applied by a filterset
+        self.filterset_filters = set()
+        # Filters applied with their value when their argument isn't given
+        self.defaults = {}
+        self.enabled = filterset_class._meta.form is forms.Form and all(
+            getattr(filterset_class, name) is getattr(BaseFilterSet, name)
+            for name in FILTERSET_METHODS
+        )
+        if self.enabled:
+            self.compile()
+
+    def compile(self):
+        model = self.filterset_class._meta.model
+        # The filters of a filterset are bound to it, as their parent
+        filterset = self.filterset_class(queryset=model._default_manager.none())
+        for name, filter_ in filterset.filters.items():
+            if isinstance(filter_, QuerySetRequestMixin):
+                # Their form field queryset may depend on the request. Without
+                # an argument, they filter with an empty value, i.e. not at all.
+                self.filterset_filters.add(name)
+                continue
+
+            compiled = CompiledFilter(name, filter_)
+            try:
+                default = compiled.field.clean(
+                    compiled.widget.value_from_datadict({}, {}, name)
+                )
+            except ValidationError:
+                # Required, the argument is always given
+                default = None
+
+            if filter_.method is not None:
+                self.filterset_filters.add(name)
+                # FilterMethod skips empty values, the methods of list and
+                # array filters only skip None
+                empty_values = (
+                    EMPTY_VALUES if type(filter_.filter) is FilterMethod else (None,)
+                )
+                if default not in empty_values:
+                    # Filtered by the method on every query
+                    self.enabled = False
+                    return
+                continue
+
+            if (
+                "filter" in vars(filter_)
+                or type(filter_).filter not in COMPILED_FILTER_METHODS
+            ):
+                # A custom filter method, called on every query
+                self.enabled = False
+                return
+
+            self.filters.append(compiled)
+            if compiled.lookup is None or default not in EMPTY_VALUES:
+                self.defaults[name] = default
+
+    def filter_queryset(self, queryset, data):
+        """
+        Returns ``queryset`` filtered by the arguments of ``data``, or
+        ``None`` if it must be filtered by a filterset. Raises a
+        ``ValidationError`` holding the errors of the form as JSON when an
+        argument is invalid.
+        """
+        if not self.enabled or not isinstance(queryset, QuerySet):
+            return None
+        if not self.filterset_filters.isdisjoint(data):
+            return None
+
+        filters = []
+        errors = ErrorDict()
+        for compiled in self.filters:
+            name = compiled.name
+            if name in data:
+                try:
+                    value = compiled.clean(data)
+                except ValidationError as e:
+                    errors[name] = ErrorList(e.error_list)
+                    continue
+            elif name in self.defaults:
+                value = self.defaults[name]
+            else:
+                continue
+            filters.append((compiled.apply, value))
+
+        if errors:
+            raise ValidationError(errors.as_json())
+
+        queryset = queryset.all()
+        for apply, value in filters:
+            queryset = apply(queryset, value)
+        return queryset
+
+
+def get_compiled_filterset(filterset_class):
+    compiled = _compiled_filtersets.get(filterset_class)
+    if compiled is None:
+        compiled = _compiled_filtersets[filterset_class] = CompiledFilterSet(
+            filterset_class
+        )
+    return compiled
@@ -0,0 +1,89 @@
+"""
+Lookup filtering by long lists of values.
+
+The ``in`` lookup passes each value of its list as its own SQL parameter. Long
+lists exceed the maximum number of parameters of SQLite, and are slow to
+plan for PostgreSQL. The ``graphene_in_array`` lookup matches the same rows as
+``in`` but passes the values as a single parameter: an array on PostgreSQL,
+and a JSON array read by ``json_each`` on SQLite. Other databases use the
+``in`` lookup, split as they require.
+"""
+
+import json
+
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Field, ForeignObject
+from django.db.models.fields.related_lookups import RelatedIn
+from django.db.models.lookups import In
+from django.utils.datastructures import OrderedSet
+
+from ..settings import graphene_settings
+
+
+class InArrayMixin:
+    lookup_name = "graphene_in_array"
+
+    def can_use_array(self):
+        # Not for subqueries nor multi-column relations
+        return self.rhs_is_direct_value() and not hasattr(self.lhs, "sources")
+
+    def get_db_values(self, compiler, connection):
+        """
+        Returns the distinct values other than ``None``, prepared for the
+        database, like the ``in`` lookup.
+        """
+        try:
+            rhs = OrderedSet(self.rhs)
+            rhs.discard(None)
+        except TypeError:  # Unhashable items in self.rhs
+            rhs = [r for r in self.rhs if r is not None]
+        if not rhs:
+            raise EmptyResultSet
+        _, params = self.batch_process_rhs(compiler, connection, rhs)
+        return list(params)
+
+    def as_postgresql(self, compiler, connection):
+        if not self.can_use_array():
+            return self.as_sql(compiler, connection)
+        field = getattr(self.lhs, "target", None) or self.lhs.output_field
+        db_type = field.cast_db_type(connection)
+        if db_type is None:
+            return self.as_sql(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = self.get_db_values(compiler, connection)
+        return f"{lhs} = ANY(%s::{db_type}[])", (*lhs_params, values)
+
+    def as_sqlite(self, compiler, connection):
+        if not self.can_use_array() or not connection.features.supports_json_field:
+            return self.as_sql(compiler, connection)
+        values = self.get_db_values(compiler, connection)
+        if not all(isinstance(value, (int, float, str)) for value in values):
+            # Only values JSON holds as they are
+            return self.as_sql(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return (
+            f"{lhs} IN (SELECT value FROM JSON_EACH(%s))",
+            (*lhs_params, json.dumps(values)),
+        )
+
+
+@Field.register_lookup
+class InArray(InArrayMixin, In):
+    pass
+
+
+@ForeignObject.register_lookup
+class RelatedInArray(InArrayMixin, RelatedIn):
+    pass
+
+
+def get_in_lookup(values):
+    """
+    Returns the name of the lookup filtering by the list ``values``:
+    ``graphene_in_array`` when it holds at least ``FILTER_ARRAY_LOOKUP_THRESHOLD``
+    values, ``in`` otherwise.
+    """
+    threshold = graphene_settings.FILTER_ARRAY_LOOKUP_THRESHOLD
+    if threshold is not None and len(values) >= threshold:
+        return InArray.lookup_name
+    return In.lookup_name
@@ -0,0 +1,365 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from graphene import ObjectType, Schema
+from graphene.relay import Node
+from graphene_django import DjangoObjectType
+from graphene_django.tests.models import Person, Pet
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    import django_filters
+    from django_filters.filterset import BaseFilterSet
+
+    from graphene_django.filter import (
+        DjangoFilterConnectionField,
+        GlobalIDFilter,
+        GlobalIDMultipleChoiceFilter,
+    )
+    from graphene_django.filter.filters import global_id_filter
+    from graphene_django.filter.filterset import (
+        CompiledFilterSet,
+        get_compiled_filterset,
+    )
+
+    class PetFilterSet(django_filters.FilterSet):
+        name_starts = django_filters.CharFilter(method="filter_name_starts")
+        order_by = django_filters.OrderingFilter(fields=("name", "age"))
+
+        class Meta:
+            model = Pet
+            fields = {
+                "name": ["exact", "in", "icontains"],
+                "age": ["exact", "gt", "lte"],
+                "owner": ["exact"],
+            }
+
+        def filter_name_starts(self, queryset, name, value):
+            return queryset.filter(name__startswith=value)
+
+    class PetNode(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = ("name", "age")
+            filterset_class = PetFilterSet
+
+    class Query(ObjectType):
+        pets = DjangoFilterConnectionField(PetNode)
+
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+@pytest.fixture
+def pets():
+    owner = Person.objects.create(name="Jane")
+    Pet.objects.create(name="Brutus", age=12, owner=owner)
+    Pet.objects.create(name="Mimi", age=8)
+    Pet.objects.create(name="Jojo", age=3, owner=owner)
+    Pet.objects.create(name="Picotin", age=5)
+    return owner
+
+
+def execute(query):
+    result = Schema(query=Query).execute(query)
+    assert not result.errors
+    return [edge["node"]["name"] for edge in result.data["pets"]["edges"]]
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "",
+        'name: "Mimi"',
+        'name_In: ["Mimi", "Jojo"]',
+        'name_Icontains: "I"',
+        "age_Gt: 4",
+        "age_Gt: 4, age_Lte: 8",
+        'orderBy: "-age"',
+        'orderBy: "name", age_Gt: 3',
+        'nameStarts: "P"',
+        'nameStarts: "J", orderBy: "age"',
+    ],
+)
+def test_compiled_filterset_filters_like_the_filterset(
+    pets, graphene_settings, arguments
+):
+    query = f"{{ pets{f'({arguments})' if arguments else ''} {{ edges {{ node {{ name }} }} }} }}"
+    compiled = execute(query)
+
+    graphene_settings.COMPILE_FILTERSETS = False
+    assert execute(query) == compiled
+
+
+def test_compiled_filterset_filters_by_global_id(pets):
+    owner_id = Node.to_global_id("PersonNode", pets.pk)
+    query = f'{{ pets(owner: "{owner_id}", orderBy: "name") {{ edges {{ node {{ name }} }} }} }}'
+    assert execute(query) == ["Brutus", "Jojo"]
+
+
+def test_compiled_filterset_doesnt_build_filtersets(pets):
+    query = '{ pets(age_Gt: 4, orderBy: "age") { edges { node { name } } } }'
+    assert execute(query) == ["Picotin", "Mimi", "Brutus"]
+
+    with patch.object(
+        BaseFilterSet, "__init__", side_effect=AssertionError("FilterSet built")
+    ):
+        assert execute(query) == ["Picotin", "Mimi", "Brutus"]
+
+
+def test_compiled_filterset_uses_filtersets_for_method_filters(pets):
+    query = '{ pets(nameStarts: "J") { edges { node { name } } } }'
+    assert execute(query) == ["Jojo"]
+
+    compiled = get_compiled_filterset(Query._meta.fields["pets"].filterset_class)
+    assert compiled.enabled
+    assert compiled.filterset_filters == {"name_starts"}
+    assert compiled.filter_queryset(Pet.objects.all(), {"name_starts": "J"}) is None
+
+
+def test_compiled_filterset_is_disabled_by_filterset_overrides():
+    class CustomFilterSet(django_filters.FilterSet):
+        class Meta:
+            model = Pet
+            fields = ("name",)
+
+        def filter_queryset(self, queryset):
+            return super().filter_queryset(queryset).filter(age__gt=3)
+
+    compiled = CompiledFilterSet(CustomFilterSet)
+    assert not compiled.enabled
+    assert compiled.filter_queryset(Pet.objects.all(), {"name": "Mimi"}) is None
+
+
+def test_compiled_filterset_is_disabled_by_custom_filter_methods(pets):
+    class RequestFilter(django_filters.CharFilter):
+        def filter(self, qs, value):
+            # Only filtered by a filterset, bound to the request
+            return qs.filter(name__startswith=self.parent.request.prefix)
+
+    class CustomFilterSet(django_filters.FilterSet):
+        name = RequestFilter()
+
+        class Meta:
+            model = Pet
+            fields = ("name",)
+
+    class CustomPetNode(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = ("name",)
+            filterset_class = CustomFilterSet
+
+    class CustomQuery(ObjectType):
+        pets = DjangoFilterConnectionField(CustomPetNode)
+
+    compiled = get_compiled_filterset(CustomQuery._meta.fields["pets"].filterset_class)
+    assert not compiled.enabled
+
+    context = SimpleNamespace(prefix="M")
+    result = Schema(query=CustomQuery).execute(
+        '{ pets(name: "") { edges { node { name } } } }', context_value=context
+    )
+    assert not result.errors
+    assert result.data["pets"]["edges"] == [{"node": {"name": "Mimi"}}]
+
+
+def test_compiled_filterset_raises_the_errors_of_the_form():
+    filterset_class = Query._meta.fields["pets"].filterset_class
+    data = {"age": "not a number", "owner": "not a global id"}
+    compiled = get_compiled_filterset(filterset_class)
+
+    with pytest.raises(ValidationError) as compiled_error:
+        compiled.filter_queryset(Pet.objects.all(), data)
+
+    filterset = filterset_class(data=data, queryset=Pet.objects.all())
+    assert not filterset.is_valid()
+    assert compiled_error.value.message == filterset.form.errors.as_json()
+
+
+@pytest.mark.parametrize("compile_filtersets", [True, False])
+def test_global_id_multiple_choice_filter_checks_the_type(
+    pets, graphene_settings, compile_filtersets
+):
+    class PersonFilterSet(django_filters.FilterSet):
+        pets = GlobalIDMultipleChoiceFilter(field_name="pets")
+
+        class Meta:
+            model = Person
+            fields = ("pets",)
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = ("name",)
+
+    class PersonType(DjangoObjectType):
+        class Meta:
+            model = Person
+            interfaces = (Node,)
+            fields = ("name",)
+            filterset_class = PersonFilterSet
+
+    class PeopleQuery(ObjectType):
+        people = DjangoFilterConnectionField(PersonType)
+
+    graphene_settings.COMPILE_FILTERSETS = compile_filtersets
+    Person.objects.create(name="Joe")
+    brutus, mimi = Pet.objects.filter(name__in=["Brutus", "Mimi"]).order_by("name")
+    pet_ids = [Node.to_global_id("PetType", pet.pk) for pet in (brutus, mimi)]
+    wrong_id = Node.to_global_id("PersonType", brutus.pk)
+    query = """
+        query ($pets: [ID]) {
+            people(pets: $pets) { edges { node { name } } }
+        }
+    """
+    schema = Schema(query=PeopleQuery)
+
+    def get_names(ids):
+        result = schema.execute(query, variables={"pets": ids})
+        assert not result.errors
+        return [edge["node"]["name"] for edge in result.data["people"]["edges"]]
+
+    assert get_names(pet_ids) == ["Jane"]
+    assert get_names([pet_ids[0], pet_ids[0], wrong_id]) == ["Jane"]
+    assert get_names([wrong_id]) == []
+
+
+@pytest.mark.parametrize("compile_filtersets", [True, False])
+def test_global_id_filter_checks_the_type(
+    pets, graphene_settings, django_assert_num_queries, compile_filtersets
+):
+    class PersonType(DjangoObjectType):
+        class Meta:
+            model = Person
+            interfaces = (Node,)
+            fields = ("name",)
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = ("name",)
+            filter_fields = ("owner",)
+
+    class PetsQuery(ObjectType):
+        pets = DjangoFilterConnectionField(PetType)
+
+    graphene_settings.COMPILE_FILTERSETS = compile_filtersets
+    query = """
+        query ($owner: ID) {
+            pets(owner: $owner) { edges { node { name } } }
+        }
+    """
+    schema = Schema(query=PetsQuery)
+
+    def get_names(owner):
+        result = schema.execute(query, variables={"owner": owner})
+        assert not result.errors
+        return sorted(edge["node"]["name"] for edge in result.data["pets"]["edges"])
+
+    assert get_names(Node.to_global_id("PersonType", pets.pk)) == ["Brutus", "Jojo"]
+    # Neither the wrong type nor an ID that isn't an integer query the database
+    with django_assert_num_queries(0):
+        assert get_names(Node.to_global_id("PetType", pets.pk)) == []
+        assert get_names(Node.to_global_id("PersonType", "abc")) == []
+
+
+def test_global_id_filters_coerce_integer_primary_keys():
+    class PersonType(DjangoObjectType):
+        class Meta:
+            model = Person
+            interfaces = (Node,)
+            fields = ("name",)
+
+    pet_filter = GlobalIDFilter(field_name="owner")
+    pet_filter.model = Pet
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            fields = ("name",)
+
+    assert pet_filter.get_id(("PersonType", "12")) == 12
+    assert pet_filter.get_id(("PersonType", "abc")) is None
+    assert pet_filter.get_id(("PetType", "12")) is None
+    # Unknown types are filtered by their ID
+    assert pet_filter.get_id(("UnknownType", "12")) == 12
+
+
+@pytest.mark.parametrize("compile_filtersets", [True, False])
+def test_global_id_filter_accepts_every_type_of_the_model(
+    pets, graphene_settings, compile_filtersets
+):
+    class PersonType(DjangoObjectType):
+        class Meta:
+            model = Person
+            interfaces = (Node,)
+            fields = ("name",)
+
+    class OtherPersonType(DjangoObjectType):
+        class Meta:
+            model = Person
+            interfaces = (Node,)
+            fields = ("name",)
+            skip_registry = True
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = ("name",)
+            filter_fields = ("owner",)
+
+    class PetsQuery(ObjectType):
+        pets = DjangoFilterConnectionField(PetType)
+        other_person = Node.Field(OtherPersonType)
+
+    graphene_settings.COMPILE_FILTERSETS = compile_filtersets
+    schema = Schema(query=PetsQuery)
+    query = """
+        query ($owner: ID) {
+            pets(owner: $owner) { edges { node { name } } }
+        }
+    """
+
+    for type_name in ("PersonType", "OtherPersonType"):
+        owner_id = Node.to_global_id(type_name, pets.pk)
+        result = schema.execute(query, variables={"owner": owner_id})
+        assert not result.errors
+        assert sorted(
+            edge["node"]["name"] for edge in result.data["pets"]["edges"]
+        ) == ["Brutus", "Jojo"]
+
+
+def test_global_id_filters_share_their_target(pets):
+    filterset_class = Query._meta.fields["pets"].filterset_class
+    owner_id = Node.to_global_id("PersonNode", pets.pk)
+
+    with patch.dict(global_id_filter._global_id_targets, clear=True), patch(
+        "graphene_django.filter.filters.global_id_filter.get_global_id_target",
+        wraps=global_id_filter.get_global_id_target,
+    ) as get_global_id_target:
+        for _ in range(2):
+            # The filters of every filterset are copies
+            filterset = filterset_class(
+                data={"owner": owner_id}, queryset=Pet.objects.all()
+            )
+            assert set(filterset.qs.values_list("name", flat=True)) == {
+                "Brutus",
+                "Jojo",
+            }
+
+    assert get_global_id_target.call_count == 1
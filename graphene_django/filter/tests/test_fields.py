@@ -1,5 +1,6 @@
 from datetime import datetime
 from textwrap import dedent
+from unittest.mock import patch
 
 import pytest
 from django.db.models import TextField, Value
@@ -1302,3 +1303,66 @@ def test_only_custom_filters():
 
     field = DjangoFilterConnectionField(ReporterFilterNode)
     assert_arguments(field, "some_filter")
+
+
+def test_filter_fields_share_filterset_class_and_arguments():
+    class PetFilterNode(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            fields = "__all__"
+            filter_fields = {"name": ["exact", "in"], "age": ["gt"]}
+
+    field = DjangoFilterConnectionField(PetFilterNode)
+    same_field = DjangoFilterConnectionField(
+        PetFilterNode, fields={"name": ["exact", "in"], "age": ["gt"]}
+    )
+    other_field = DjangoFilterConnectionField(PetFilterNode, fields=["name"])
+
+    assert field.filterset_class is same_field.filterset_class
+    assert other_field.filterset_class is not field.filterset_class
+    assert field.filtering_args == same_field.filtering_args
+    assert field.filtering_args["name"] is same_field.filtering_args["name"]
+    assert_arguments(other_field, "name")
+
+    filterset_field = DjangoFilterConnectionField(
+        PetFilterNode, filterset_class=PetFilter
+    )
+    same_filterset_field = DjangoFilterConnectionField(
+        PetFilterNode, filterset_class=PetFilter
+    )
+    assert filterset_field.filterset_class is same_filterset_field.filterset_class
+
+
+def test_filter_arguments_follow_the_types_of_the_registry():
+    from graphene_django.filter import utils
+
+    class ReporterFilterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = "__all__"
+            filter_fields = ["first_name", "a_choice"]
+
+    with patch.object(
+        utils, "build_filtering_args", wraps=utils.build_filtering_args
+    ) as build_filtering_args:
+        field = DjangoFilterConnectionField(ReporterFilterNode)
+        assert "a_choice" in field.filtering_args
+        assert (
+            "a_choice" in DjangoFilterConnectionField(ReporterFilterNode).filtering_args
+        )
+        assert build_filtering_args.call_count == 1
+
+        class NewReporterFilterNode(DjangoObjectType):
+            class Meta:
+                model = Reporter
+                interfaces = (Node,)
+                fields = "__all__"
+                filter_fields = ["first_name", "a_choice"]
+
+        # The arguments are built again from the type replacing the old one
+        new_field = DjangoFilterConnectionField(NewReporterFilterNode)
+        assert new_field.filterset_class is field.filterset_class
+        assert "a_choice" in new_field.filtering_args
+        assert build_filtering_args.call_count == 2
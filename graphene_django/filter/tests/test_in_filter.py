@@ -1,6 +1,8 @@
 from datetime import datetime
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_filters import (
     FilterSet,
     rest_framework as filters,
@@ -445,3 +447,90 @@ def test_enum_in_filter(query):
         {"node": {"email": "jean@bon.com"}},
         {"node": {"email": "jane@doe.com"}},
     ]
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        'name_In: ["Brutus", "Jojo, the rabbit", "Brutus"]',
+        "age_In: [3, 12]",
+        'name_In: ["Mimi"], age_In: [3]',
+        "age_In: [4]",
+    ],
+)
+def test_in_filter_with_array_lookup(query, graphene_settings, arguments):
+    """
+    Test in filters passing their list as a single parameter.
+    """
+    Pet.objects.create(name="Brutus", age=12)
+    Pet.objects.create(name="Mimi", age=3)
+    Pet.objects.create(name="Jojo, the rabbit", age=3)
+
+    schema = Schema(query=query)
+    query = f"{{ pets ({arguments}) {{ edges {{ node {{ name }} }} }} }}"
+
+    graphene_settings.FILTER_ARRAY_LOOKUP_THRESHOLD = None
+    expected = schema.execute(query)
+    assert not expected.errors
+
+    graphene_settings.FILTER_ARRAY_LOOKUP_THRESHOLD = 1
+    with CaptureQueriesContext(connection) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == expected.data
+    assert "JSON_EACH" in captured[-1]["sql"]
+
+
+def test_in_filter_with_many_values(query):
+    """
+    Test in filter on more values than SQLite accepts parameters.
+    """
+    pets = Pet.objects.bulk_create(
+        [Pet(name=name, age=3) for name in ("Brutus", "Mimi", "Jojo")]
+    )
+    ids = [pets[0].id, pets[2].id, *range(100000, 140000)]
+
+    schema = Schema(query=query)
+    query = """
+    query ($ids: [ID]) {
+        pets (id_In: $ids) { edges { node { name } } }
+    }
+    """
+    result = schema.execute(query, variables={"ids": ids})
+    assert not result.errors
+    assert [edge["node"]["name"] for edge in result.data["pets"]["edges"]] == [
+        "Brutus",
+        "Jojo",
+    ]
+
+
+def test_array_lookup_matches_the_in_lookup():
+    owner = Person.objects.create(name="Jane")
+    other_owner = Person.objects.create(name="Joe")
+    Pet.objects.create(name="Brutus", age=12, owner=owner)
+    Pet.objects.create(name="Mimi", age=3, owner=other_owner)
+    Pet.objects.create(name="Jojo", age=3)
+
+    for lookups in [
+        {"owner": [owner.id, None]},
+        {"owner__name": ["Jane", "Nobody"]},
+        {"name": ["Mimi", "Jojo"]},
+        {"age": [None]},
+    ]:
+        for name, values in lookups.items():
+            in_lookup = {f"{name}__in": values}
+            array_lookup = {f"{name}__graphene_in_array": values}
+            assert list(Pet.objects.filter(**array_lookup)) == list(
+                Pet.objects.filter(**in_lookup)
+            )
+            assert list(Pet.objects.exclude(**array_lookup)) == list(
+                Pet.objects.exclude(**in_lookup)
+            )
+
+    # Reverse relation
+    assert list(Person.objects.filter(pets__graphene_in_array=[1, 2, 3])) == list(
+        Person.objects.filter(pets__in=[1, 2, 3])
+    )
+    assert list(Person.objects.exclude(pets__graphene_in_array=[1])) == list(
+        Person.objects.exclude(pets__in=[1])
+    )
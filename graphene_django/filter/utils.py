@@ -7,12 +7,21 @@ from ..forms import GlobalIDFormField, GlobalIDMultipleChoiceField
 from .filters import ListFilter, RangeFilter, TypedFilter
 from .filterset import custom_filterset_factory, setup_filterset
 
+# Filterset classes by the arguments of get_filterset_class
+_filterset_classes = {}
+# Filtering arguments by filterset class and registry, with the types of the
+# models they were built from
+_filtering_args = {}
 
-def get_field_type(registry, model, field_name):
+
+def get_field_type(registry, model, field_name, model_types=None):
     """
     Try to get a model field corresponding Graphql type from the DjangoObjectType.
+    The type of the model is recorded in ``model_types`` when given.
     """
     object_type = registry.get_type_for_model(model)
+    if model_types is not None:
+        model_types[model] = object_type
     if object_type:
         object_type_field = object_type._meta.fields.get(field_name)
         if object_type_field:
@@ -27,12 +36,32 @@ def get_filtering_args_from_filterset(filterset_class, type):
     """
     Inspect a FilterSet and produce the arguments to pass to a Graphene Field.
     These arguments will be available to filter against in the GraphQL API.
+
+    The arguments are cached by filterset class and registry, until one of
+    the types they were built from is replaced in the registry.
     """
+    registry = type._meta.registry
+    key = (filterset_class, registry)
+    cached = _filtering_args.get(key)
+    if cached is not None:
+        args, model_types = cached
+        if all(
+            registry.get_type_for_model(model) is model_type
+            for model, model_type in model_types.items()
+        ):
+            return dict(args)
+
+    model_types = {}
+    args = build_filtering_args(filterset_class, registry, model_types)
+    _filtering_args[key] = (args, model_types)
+    return dict(args)
+
+
+def build_filtering_args(filterset_class, registry, model_types):
     from ..forms.converter import convert_form_field
 
     args = {}
     model = filterset_class._meta.model
-    registry = type._meta.registry
     for name, filter_field in filterset_class.base_filters.items():
         filter_type = filter_field.lookup_expr
         required = filter_field.extra.get("required", False)
@@ -73,11 +102,14 @@ def get_filtering_args_from_filterset(filterset_class, type):
                         ):
                             # Foreign key have dynamic types and filtering on a foreign key actually means filtering on its ID.
                             field_type = get_field_type(
-                                registry, model_field.related_model, "id"
+                                registry, model_field.related_model, "id", model_types
                             )
                         else:
                             field_type = get_field_type(
-                                registry, model_field.model, model_field.name
+                                registry,
+                                model_field.model,
+                                model_field.name,
+                                model_types,
                             )
 
             if not field_type:
@@ -106,7 +138,39 @@ def get_filtering_args_from_filterset(filterset_class, type):
 def get_filterset_class(filterset_class, **meta):
     """
     Get the class to be used as the FilterSet.
+
+    The class is created once for the same arguments, and shared by the
+    fields using them.
     """
+    # The meta is only used to create a FilterSet class
+    key = (filterset_class,) if filterset_class else freeze_filterset_meta(meta)
+    try:
+        graphene_filterset_class = _filterset_classes.get(key)
+    except TypeError:
+        # Unhashable meta
+        return create_filterset_class(filterset_class, **meta)
+    if graphene_filterset_class is None:
+        graphene_filterset_class = _filterset_classes[key] = create_filterset_class(
+            filterset_class, **meta
+        )
+    return graphene_filterset_class
+
+
+def freeze_filterset_meta(value):
+    """
+    Returns a hashable equivalent of the meta of a FilterSet, e.g. of its
+    ``fields`` dict of lookups.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((k, freeze_filterset_meta(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze_filterset_meta(v) for v in value))
+    if isinstance(value, set):
+        return frozenset(freeze_filterset_meta(v) for v in value)
+    return value
+
+
+def create_filterset_class(filterset_class, **meta):
     if filterset_class:
         # If were given a FilterSet class, then set it up.
         graphene_filterset_class = setup_filterset(filterset_class)
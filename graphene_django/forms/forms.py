@@ -1,11 +1,54 @@
 import binascii
 
 from django.core.exceptions import ValidationError
-from django.forms import CharField, Field, MultipleChoiceField
+from django.forms import Field, MultipleChoiceField
 from django.utils.translation import gettext_lazy as _
 from graphql_relay import from_global_id
 
 
+def decode_global_id(global_id):
+    """
+    Returns the type name and the ID of a global ID, or ``None`` if it isn't
+    a valid global ID.
+    """
+    try:
+        _type, _id = from_global_id(global_id)
+    except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+    # Both are required and without null characters, as cleaned by a CharField
+    if not _type.strip() or not _id.strip() or "\x00" in _type or "\x00" in _id:
+        return None
+    return _type, _id
+
+
+class GlobalIDList(list):
+    """
+    The distinct global IDs cleaned by ``GlobalIDMultipleChoiceField``, with
+    the type name and the ID they decode to in ``decoded``.
+    """
+
+    def __init__(self, decoded):
+        super().__init__(decoded)
+        self.decoded = list(decoded.values())
+
+
+def decode_global_ids(global_ids):
+    """
+    Decodes global IDs in a single pass, skipping the duplicates. Raises a
+    ``ValidationError`` on the first invalid one.
+    """
+    decoded = {}
+    for global_id in global_ids:
+        if global_id not in decoded:
+            resolved = decode_global_id(global_id)
+            if resolved is None:
+                raise ValidationError(
+                    GlobalIDFormField.default_error_messages["invalid"]
+                )
+            decoded[global_id] = resolved
+    return GlobalIDList(decoded)
+
+
 class GlobalIDFormField(Field):
     default_error_messages = {"invalid": _("Invalid ID specified.")}
 
@@ -13,15 +56,7 @@ class GlobalIDFormField(Field):
         if not value and not self.required:
             return None
 
-        try:
-            _type, _id = from_global_id(value)
-        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
-            raise ValidationError(self.error_messages["invalid"])
-
-        try:
-            CharField().clean(_id)
-            CharField().clean(_type)
-        except ValidationError:
+        if decode_global_id(value) is None:
             raise ValidationError(self.error_messages["invalid"])
 
         return value
@@ -34,6 +69,18 @@ class GlobalIDMultipleChoiceField(MultipleChoiceField):
     }
 
     def valid_value(self, value):
-        # Clean will raise a validation error if there is a problem
-        GlobalIDFormField().clean(value)
+        if decode_global_id(value) is None:
+            raise ValidationError(GlobalIDFormField.default_error_messages["invalid"])
         return True
+
+    def validate(self, value):
+        # The IDs are validated once by clean, when they are decoded
+        if self.required and not value:
+            raise ValidationError(self.error_messages["required"], code="required")
+
+    def clean(self, value):
+        value = self.to_python(value)
+        self.validate(value)
+        value = decode_global_ids(value)
+        self.run_validators(value)
+        return value
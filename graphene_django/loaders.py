@@ -0,0 +1,442 @@
+"""
+Batch loading of the objects related to the items of a list.
+
+When the type of a foreign key or a one-to-one relation overrides
+``get_queryset``, every related object is fetched through that queryset to
+apply its filtering. Instead of running one query per item, the objects
+related to all the items of the list (the siblings) are fetched with a single
+``__in`` query the first time one of them is resolved, and cached for the
+rest of the execution.
+
+The lists resolved by ``DjangoListField`` and ``DjangoConnectionField`` are
+registered as groups of siblings. Since the siblings are known before their
+fields are resolved, this works the same with synchronous and asynchronous
+execution.
+
+The siblings also share the queries of their prefetched lists and of the
+pages of their nested connections.
+"""
+
+import django
+from django.db import connections
+from django.db.models import Count, ForeignObject
+from django.db.models.query import QuerySet
+
+from .constants import BATCH_LOADERS_ATTRIBUTE
+from .settings import graphene_settings
+
+
+class ExecutionLoaders:
+    """
+    The state of the batch loading during the execution of an operation.
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.siblings = {}
+        self.objects = {}
+
+    def register(self, instances):
+        self.pending.append(instances)
+
+    def get_siblings(self, instance):
+        siblings = self.siblings.get(id(instance))
+        if siblings is None:
+            self.index_pending()
+            siblings = self.siblings.get(id(instance))
+        if siblings is None or siblings[0] is not instance:
+            return [instance]
+        return siblings[1]
+
+    def index_pending(self):
+        pending = []
+        for instances in self.pending:
+            if isinstance(instances, QuerySet):
+                if instances._result_cache is None:
+                    # Not evaluated yet
+                    pending.append(instances)
+                    continue
+                instances = instances._result_cache
+            for instance in instances:
+                self.siblings[id(instance)] = (instance, instances)
+        self.pending = pending
+
+    def load(self, objects, instance, attname, get_queryset, key_attname):
+        """
+        Returns the object cached in ``objects`` under the ``attname`` value of
+        ``instance``. On a miss, the objects of the ``attname`` values of the
+        siblings are fetched with the queryset returned by ``get_queryset``
+        and cached under their ``key_attname`` value.
+        """
+        key = getattr(instance, attname)
+        if key is None:
+            return None
+        if key in objects:
+            return objects[key]
+
+        keys = {key}
+        for sibling in self.get_siblings(instance):
+            sibling_key = getattr(sibling, attname, None)
+            if sibling_key is not None and sibling_key not in objects:
+                keys.add(sibling_key)
+
+        for obj in get_queryset(keys):
+            objects[getattr(obj, key_attname)] = obj
+        for missing_key in keys.difference(objects):
+            objects[missing_key] = None
+        return objects[key]
+
+    def get_object(self, django_object_type, info, instance, attname):
+        """
+        Returns the object of ``django_object_type`` whose primary key is held
+        by the ``attname`` attribute of ``instance``, fetching the objects
+        referenced by its siblings at the same time.
+        """
+        model = django_object_type._meta.model
+
+        def get_queryset(pks):
+            # The same queryset as `DjangoObjectType.get_node`
+            queryset = django_object_type.get_queryset(model.objects, info)
+            return queryset.filter(pk__in=pks)
+
+        return self.load(
+            self.objects.setdefault(django_object_type, {}),
+            instance,
+            attname,
+            get_queryset,
+            model._meta.pk.attname,
+        )
+
+    def get_reverse_object(self, django_object_type, info, instance, remote_field):
+        """
+        Returns the object of ``django_object_type`` whose one-to-one
+        ``remote_field`` points to ``instance``, fetching the objects pointing
+        to its siblings at the same time.
+        """
+        model = django_object_type._meta.model
+
+        def get_queryset(keys):
+            return django_object_type.get_queryset(
+                model.objects.filter(**{f"{remote_field.name}__in": keys}), info
+            )
+
+        return self.load(
+            self.objects.setdefault((django_object_type, remote_field), {}),
+            instance,
+            remote_field.target_field.attname,
+            get_queryset,
+            remote_field.attname,
+        )
+
+    def get_queryset_only_filters(self, django_object_type, info):
+        """
+        Returns whether the ``get_queryset`` of ``django_object_type`` only
+        filters the rows of the queryset it is given, so that the objects
+        prefetched without it can be filtered afterwards with the same
+        result: it doesn't order, annotate, slice or transform them.
+        """
+        key = ("only_filters", django_object_type)
+        only_filters = self.objects.get(key)
+        if only_filters is None:
+            manager = django_object_type._meta.model._default_manager
+            queryset = django_object_type.get_queryset(manager.all(), info)
+            only_filters = self.objects[key] = is_filtered_queryset(
+                manager.all(), queryset
+            )
+        return only_filters
+
+    def filter_prefetched(self, django_object_type, info, instance, cache_name):
+        """
+        Returns the objects prefetched in the ``cache_name`` cache of
+        ``instance`` that belong to the queryset of ``django_object_type``.
+        The objects prefetched for the siblings are checked with the same
+        query. Returns ``None`` when ``get_queryset`` does more than filtering
+        the rows.
+        """
+        if not self.get_queryset_only_filters(django_object_type, info):
+            return None
+        allowed = self.objects.setdefault(("prefetched", django_object_type), {})
+        unchecked = set()
+        for sibling in self.get_siblings(instance):
+            prefetched = getattr(sibling, "_prefetched_objects_cache", {}).get(
+                cache_name
+            )
+            for obj in getattr(prefetched, "_result_cache", None) or ():
+                if obj.pk not in allowed:
+                    unchecked.add(obj.pk)
+
+        if unchecked:
+            model = django_object_type._meta.model
+            queryset = django_object_type.get_queryset(
+                model._default_manager.filter(pk__in=unchecked), info
+            )
+            if isinstance(queryset, QuerySet):
+                allowed_pks = set(queryset.values_list("pk", flat=True))
+            else:
+                allowed_pks = {obj.pk for obj in queryset}
+            for pk in unchecked:
+                allowed[pk] = pk in allowed_pks
+
+        return [
+            obj
+            for obj in instance._prefetched_objects_cache[cache_name]
+            if allowed[obj.pk]
+        ]
+
+    def get_page(
+        self, key, manager, get_queryset, slice_start, slice_end, with_total_count
+    ):
+        """
+        Returns the ``slice_start:slice_end`` rows of the related ``manager``,
+        their total when ``with_total_count`` is set, and the queryset of the
+        relation, filtered by the queryset returned by ``get_queryset``. The
+        pages of the same relation of the siblings of the instance of the
+        manager are fetched at the same time, and cached under ``key``.
+
+        Returns ``None`` when the relation can't be paginated in batch.
+        """
+        lookups = get_related_manager_lookups(manager)
+        if lookups is None:
+            return None
+
+        batch = self.objects.get(key)
+        if batch is None:
+            queryset = get_queryset()
+            batch = self.objects[key] = (
+                (queryset, {}) if can_paginate_in_batch(queryset) else False
+            )
+        if not batch:
+            return None
+
+        queryset, pages = batch
+        instance = manager.instance
+        page = pages.get(id(instance))
+        if page is None or page[0] is not instance:
+            model = instance._meta.concrete_model
+            siblings = [
+                sibling
+                for sibling in self.get_siblings(instance)
+                if sibling is not instance
+                and getattr(sibling, "_meta", None) is not None
+                and sibling._meta.concrete_model is model
+                and sibling.pk is not None
+                and id(sibling) not in pages
+            ]
+            if not siblings:
+                # A single window query wouldn't save anything
+                return None
+            self.load_pages(
+                pages,
+                manager,
+                lookups,
+                queryset,
+                [instance, *siblings],
+                slice_start,
+                slice_end,
+                with_total_count,
+            )
+            page = pages[id(instance)]
+        return page[1], page[2], queryset.filter(**{lookups[0]: instance})
+
+    def load_pages(
+        self,
+        pages,
+        manager,
+        lookups,
+        queryset,
+        instances,
+        slice_start,
+        slice_end,
+        with_total_count,
+    ):
+        lookup, group_by = lookups
+        # Django filters a sliced prefetch queryset with ROW_NUMBER() over the
+        # partitions of the related instances.
+        prefetch_queryset = queryset[slice_start:slice_end]
+        if hasattr(manager, "get_prefetch_querysets"):
+            prefetch = manager.get_prefetch_querysets(instances, [prefetch_queryset])
+        else:
+            prefetch = manager.get_prefetch_queryset(instances, prefetch_queryset)
+        rows, rel_obj_attr, instance_attr = prefetch[:3]
+
+        rows_by_key = {}
+        for row in rows:
+            rows_by_key.setdefault(rel_obj_attr(row), []).append(row)
+
+        totals = None
+        if with_total_count:
+            counts = (
+                queryset.filter(**{f"{lookup}__in": instances})
+                .order_by()
+                .values(*group_by)
+                .annotate(graphene_total=Count("pk"))
+            )
+            totals = {
+                tuple(values[name] for name in group_by): values["graphene_total"]
+                for values in counts
+            }
+
+        for instance in instances:
+            key = instance_attr(instance)
+            pages[id(instance)] = (
+                instance,
+                rows_by_key.get(key, []),
+                None if totals is None else totals.get(key, 0),
+            )
+
+
+def get_execution_loaders(info):
+    """
+    Returns the batch loading state of the operation being executed, stored on
+    the context of the request, or ``None`` if batching is disabled or the context doesn't
+    support it.
+    """
+    context = info.context
+    if not graphene_settings.BATCH_RELATED_OBJECTS or context is None:
+        return None
+    if isinstance(context, dict):
+        loaders = context.setdefault(BATCH_LOADERS_ATTRIBUTE, {})
+    else:
+        loaders = getattr(context, BATCH_LOADERS_ATTRIBUTE, None)
+        if loaders is None:
+            loaders = {}
+            try:
+                setattr(context, BATCH_LOADERS_ATTRIBUTE, loaders)
+            except AttributeError:
+                return None
+    # The coerced variables are a new dict for every execution, so that
+    # objects cached by an operation aren't reused by the next ones (e.g. of a
+    # batch) after a mutation.
+    key = id(info.variable_values)
+    execution_loaders = loaders.get(key)
+    if execution_loaders is None or execution_loaders[0] is not info.variable_values:
+        execution_loaders = loaders[key] = (info.variable_values, ExecutionLoaders())
+    return execution_loaders[1]
+
+
+def register_siblings(info, instances):
+    """
+    Registers the items of a list, or of a queryset once evaluated, as
+    siblings whose related objects are loaded together.
+    """
+    loaders = get_execution_loaders(info)
+    if loaders is not None and isinstance(instances, (list, tuple, QuerySet)):
+        loaders.register(instances)
+
+
+def get_related_object(django_object_type, info, instance, attname):
+    loaders = get_execution_loaders(info)
+    if loaders is None:
+        return django_object_type.get_node(info, getattr(instance, attname))
+    return loaders.get_object(django_object_type, info, instance, attname)
+
+
+def get_reverse_related_object(django_object_type, info, instance, remote_field):
+    loaders = get_execution_loaders(info)
+    if loaders is not None:
+        return loaders.get_reverse_object(
+            django_object_type, info, instance, remote_field
+        )
+    try:
+        return django_object_type.get_queryset(
+            django_object_type._meta.model.objects.filter(
+                **{remote_field.name: instance.pk}
+            ),
+            info,
+        ).get()
+    except django_object_type._meta.model.DoesNotExist:
+        return None
+
+
+def get_prefetch_cache_name(instance, queryset):
+    """
+    Returns the name of the prefetch cache of ``instance`` holding
+    ``queryset``, or ``None`` if the queryset wasn't prefetched.
+    """
+    if getattr(queryset, "_result_cache", None) is None:
+        return None
+    for cache_name, prefetched in getattr(
+        instance, "_prefetched_objects_cache", {}
+    ).items():
+        if prefetched is queryset:
+            return cache_name
+    return None
+
+
+def get_prefetched_objects(django_object_type, info, instance, queryset):
+    """
+    Returns the objects of ``queryset`` that belong to the queryset of
+    ``django_object_type`` when ``queryset`` was prefetched on ``instance``,
+    instead of running its ``get_queryset`` filters again in the database.
+    Returns ``None`` otherwise.
+    """
+    cache_name = get_prefetch_cache_name(instance, queryset)
+    if cache_name is None:
+        return None
+    loaders = get_execution_loaders(info)
+    if loaders is None:
+        return None
+    return loaders.filter_prefetched(django_object_type, info, instance, cache_name)
+
+
+def is_filtered_queryset(base, queryset):
+    """
+    Returns whether ``queryset`` only adds filters to ``base``.
+    """
+    if not isinstance(queryset, QuerySet):
+        return False
+    if queryset.model is not base.model or (
+        queryset._iterable_class is not base._iterable_class
+    ):
+        return False
+    query, base_query = queryset.query, base.query
+    return (
+        query.order_by == base_query.order_by
+        and query.extra_order_by == base_query.extra_order_by
+        and query.default_ordering == base_query.default_ordering
+        and query.annotation_select.keys() == base_query.annotation_select.keys()
+        and query.extra_select.keys() == base_query.extra_select.keys()
+        and query.distinct == base_query.distinct
+        and query.values_select == base_query.values_select
+        and not query.is_sliced
+        and not query.combinator
+        and queryset._prefetch_related_lookups == base._prefetch_related_lookups
+    )
+
+
+def is_related_manager(manager):
+    """
+    Returns whether ``manager`` is the manager of a reverse foreign key or a
+    many-to-many relation of a model instance.
+    """
+    return get_related_manager_lookups(manager) is not None
+
+
+def get_related_manager_lookups(manager):
+    """
+    Returns the lookup selecting the objects of a related manager by
+    instance, and the fields holding the ``instance_attr`` values of its
+    prefetch querysets. Returns ``None`` for other managers.
+    """
+    if getattr(manager, "instance", None) is None:
+        return None
+    if hasattr(manager, "through") and hasattr(manager, "query_field_name"):
+        lookup = manager.query_field_name
+        return lookup, [
+            f"{lookup}__{field.name}"
+            for field in manager.source_field.foreign_related_fields
+        ]
+    field = getattr(manager, "field", None)
+    if isinstance(field, ForeignObject) and hasattr(manager, "core_filters"):
+        return field.name, [field.attname for field in field.local_related_fields]
+    return None
+
+
+def can_paginate_in_batch(queryset):
+    # Prefetching from a sliced queryset requires Django 4.2
+    if django.VERSION < (4, 2) or not isinstance(queryset, QuerySet):
+        return False
+    query = queryset.query
+    if query.is_sliced or query.distinct or query.combinator:
+        return False
+    return connections[queryset.db].features.supports_over_clause
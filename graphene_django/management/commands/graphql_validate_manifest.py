@@ -0,0 +1,84 @@
+import importlib
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql import validate_schema
+
+from graphene_django.operation_manifest import OperationManifest
+from graphene_django.settings import graphene_settings
+
+
+class Command(BaseCommand):
+    help = "Validate the operations of a manifest against the Graphene schema"
+    can_import_settings = True
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "manifest",
+            nargs="?",
+            type=str,
+            default=graphene_settings.OPERATION_MANIFEST,
+            help="Manifest file to validate (default: the OPERATION_MANIFEST setting)",
+        )
+
+        parser.add_argument(
+            "--schema",
+            type=str,
+            dest="schema",
+            default=graphene_settings.SCHEMA,
+            help="Django app containing schema to validate against, e.g. myproject.core.schema.schema",
+        )
+
+    def get_schema(self, options_schema):
+        if options_schema and isinstance(options_schema, str):
+            module_str, schema_name = options_schema.rsplit(".", 1)
+            mod = importlib.import_module(module_str)
+            return getattr(mod, schema_name)
+        return options_schema or graphene_settings.SCHEMA
+
+    def handle(self, *args, **options):
+        schema = self.get_schema(options.get("schema"))
+        if not schema:
+            raise CommandError(
+                "Specify schema on GRAPHENE.SCHEMA setting or by using --schema"
+            )
+
+        path = options.get("manifest")
+        if not path:
+            raise CommandError(
+                "Specify manifest on GRAPHENE.OPERATION_MANIFEST setting or as argument"
+            )
+
+        try:
+            manifest = OperationManifest.from_file(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CommandError(f'Could not load manifest "{path}": {e}')
+
+        graphql_schema = schema.graphql_schema
+        schema_errors = validate_schema(graphql_schema)
+        if schema_errors:
+            raise CommandError(
+                "Invalid schema: {}".format("; ".join(e.message for e in schema_errors))
+            )
+
+        compiled = manifest.compile(
+            graphql_schema, max_errors=graphene_settings.MAX_VALIDATION_ERRORS
+        )
+        invalid = 0
+        for operation_id, (_, errors) in compiled.items():
+            if not errors:
+                continue
+            invalid += 1
+            for error in errors:
+                self.stderr.write(f"{operation_id}: {error}")
+
+        if invalid:
+            raise CommandError(
+                f"{invalid} of {len(manifest)} operations in {path} are invalid"
+            )
+
+        style = getattr(self, "style", None)
+        success = getattr(style, "SUCCESS", lambda x: x)
+        self.stdout.write(
+            success(f"Successfully validated {len(manifest)} operations in {path}")
+        )
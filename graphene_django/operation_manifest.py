@@ -0,0 +1,100 @@
+"""
+Support for locking a GraphQLView down to the operations of a manifest.
+
+The manifest is a JSON file produced by the client build. It either maps each
+operation id to its query::
+
+    {"3f2a...": "query Hero { hero { name } }"}
+
+or uses the Apollo persisted query manifest format::
+
+    {"format": "apollo-persisted-query-manifest", "version": 1,
+     "operations": [{"id": "3f2a...", "body": "query Hero { hero { name } }"}]}
+
+Clients reference operations with ``extensions.persistedQuery.sha256Hash``.
+Every operation is parsed and validated once per schema, so requests only do
+a dictionary lookup before execution.
+"""
+
+import json
+from threading import Lock
+
+from graphql import parse, validate
+
+from .persisted_queries import PersistedQueryNotInList
+
+
+class OperationManifest:
+    def __init__(self, operations):
+        self.operations = dict(operations)
+        self._compiled = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_dict(cls, manifest):
+        if "operations" in manifest and isinstance(manifest["operations"], list):
+            return cls(
+                (operation["id"], operation["body"])
+                for operation in manifest["operations"]
+            )
+        return cls(manifest)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as manifest_file:
+            return cls.from_dict(json.load(manifest_file))
+
+    def __contains__(self, operation_id):
+        return operation_id in self.operations
+
+    def __len__(self):
+        return len(self.operations)
+
+    def compile(self, schema, validation_rules=None, max_errors=None):
+        """
+        Parses and validates every operation against the GraphQL schema and
+        returns a mapping of operation id to ``(document, errors)`` tuples. The
+        document is ``None`` when the operation could not be parsed.
+        """
+        key = (schema, tuple(validation_rules or ()), max_errors)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is None:
+                compiled = {}
+                for operation_id, query in self.operations.items():
+                    try:
+                        document = parse(query)
+                    except Exception as e:
+                        compiled[operation_id] = (None, [e])
+                        continue
+                    compiled[operation_id] = (
+                        document,
+                        validate(schema, document, validation_rules, max_errors),
+                    )
+                self._compiled[key] = compiled
+        return compiled
+
+    def get_document(
+        self, operation_id, schema, validation_rules=None, max_errors=None
+    ):
+        try:
+            return self.compile(schema, validation_rules, max_errors)[operation_id]
+        except (KeyError, TypeError):
+            raise PersistedQueryNotInList()
+
+
+_manifests = {}
+
+
+def load_operation_manifest(path):
+    """
+    Returns the manifest stored at ``path``, reading the file only once.
+    """
+    manifest = _manifests.get(path)
+    if manifest is None:
+        manifest = _manifests[path] = OperationManifest.from_file(path)
+    return manifest
@@ -0,0 +1,457 @@
+"""
+Query optimizer driven by the selection set of a GraphQL query.
+
+When the ``OPTIMIZE_QUERIES`` setting is enabled, the querysets resolved by
+``DjangoListField`` and ``DjangoConnectionField`` are optimized for the fields
+selected by the query: forward foreign keys and one-to-one relations are
+joined with ``select_related``, and reverse foreign keys and many-to-many
+relations are fetched with ``prefetch_related``, nested with ``Prefetch``
+objects. This avoids running one query per parent row when resolving nested
+relations.
+
+When the ``OPTIMIZE_QUERY_COLUMNS`` setting is enabled, only the columns of
+the selected fields are loaded with ``only()``, along with the primary key
+and the foreign keys of the models.
+
+Fields with a custom resolver can't be mapped to a relation or a column
+automatically. Types describe what these fields need with the
+``optimizer_hints`` option, otherwise every column of their model is loaded.
+Columns that are always needed, e.g. by the ``__init__`` of the model, are
+listed in the ``required_columns`` option::
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            fields = "__all__"
+            required_columns = ("reporter_type",)
+            optimizer_hints = {
+                "article_count": OptimizerHint(prefetch_related=("articles",)),
+                "full_name": OptimizerHint(only=("first_name", "last_name")),
+            }
+"""
+
+from django.db.models import Prefetch
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable, QuerySet
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.type import GraphQLObjectType, get_named_type
+
+from graphene import Dynamic
+from graphene.relay import Connection
+from graphene.utils.str_converters import to_camel_case
+
+from .loaders import can_paginate_in_batch, get_execution_loaders
+from .settings import graphene_settings
+from .utils import get_model_fields
+from .utils.utils import is_attribute_resolver
+
+# Arguments that paginate a connection without changing the rows it holds.
+PAGINATION_ARGUMENTS = frozenset(("first", "last", "after", "before", "offset"))
+
+
+class OptimizerHint:
+    """
+    Describes the relations and columns a field needs, as
+    ``select_related``, ``prefetch_related`` and ``only`` lookups relative to
+    the model of the type.
+    """
+
+    def __init__(self, select_related=(), prefetch_related=(), only=()):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.only = tuple(only)
+
+
+class QueryOptimization:
+    """
+    The lookups collected for a queryset.
+    """
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related or self.only)
+
+    def apply(self, queryset):
+        deferred_fields, defer = queryset.query.deferred_loading
+        # Don't override the columns chosen by the resolver
+        if self.only and defer and not deferred_fields:
+            queryset = queryset.only(*self.only)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            existing = {
+                lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+                for lookup in queryset._prefetch_related_lookups
+            }
+            lookups = [
+                lookup
+                for lookup in self.prefetch_related
+                if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup)
+                not in existing
+            ]
+            if lookups:
+                queryset = queryset.prefetch_related(*lookups)
+        return queryset
+
+
+def prefix_lookup(prefix, lookup):
+    if not prefix:
+        return lookup
+    if isinstance(lookup, Prefetch):
+        return Prefetch(
+            prefix + lookup.prefetch_through,
+            queryset=lookup.queryset,
+            to_attr=lookup.to_attr,
+        )
+    return prefix + lookup
+
+
+def get_required_columns(model):
+    """
+    Returns the columns always loaded when pruning: the primary key, and the
+    foreign keys, which are needed to resolve and prefetch relations.
+    """
+    return [model._meta.pk.name] + [
+        field.name for field in model._meta.concrete_fields if field.is_relation
+    ]
+
+
+def get_all_columns(model):
+    return [field.name for field in model._meta.concrete_fields]
+
+
+def get_ordering_columns(queryset):
+    query = queryset.query
+    ordering = query.order_by or (
+        query.get_meta().ordering if query.default_ordering else ()
+    )
+    concrete_fields = {field.name for field in queryset.model._meta.concrete_fields}
+    return [
+        field.lstrip("-+")
+        for field in ordering
+        if isinstance(field, str) and field.lstrip("-+") in concrete_fields
+    ]
+
+
+def has_custom_get_queryset(django_object_type):
+    from .types import DjangoObjectType
+
+    return (
+        django_object_type.get_queryset.__func__
+        is not DjangoObjectType.get_queryset.__func__
+    )
+
+
+def can_optimize(queryset):
+    return (
+        isinstance(queryset, QuerySet)
+        # Querysets of prefetched relations are already evaluated
+        and getattr(queryset, "_result_cache", None) is None
+        and getattr(queryset, "_iterable_class", None) is ModelIterable
+    )
+
+
+class QueryOptimizer:
+    def __init__(self, info, select_relations=True, prune_columns=False):
+        self.info = info
+        self.schema = info.schema
+        self.fragments = info.fragments
+        self.select_relations = select_relations
+        self.prune_columns = prune_columns
+
+    def optimize(self, queryset, django_object_type, field_nodes):
+        """
+        Returns ``queryset`` with the relations needed to resolve the
+        selection of ``field_nodes`` on ``django_object_type``.
+        """
+        if not can_optimize(queryset):
+            return queryset
+        optimization = QueryOptimization()
+        self.collect(optimization, django_object_type, field_nodes, prefix="")
+        if optimization.only:
+            # The rows may be filtered or paginated on their ordering keys
+            optimization.only.extend(get_ordering_columns(queryset))
+        return optimization.apply(queryset)
+
+    def iter_field_nodes(self, type_name, selection_set):
+        if selection_set is None:
+            return
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield selection
+                continue
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment = selection
+            else:
+                fragment = None
+            if fragment is None:
+                continue
+            type_condition = fragment.type_condition
+            if type_condition is not None:
+                condition_type = self.schema.get_type(type_condition.name.value)
+                # Skip the fragments on other object types
+                if (
+                    isinstance(condition_type, GraphQLObjectType)
+                    and condition_type.name != type_name
+                ):
+                    continue
+            yield from self.iter_field_nodes(type_name, fragment.selection_set)
+
+    def get_selected_fields(self, type_name, field_nodes):
+        """
+        Returns the field nodes selected on ``field_nodes`` grouped by field
+        name, merging aliases and repeated selections.
+        """
+        selected_fields = {}
+        for field_node in field_nodes:
+            for selected in self.iter_field_nodes(type_name, field_node.selection_set):
+                selected_fields.setdefault(selected.name.value, []).append(selected)
+        return selected_fields
+
+    def get_connection_node_field_nodes(self, connection_type_name, field_nodes):
+        edges_type_name = get_named_type(
+            self.schema.get_type(connection_type_name).fields["edges"].type
+        ).name
+        edges = self.get_selected_fields(connection_type_name, field_nodes).get(
+            "edges", []
+        )
+        return self.get_selected_fields(edges_type_name, edges).get("node", [])
+
+    def collect(self, optimization, django_object_type, field_nodes, prefix):
+        type_name = django_object_type._meta.name
+        graphql_type = self.schema.get_type(type_name)
+        if graphql_type is None:
+            return
+        model = django_object_type._meta.model
+        model_fields = dict(get_model_fields(model))
+        hints = getattr(django_object_type._meta, "optimizer_hints", None) or {}
+        graphene_fields = django_object_type._meta.fields
+        columns = get_required_columns(model)
+        columns.extend(getattr(django_object_type._meta, "required_columns", ()))
+
+        for name, nodes in self.get_selected_fields(type_name, field_nodes).items():
+            graphql_field = graphql_type.fields.get(name)
+            field_name = self.get_field_name(graphene_fields, graphql_type, name)
+            if graphql_field is None or field_name is None:
+                continue
+
+            hint = hints.get(field_name)
+            if hint is not None:
+                columns.extend(hint.only)
+                if self.select_relations:
+                    optimization.select_related.extend(
+                        prefix + lookup for lookup in hint.select_related
+                    )
+                    optimization.prefetch_related.extend(
+                        prefix_lookup(prefix, lookup)
+                        for lookup in hint.prefetch_related
+                    )
+                continue
+
+            if field_name == "id":
+                # Resolved from the primary key
+                continue
+
+            model_field = model_fields.get(field_name)
+            if model_field is None or self.has_custom_resolver(
+                django_object_type, field_name
+            ):
+                # The columns needed by the field are unknown
+                columns = get_all_columns(model)
+                continue
+
+            if not model_field.is_relation:
+                if model_field.concrete:
+                    columns.append(model_field.name)
+                continue
+
+            if not self.select_relations or model_field.related_model is None:
+                continue
+
+            self.collect_relation(
+                optimization,
+                model_field,
+                field_name,
+                graphene_fields[field_name],
+                graphql_field,
+                nodes,
+                prefix,
+            )
+
+        if self.prune_columns:
+            optimization.only.extend(prefix + column for column in columns)
+
+    def collect_relation(
+        self,
+        optimization,
+        model_field,
+        field_name,
+        graphene_field,
+        graphql_field,
+        nodes,
+        prefix,
+    ):
+        named_type = get_named_type(graphql_field.type)
+        graphene_type = getattr(named_type, "graphene_type", None)
+        lookup = prefix + field_name
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if isinstance(graphene_type, type) and issubclass(
+                graphene_type, Connection
+            ):
+                if self.has_filtering_arguments(nodes):
+                    return
+                related_type = graphene_type._meta.node
+                if self.paginates_in_batch(graphene_field, model_field, nodes):
+                    # The pages of every parent are fetched together, from
+                    # the queryset of the connection rather than the prefetch
+                    return
+                nodes = self.get_connection_node_field_nodes(named_type.name, nodes)
+                is_list = False
+            else:
+                related_type = graphene_type
+                is_list = True
+
+            if not self.is_django_object_type(related_type):
+                return
+            if has_custom_get_queryset(related_type) and not (
+                is_list and self.reuses_prefetched(related_type)
+            ):
+                # The related type filters its queryset, which would discard
+                # the prefetched rows.
+                return
+
+            nested = QueryOptimization()
+            self.collect(nested, related_type, nodes, prefix="")
+            if nested:
+                related_model = related_type._meta.model
+                optimization.prefetch_related.append(
+                    Prefetch(
+                        lookup,
+                        queryset=nested.apply(related_model._default_manager.all()),
+                    )
+                )
+            else:
+                optimization.prefetch_related.append(lookup)
+            return
+
+        # Forward and reverse one-to-one relations, and forward foreign keys
+        if not self.is_django_object_type(graphene_type) or has_custom_get_queryset(
+            graphene_type
+        ):
+            # The related object is fetched through `get_node` to go through
+            # the `get_queryset` of its type.
+            return
+        optimization.select_related.append(lookup)
+        self.collect(optimization, graphene_type, nodes, prefix=lookup + LOOKUP_SEP)
+
+    @staticmethod
+    def get_field_name(graphene_fields, graphql_type, graphql_name):
+        for field_name, field in graphene_fields.items():
+            name = getattr(field, "name", None) or to_camel_case(field_name)
+            if graphql_name == name or (
+                graphql_name == field_name and name not in graphql_type.fields
+            ):
+                return field_name
+        return None
+
+    @staticmethod
+    def has_custom_resolver(django_object_type, field_name):
+        field = django_object_type._meta.fields[field_name]
+        resolver = getattr(field, "resolver", None)
+        return (
+            resolver is not None and not is_attribute_resolver(resolver)
+        ) or getattr(django_object_type, f"resolve_{field_name}", None) is not None
+
+    def reuses_prefetched(self, django_object_type):
+        """
+        Tells whether ``DjangoListField`` filters the prefetched rows of a
+        type overriding ``get_queryset`` in Python, which it does when
+        ``get_queryset`` only filters them.
+        """
+        loaders = get_execution_loaders(self.info)
+        return loaders is not None and loaders.get_queryset_only_filters(
+            django_object_type, self.info
+        )
+
+    def paginates_in_batch(self, graphene_field, model_field, nodes):
+        """
+        Tells whether ``DjangoConnectionField`` paginates the connection of
+        every parent at once, which doesn't read prefetched rows.
+        """
+        from .fields import PAGINATION_OFFSET
+
+        if isinstance(graphene_field, Dynamic):
+            graphene_field = graphene_field.get_type()
+        if getattr(graphene_field, "pagination", None) != PAGINATION_OFFSET:
+            return False
+        if get_execution_loaders(self.info) is None:
+            return False
+        if any(
+            argument.name.value == "last"
+            for node in nodes
+            for argument in node.arguments or ()
+        ):
+            # Backward pagination is done one parent at a time
+            return False
+        return can_paginate_in_batch(model_field.related_model._default_manager.all())
+
+    @staticmethod
+    def has_filtering_arguments(nodes):
+        return any(
+            argument.name.value not in PAGINATION_ARGUMENTS
+            for node in nodes
+            for argument in node.arguments or ()
+        )
+
+    @staticmethod
+    def is_django_object_type(graphene_type):
+        from .types import DjangoObjectType
+
+        return isinstance(graphene_type, type) and issubclass(
+            graphene_type, DjangoObjectType
+        )
+
+
+def get_query_optimizer(info):
+    select_relations = graphene_settings.OPTIMIZE_QUERIES
+    prune_columns = graphene_settings.OPTIMIZE_QUERY_COLUMNS
+    if not (select_relations or prune_columns):
+        return None
+    return QueryOptimizer(
+        info, select_relations=select_relations, prune_columns=prune_columns
+    )
+
+
+def optimize_queryset(queryset, django_object_type, info, field_nodes=None):
+    """
+    Optimizes ``queryset`` for the selection made on the field being
+    resolved, according to the ``OPTIMIZE_QUERIES`` and
+    ``OPTIMIZE_QUERY_COLUMNS`` settings.
+    """
+    optimizer = get_query_optimizer(info)
+    if optimizer is None:
+        return queryset
+    return optimizer.optimize(
+        queryset, django_object_type, field_nodes or info.field_nodes
+    )
+
+
+def optimize_connection_queryset(queryset, connection, info):
+    """
+    Optimizes the queryset of a connection for the selection made on the
+    nodes of its edges.
+    """
+    optimizer = get_query_optimizer(info)
+    if optimizer is None or not can_optimize(queryset):
+        return queryset
+    field_nodes = optimizer.get_connection_node_field_nodes(
+        connection._meta.name, info.field_nodes
+    )
+    return optimizer.optimize(queryset, connection._meta.node, field_nodes)
@@ -0,0 +1,178 @@
+"""
+Support for automatic persisted queries (APQ), as implemented by Apollo.
+
+Clients send the SHA-256 hash of a query in the
+``extensions.persistedQuery.sha256Hash`` request parameter instead of the
+query text. When the server doesn't know the hash yet, it answers with a
+``PersistedQueryNotFound`` error and the client retries with both the hash and
+the query, which registers the query for the following requests.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+
+from django.core.cache import caches
+from graphql import GraphQLError
+
+from .settings import graphene_settings
+from .utils.lru_cache import LRUCache
+
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryError(GraphQLError):
+    code = None
+
+    def __init__(self, message=None):
+        super().__init__(
+            message or self.__class__.__name__, extensions={"code": self.code}
+        )
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+
+class PersistedQueryNotInList(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_IN_LIST"
+
+
+class InvalidPersistedQuery(PersistedQueryError):
+    code = "INVALID_PERSISTED_QUERY"
+
+
+class PersistedQueryStore(ABC):
+    """
+    Base class of the stores that map query hashes to query strings.
+    """
+
+    @abstractmethod
+    def get(self, query_hash):
+        """
+        Returns the query registered for ``query_hash``, or ``None``.
+        """
+
+    @abstractmethod
+    def set(self, query_hash, query):
+        """
+        Registers ``query`` for ``query_hash``.
+        """
+
+
+class InMemoryPersistedQueryStore(PersistedQueryStore):
+    """
+    Keeps the most recently used queries in the memory of the process.
+    """
+
+    maxsize = 1000
+
+    def __init__(self, maxsize=None):
+        self.cache = LRUCache(maxsize or self.maxsize)
+
+    def get(self, query_hash):
+        return self.cache.get(query_hash)
+
+    def set(self, query_hash, query):
+        self.cache.set(query_hash, query)
+
+
+class DjangoCachePersistedQueryStore(PersistedQueryStore):
+    """
+    Keeps the queries in a Django cache backend, which can be shared between
+    processes.
+    """
+
+    cache_alias = "default"
+    key_prefix = "graphene-apq:"
+    timeout = None
+
+    def __init__(self, cache_alias=None, key_prefix=None, timeout=None):
+        self.cache_alias = cache_alias or self.cache_alias
+        self.key_prefix = key_prefix or self.key_prefix
+        self.timeout = timeout or self.timeout
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self, query_hash):
+        return self.cache.get(self.key_prefix + query_hash)
+
+    def set(self, query_hash, query):
+        self.cache.set(self.key_prefix + query_hash, query, self.timeout)
+
+
+_persisted_query_store = None
+
+
+def get_persisted_query_store():
+    """
+    Returns the process-wide instance of the ``PERSISTED_QUERY_STORE`` setting.
+    """
+    global _persisted_query_store
+    store_class = graphene_settings.PERSISTED_QUERY_STORE
+    if _persisted_query_store is None or not isinstance(
+        _persisted_query_store, store_class
+    ):
+        _persisted_query_store = store_class()
+    return _persisted_query_store
+
+
+def get_query_hash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_hash(extensions):
+    """
+    Returns the ``extensions.persistedQuery.sha256Hash`` request parameter, or
+    ``None`` if the request doesn't reference a persisted query.
+    """
+    persisted_query = (
+        extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+    )
+    if not persisted_query:
+        return None
+
+    if not isinstance(persisted_query, dict) or (
+        persisted_query.get("version") != PERSISTED_QUERY_VERSION
+    ):
+        raise InvalidPersistedQuery("Unsupported persisted query version.")
+
+    query_hash = persisted_query.get("sha256Hash")
+    if not isinstance(query_hash, str):
+        raise InvalidPersistedQuery("Persisted query hash must be a string.")
+    return query_hash
+
+
+def resolve_persisted_query(extensions, query):
+    """
+    Returns the query to execute for the given request ``extensions``, looking
+    it up in the store when only a hash was sent and registering it when both
+    the hash and the query were sent.
+    """
+    persisted_query = (
+        extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+    )
+    if not persisted_query:
+        return query
+
+    if not graphene_settings.PERSISTED_QUERIES:
+        raise PersistedQueryNotSupported()
+
+    query_hash = get_persisted_query_hash(extensions).lower()
+
+    store = get_persisted_query_store()
+    if not query:
+        query = store.get(query_hash)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query
+
+    if get_query_hash(query) != query_hash:
+        raise InvalidPersistedQuery("Provided sha does not match query.")
+    store.set(query_hash, query)
+    return query
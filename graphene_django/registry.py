@@ -2,6 +2,7 @@ class Registry:
     def __init__(self):
         self._registry = {}
         self._field_registry = {}
+        self._type_name_models = {}
 
     def register(self, cls):
         from .types import DjangoObjectType
@@ -13,12 +14,20 @@ class Registry:
         # assert self.get_type_for_model(cls._meta.model) == cls, (
         #     'Multiple DjangoObjectTypes registered for "{}"'.format(cls._meta.model)
         # )
+        self._type_name_models.setdefault(cls._meta.name, set()).add(cls._meta.model)
         if not getattr(cls._meta, "skip_registry", False):
             self._registry[cls._meta.model] = cls
 
     def get_type_for_model(self, model):
         return self._registry.get(model)
 
+    def get_models_for_type_name(self, name):
+        """
+        Returns the models of every type registered with the name ``name``,
+        including the types skipping the registry.
+        """
+        return self._type_name_models.get(name, frozenset())
+
     def register_converted_field(self, field, converted):
         self._field_registry[field] = converted
 
@@ -24,11 +24,27 @@ DEFAULTS = {
     "SCHEMA_OUTPUT": "schema.json",
     "SCHEMA_INDENT": 2,
     "MIDDLEWARE": (),
+    # Set to True to not run the middlewares of GraphQLView on the fields
+    # resolved by reading a model attribute
+    "MIDDLEWARE_SKIP_MODEL_ATTRIBUTES": False,
     # Set to True if the connection fields must have
     # either the first or last argument
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": False,
     # Max items returned in ConnectionFields / FilterConnectionFields
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    "RELAY_CONNECTION_PAGINATION": "offset",
+    # How connections count their rows: "exact", "cached", "estimated" or a
+    # CountStrategy
+    "RELAY_CONNECTION_COUNT": "exact",
+    "OPTIMIZE_QUERIES": False,
+    "OPTIMIZE_QUERY_COLUMNS": False,
+    "BATCH_RELATED_OBJECTS": True,
+    # Apply the filters of DjangoFilterConnectionField without building a
+    # FilterSet when it doesn't customize the filtering
+    "COMPILE_FILTERSETS": True,
+    # Min number of values of the lists of `in` filters passed to the
+    # database as a single array parameter, None to never do it
+    "FILTER_ARRAY_LOOKUP_THRESHOLD": 1000,
     "CAMELCASE_ERRORS": True,
     # Automatically convert Choice fields of Django into Enum fields
     "DJANGO_CHOICE_FIELD_ENUM_CONVERT": True,
@@ -46,13 +62,33 @@ DEFAULTS = {
     "ATOMIC_MUTATIONS": False,
     "TESTING_ENDPOINT": "/graphql",
     "MAX_VALIDATION_ERRORS": None,
+    # Cache parsed and validated documents in GraphQLView, keyed on the
+    # query text and the validation rules
+    "DOCUMENT_CACHE_ENABLED": True,
+    "DOCUMENT_CACHE_SIZE": 1000,
+    # Longer queries aren't cached, to bound the memory used by the cache
+    "DOCUMENT_CACHE_MAX_QUERY_LENGTH": 10000,
+    # Max number of operations accepted in a batch request
+    "BATCH_MAX_SIZE": None,
+    # Max number of operations of a batch request executed concurrently
+    "BATCH_CONCURRENCY": 1,
+    # Set to True to support automatic persisted queries in GraphQLView
+    "PERSISTED_QUERIES": False,
+    "PERSISTED_QUERY_STORE": "graphene_django.persisted_queries.InMemoryPersistedQueryStore",
+    # Path of a JSON manifest of the only operations GraphQLView accepts
+    "OPERATION_MANIFEST": None,
+    # Encoder class used to serialize responses, the fastest available
+    # library is used when not set
+    "JSON_ENCODER": None,
+    # Number of rows fetched at a time by DjangoListField in streamed responses
+    "STREAMING_CHUNK_SIZE": 2000,
 }
 
 if settings.DEBUG:
     DEFAULTS["MIDDLEWARE"] += ("graphene_django.debug.DjangoDebugMiddleware",)
 
 # List of settings that may be in string import notation.
-IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA")
+IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA", "PERSISTED_QUERY_STORE", "JSON_ENCODER")
 
 
 def perform_import(val, setting_name):
@@ -47,6 +47,10 @@ class Pet(models.Model):
         "Person", on_delete=models.CASCADE, null=True, blank=True, related_name="pets"
     )
 
+    @property
+    def owner_name(self):
+        return self.owner.name if self.owner else None
+
 
 class FilmDetails(models.Model):
     location = models.CharField(max_length=30)
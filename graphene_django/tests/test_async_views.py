@@ -0,0 +1,249 @@
+import json
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+
+from ..views import SyncToAsyncMiddleware
+from .models import Person, Pet
+from .test_views import batch_url_string, response_json, url_string
+from .urls_async import middleware_calls as _middleware_calls, slow_calls as _slow_calls
+
+pytestmark = pytest.mark.urls("graphene_django.tests.urls_async")
+
+
+@pytest.fixture
+def get(async_client):
+    return async_to_sync(async_client.get)
+
+
+@pytest.fixture
+def post(async_client):
+    return async_to_sync(async_client.post)
+
+
+def test_async_view_is_async():
+    from ..views import AsyncGraphQLView
+
+    view = AsyncGraphQLView.as_view()
+    assert AsyncGraphQLView.view_is_async
+    assert view.view_class is AsyncGraphQLView
+
+
+def test_async_graphiql_is_enabled(get):
+    response = get(url_string(), headers={"Accept": "text/html"})
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].split(";")[0] == "text/html"
+
+
+def test_async_resolves_orm_fields(get):
+    Pet.objects.create(name="Mia", age=3)
+    Pet.objects.create(name="Enzo", age=5)
+
+    response = get(url_string(query="{ petCount pets { name age } }"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {
+        "data": {
+            "petCount": 2,
+            "pets": [{"name": "Mia", "age": 3}, {"name": "Enzo", "age": 5}],
+        }
+    }
+
+
+@pytest.fixture
+def slow_calls():
+    _slow_calls.update(running=0, max_running=0)
+    return _slow_calls
+
+
+def test_async_resolves_model_fields_inline(get):
+    for age in range(5):
+        Pet.objects.create(name=f"Pet {age}", age=age)
+
+    with patch.object(
+        SyncToAsyncMiddleware,
+        "resolve_sync",
+        wraps=SyncToAsyncMiddleware.resolve_sync,
+    ) as resolve_sync:
+        response = get(url_string(query="{ pets { name age } }"))
+
+    assert len(response_json(response)["data"]["pets"]) == 5
+    # Only the pets field needs the database
+    assert resolve_sync.call_count == 1
+
+
+def test_async_resolves_model_properties_through_sync_to_async(get):
+    owner = Person.objects.create(name="Jane")
+    Pet.objects.create(name="Mia", age=3, owner=owner)
+
+    response = get(url_string(query="{ petDetails { name ownerName } }"))
+
+    assert response_json(response) == {
+        "data": {"petDetails": [{"name": "Mia", "ownerName": "Jane"}]}
+    }
+
+
+def test_async_resolves_deferred_model_fields_through_sync_to_async(get):
+    Pet.objects.create(name="Mia", age=3)
+
+    response = get(url_string(query="{ petsWithDeferredAge { name age } }"))
+
+    assert response_json(response) == {
+        "data": {"petsWithDeferredAge": [{"name": "Mia", "age": 3}]}
+    }
+
+
+def test_async_runs_root_fields_concurrently(get, slow_calls):
+    query = "{ a: slow(delay: 0.2) b: slow(delay: 0.2) c: slow(delay: 0.2) }"
+
+    response = get(url_string(query=query))
+
+    assert response_json(response) == {
+        "data": {"a": "slept 0.2", "b": "slept 0.2", "c": "slept 0.2"}
+    }
+    assert slow_calls["max_running"] == 3
+
+
+def test_async_resolves_fields_with_middleware(get, slow_calls):
+    Pet.objects.create(name="Mia", age=3)
+    query = "{ petCount pets { name age } a: slow(delay: 0.1) b: slow(delay: 0.1) }"
+
+    response = get(url_string("/graphql/middleware", query=query))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {
+        "data": {
+            "petCount": 1,
+            "pets": [{"name": "Mia", "age": 3}],
+            "a": "slept 0.1",
+            "b": "slept 0.1",
+        }
+    }
+    assert slow_calls["max_running"] == 2
+
+
+@pytest.fixture
+def middleware_calls():
+    _middleware_calls.clear()
+    return _middleware_calls
+
+
+@patch("graphene_django.views.graphene_settings.MIDDLEWARE_SKIP_MODEL_ATTRIBUTES", True)
+def test_async_skips_middleware_for_attribute_resolvers(get, middleware_calls):
+    Pet.objects.create(name="Mia", age=3)
+    query = "{ pets { name age } petsWithDeferredAge { name age } }"
+
+    with patch.object(
+        SyncToAsyncMiddleware,
+        "resolve_sync",
+        wraps=SyncToAsyncMiddleware.resolve_sync,
+    ) as resolve_sync:
+        response = get(url_string("/graphql/middleware", query=query))
+
+    assert response_json(response) == {
+        "data": {
+            "pets": [{"name": "Mia", "age": 3}],
+            "petsWithDeferredAge": [{"name": "Mia", "age": 3}],
+        }
+    }
+    assert middleware_calls == ["pets", "petsWithDeferredAge"]
+    # The deferred age still needs the database
+    assert resolve_sync.call_count == 3
+
+
+def test_async_handles_field_errors(get):
+    response = get(url_string(query="{thrower}"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {
+        "data": None,
+        "errors": [
+            {
+                "message": "Throws!",
+                "locations": [{"line": 1, "column": 2}],
+                "path": ["thrower"],
+            }
+        ],
+    }
+
+
+def test_async_handles_syntax_errors(get):
+    response = get(url_string(query="syntaxerror"))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response)["errors"][0]["message"] == (
+        "Syntax Error: Unexpected Name 'syntaxerror'."
+    )
+
+
+def test_async_does_not_allow_mutations_with_get(get):
+    response = get(url_string(query="mutation TestMutation { writeTest { test } }"))
+
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+    assert response_json(response) == {
+        "errors": [
+            {"message": "Can only perform a mutation operation from a POST request."}
+        ]
+    }
+
+
+def test_async_batch(post):
+    response = post(
+        batch_url_string(),
+        json.dumps(
+            [
+                {"id": 1, "query": "{ slow(delay: 0) }"},
+                {"id": 2, "query": "{ petCount }"},
+            ]
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == [
+        {"id": 1, "data": {"slow": "slept 0.0"}, "status": 200},
+        {"id": 2, "data": {"petCount": 0}, "status": 200},
+    ]
+
+
+@patch("graphene_django.settings.graphene_settings.ATOMIC_MUTATIONS", True)
+@patch.dict(
+    connection.settings_dict, {"ATOMIC_MUTATIONS": False, "ATOMIC_REQUESTS": False}
+)
+def test_async_atomic_mutation(post):
+    query = """
+    mutation PetMutations {
+        petFormMutation1: petFormMutation(input: { name: "Mia", age: 0 }) {
+            errors { field messages }
+        }
+        petFormMutation2: petFormMutation(input: { name: "Enzo", age: 99 }) {
+            errors { field messages }
+        }
+    }
+    """
+
+    response = post(url_string(query=query))
+    content = response_json(response)
+
+    assert content["data"]["petFormMutation2"]["errors"] == [
+        {"field": "age", "messages": ["Too old"]}
+    ]
+    assert Pet.objects.count() == 0
+
+
+@patch("graphene_django.views.graphene_settings.BATCH_CONCURRENCY", 3)
+@patch.object(connection, "in_atomic_block", False)
+def test_async_batch_executes_queries_concurrently(post, slow_calls):
+    response = post(
+        batch_url_string(),
+        json.dumps([{"id": i, "query": "{ slow(delay: 0.2) }"} for i in range(3)]),
+        "application/json",
+    )
+
+    assert response_json(response) == [
+        {"id": i, "data": {"slow": "slept 0.2"}, "status": 200} for i in range(3)
+    ]
+    assert slow_calls["max_running"] == 3
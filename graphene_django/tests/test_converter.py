@@ -1,4 +1,5 @@
 from collections import namedtuple
+from functools import partial
 
 import pytest
 from django.db import models
@@ -10,6 +11,7 @@ from graphene import NonNull
 from graphene.relay import ConnectionField, Node
 from graphene.types.datetime import Date, DateTime, Time
 from graphene.types.json import JSONString
+from graphene.types.resolver import dict_or_attr_resolver
 from graphene.types.scalars import BigInt
 
 from ..compat import (
@@ -19,6 +21,7 @@ from ..compat import (
     RangeField,
 )
 from ..converter import (
+    EnumValueField,
     convert_django_field,
     convert_django_field_with_choices,
     generate_enum_name,
@@ -540,3 +543,23 @@ def test_typed_choice_value():
     )
     assert not result.errors
     assert result.data["createReporter"]["reporter"] == expected_reporter
+
+
+def test_enum_value_field_wraps_the_resolver_once():
+    field = EnumValueField(graphene.String)
+    default_resolver = partial(dict_or_attr_resolver, "typed_choice", None)
+    resolver = field.wrap_resolve(default_resolver)
+    assert resolver.__wrapped__ is default_resolver
+
+    reporter = Reporter(typed_choice=TypedIntChoice.CHOICE_THAT)
+    assert resolver(reporter, None) == 2
+    assert resolver(Reporter(typed_choice=""), None) is None
+    assert resolver({"typed_choice": TypedIntChoice.CHOICE_THIS}, None) == 1
+    assert resolver(object(), None) is None
+
+
+def test_enum_value_field_with_custom_resolver():
+    field = EnumValueField(graphene.String, resolver=lambda root, info: root)
+    resolver = field.wrap_resolve(None)
+    assert resolver(TypedStrChoice.CHOICE_THIS, None) == "this"
+    assert resolver("", None) is None
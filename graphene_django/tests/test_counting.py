@@ -0,0 +1,244 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+import graphene
+from graphene.relay import Node
+
+from ..counting import (
+    CachedCount,
+    CountStrategy,
+    EstimatedCount,
+    ExactCount,
+    get_count_strategy,
+)
+from ..fields import DjangoConnectionField
+from ..types import DjangoObjectType
+from .models import Article, Reporter
+
+QUERY = """
+    query ($first: Int, $last: Int) {
+        allReporters(first: $first, last: $last) {
+            totalCount
+            edges { node { firstName } }
+            pageInfo { hasNextPage hasPreviousPage }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def reporters():
+    cache.clear()
+    Reporter.objects.bulk_create(
+        [Reporter(first_name=f"First {i}", last_name="Doe") for i in range(5)]
+    )
+
+
+def get_schema(**field_kwargs):
+    class ReporterConnection(graphene.relay.Connection):
+        total_count = graphene.Int()
+
+        class Meta:
+            abstract = True
+
+        def resolve_total_count(self, info):
+            return self.length
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+            connection_class = ReporterConnection
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType, **field_kwargs)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def test_get_count_strategy():
+    assert isinstance(get_count_strategy("exact"), ExactCount)
+    assert isinstance(get_count_strategy("cached"), CachedCount)
+    assert isinstance(get_count_strategy("estimated"), EstimatedCount)
+    assert isinstance(
+        get_count_strategy("graphene_django.counting.CachedCount"), CachedCount
+    )
+    strategy = CachedCount(timeout=5)
+    assert get_count_strategy(strategy) is strategy
+    with pytest.raises(AssertionError):
+        get_count_strategy(object())
+
+
+def test_get_count_strategy_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown count strategy 'estimate'"):
+        get_count_strategy("estimate")
+    with pytest.raises(
+        ImportError, match="Could not import count strategy 'counting.Missing'"
+    ):
+        get_count_strategy("counting.Missing")
+
+
+def test_count_strategy_is_abstract():
+    with pytest.raises(TypeError):
+        CountStrategy()
+
+
+def test_count_strategy_from_settings(graphene_settings):
+    graphene_settings.RELAY_CONNECTION_COUNT = "estimated"
+    assert isinstance(get_count_strategy(), EstimatedCount)
+
+
+def test_cached_count(django_assert_num_queries):
+    schema = get_schema(count_strategy="cached")
+
+    with django_assert_num_queries(2):
+        result = schema.execute(QUERY, variables={"first": 2})
+    assert not result.errors
+    assert result.data["allReporters"]["totalCount"] == 5
+
+    Reporter.objects.create(first_name="First 5", last_name="Doe")
+    # The count is read from the cache, the page from the database
+    with django_assert_num_queries(1):
+        result = schema.execute(QUERY, variables={"first": 6})
+    assert not result.errors
+    assert result.data["allReporters"]["totalCount"] == 5
+    assert len(result.data["allReporters"]["edges"]) == 6
+    assert result.data["allReporters"]["pageInfo"] == {
+        "hasNextPage": False,
+        "hasPreviousPage": False,
+    }
+
+
+def test_cached_count_is_keyed_on_the_queryset():
+    strategy = CachedCount()
+    assert strategy.count(Reporter.objects.all()) == 5
+    assert strategy.count(Reporter.objects.filter(first_name="First 1")) == 1
+    assert strategy.get_cache_key(Reporter.objects.all()) != strategy.get_cache_key(
+        Reporter.objects.filter(first_name="First 1")
+    )
+
+
+def test_estimated_count_is_exact_without_estimate(django_assert_num_queries):
+    schema = get_schema(count_strategy="estimated")
+
+    with django_assert_num_queries(2):
+        result = schema.execute(QUERY, variables={"first": 2})
+    assert not result.errors
+    assert result.data["allReporters"]["totalCount"] == 5
+
+
+@pytest.mark.parametrize("estimate,total_count", [(1000000, 1000000), (3, 5)])
+def test_estimated_count_above_threshold(estimate, total_count):
+    schema = get_schema(count_strategy=EstimatedCount(threshold=1000))
+
+    with patch.object(EstimatedCount, "estimate", return_value=estimate):
+        result = schema.execute(QUERY, variables={"first": 2})
+    assert not result.errors
+    assert result.data["allReporters"]["totalCount"] == total_count
+    assert result.data["allReporters"]["pageInfo"] == {
+        "hasNextPage": True,
+        "hasPreviousPage": False,
+    }
+
+
+def test_backward_pagination_counts_exactly():
+    class WrongCount(CountStrategy):
+        def count(self, queryset):
+            return 1000
+
+    schema = get_schema(count_strategy=WrongCount())
+
+    result = schema.execute(QUERY, variables={"last": 2})
+    assert not result.errors
+    assert [
+        edge["node"]["firstName"] for edge in result.data["allReporters"]["edges"]
+    ] == ["First 3", "First 4"]
+    assert result.data["allReporters"]["totalCount"] == 5
+
+
+def test_nested_connections_paginated_together_use_the_count_strategy(
+    django_assert_num_queries,
+):
+    class WrongCount(CountStrategy):
+        def count(self, queryset):
+            return 1000 + queryset.count()
+
+    class ArticleConnection(graphene.relay.Connection):
+        total_count = graphene.Int()
+
+        class Meta:
+            abstract = True
+
+        def resolve_total_count(self, info):
+            return self.length
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+            connection_class = ArticleConnection
+
+    class ReporterType(DjangoObjectType):
+        articles = DjangoConnectionField(ArticleType, count_strategy=WrongCount())
+
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name", "articles")
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")
+
+    for i, reporter in enumerate(Reporter.objects.order_by("pk")):
+        for j in range(i):
+            Article.objects.create(
+                headline=f"Article {i}.{j}", reporter=reporter, editor=reporter
+            )
+    query = """
+        query {
+            allReporters {
+                edges {
+                    node {
+                        articles(first: 2) {
+                            totalCount
+                            edges { node { headline } }
+                            pageInfo { hasNextPage }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    # The reporters, the pages of their articles, then a count per reporter
+    with django_assert_num_queries(7) as captured:
+        result = graphene.Schema(query=Query).execute(query, context_value={})
+    assert not result.errors
+    assert "ROW_NUMBER" in captured.captured_queries[1]["sql"]
+    articles = [
+        edge["node"]["articles"] for edge in result.data["allReporters"]["edges"]
+    ]
+    assert [connection["totalCount"] for connection in articles] == [
+        1000,
+        1001,
+        1002,
+        1003,
+        1004,
+    ]
+    assert [connection["pageInfo"]["hasNextPage"] for connection in articles] == [
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
@@ -0,0 +1,138 @@
+import datetime
+import decimal
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.utils.translation import gettext_lazy
+
+from ..encoders import (
+    JSONEncoder,
+    OrjsonEncoder,
+    StdlibJSONEncoder,
+    UjsonEncoder,
+    get_default_json_encoder_class,
+    get_json_encoder,
+    orjson,
+    replace_decimals,
+    ujson,
+)
+
+ENCODERS = [
+    StdlibJSONEncoder,
+    pytest.param(
+        OrjsonEncoder,
+        marks=pytest.mark.skipif(orjson is None, reason="orjson is not installed"),
+    ),
+    pytest.param(
+        UjsonEncoder,
+        marks=pytest.mark.skipif(ujson is None, reason="ujson is not installed"),
+    ),
+]
+
+DATA = {
+    "data": {
+        "b": [1, 2.5, None, True],
+        "a": {"name": "Mia", "tags": []},
+    },
+    "errors": [{"message": "Oops"}],
+}
+
+
+def decode(content):
+    if isinstance(content, bytes):
+        content = content.decode()
+    return content
+
+
+@pytest.mark.parametrize("encoder_class", ENCODERS)
+def test_encoder_compact(encoder_class):
+    content = decode(encoder_class().encode(DATA))
+
+    assert content == json.dumps(DATA, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("encoder_class", ENCODERS)
+def test_encoder_pretty(encoder_class):
+    content = decode(encoder_class().encode(DATA, pretty=True))
+
+    assert content == json.dumps(DATA, sort_keys=True, indent=2, separators=(",", ": "))
+
+
+@pytest.mark.parametrize("encoder_class", ENCODERS)
+def test_encoder_serializes_like_django(encoder_class):
+    data = {
+        "decimal": decimal.Decimal("1.10"),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "datetime": datetime.datetime(
+            2020, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+        ),
+        "date": datetime.date(2020, 1, 2),
+        "time": datetime.time(3, 4, 5),
+        "lazy": gettext_lazy("Hello"),
+    }
+
+    assert json.loads(decode(encoder_class().encode(data))) == {
+        "decimal": "1.10",
+        "uuid": "12345678-1234-5678-1234-567812345678",
+        "datetime": "2020-01-02T03:04:05.678Z",
+        "date": "2020-01-02",
+        "time": "03:04:05",
+        "lazy": "Hello",
+    }
+
+
+@pytest.mark.parametrize("encoder_class", ENCODERS)
+def test_encoder_big_integers(encoder_class):
+    encoder = encoder_class()
+    content = encoder.encode({"big": 2**70})
+
+    # The fallback returns the same type as the encoder
+    assert isinstance(content, type(encoder.encode({"small": 1})))
+    assert json.loads(decode(content)) == {"big": 2**70}
+
+
+def test_replace_decimals():
+    data = {"a": [1, decimal.Decimal("1.10")], "b": {"c": "d"}}
+
+    replaced = replace_decimals(data)
+
+    assert replaced == {"a": [1, "1.10"], "b": {"c": "d"}}
+    assert replaced["b"] is data["b"]
+    assert data["a"][1] == decimal.Decimal("1.10")
+
+
+def test_default_encoder_prefers_fast_libraries():
+    if orjson is not None:
+        assert get_default_json_encoder_class() is OrjsonEncoder
+    elif ujson is not None:
+        assert get_default_json_encoder_class() is UjsonEncoder
+    else:
+        assert get_default_json_encoder_class() is StdlibJSONEncoder
+
+
+def test_json_encoder_setting():
+    with patch(
+        "graphene_django.encoders.graphene_settings.JSON_ENCODER", StdlibJSONEncoder
+    ):
+        assert type(get_json_encoder()) is StdlibJSONEncoder
+
+
+@pytest.mark.parametrize("encoder_class", ENCODERS)
+def test_encoder_iterencode(encoder_class):
+    data = {"data": {"items": [{"id": i, "name": "é" * i} for i in range(100)]}}
+    expected = json.dumps(data, separators=(",", ":"))
+
+    chunks = list(encoder_class().iterencode(data, buffer_size=256))
+
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert json.loads(b"".join(chunks).decode()) == json.loads(expected)
+    # Encoded items are released
+    assert data["data"]["items"] == [None] * 100
+
+
+def test_json_encoder_is_abstract():
+    with pytest.raises(TypeError):
+        JSONEncoder()
@@ -37,3 +37,24 @@ def test_global_id_none():
 def test_global_id_none_optional():
     field = GlobalIDFormField(required=False)
     field.clean(None)
+
+
+def test_global_id_multiple_decoded_once():
+    field = GlobalIDMultipleChoiceField()
+    value = field.clean(["TXlUeXBlOmFiYw==", "TXlUeXBlOmRlZg==", "TXlUeXBlOmFiYw=="])
+    assert value == ["TXlUeXBlOmFiYw==", "TXlUeXBlOmRlZg=="]
+    assert value.decoded == [("MyType", "abc"), ("MyType", "def")]
+
+
+def test_global_id_multiple_invalid_message():
+    field = GlobalIDMultipleChoiceField()
+    with raises(ValidationError) as error:
+        field.clean(["TXlUeXBlOmFiYw==", "badvalue"])
+    assert error.value.messages == ["Invalid ID specified."]
+
+
+def test_global_id_multiple_required():
+    field = GlobalIDMultipleChoiceField()
+    with raises(ValidationError) as error:
+        field.clean([])
+    assert error.value.code == "required"
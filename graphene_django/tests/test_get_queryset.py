@@ -1,11 +1,15 @@
 import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import F
 from graphql_relay import to_global_id
 
 import graphene
 from graphene.relay import Node
 
+from ..fields import DjangoConnectionField, DjangoListField, DjangoNodesField
 from ..types import DjangoObjectType
-from .models import Article, Film, FilmDetails, Reporter
+from ..views import SyncToAsyncMiddleware
+from .models import Article, Film, FilmDetails, Person, Pet, Reporter
 
 
 class TestShouldCallGetQuerySetOnForeignKey:
@@ -568,3 +572,406 @@ class TestShouldCallGetQuerySetOnOneToOne:
             )
         assert len(result.errors) == 1
         assert result.errors[0].message == "Not authorized to access film."
+
+
+class TestShouldBatchForeignKeysThroughGetQuerySet:
+    """
+    Check that the objects referenced by a foreign key from the items of a list
+    are fetched with one query going through the get_queryset method of their
+    type.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_schema(self):
+        class PersonType(DjangoObjectType):
+            class Meta:
+                model = Person
+                fields = "__all__"
+
+            @classmethod
+            def get_queryset(cls, queryset, info):
+                return queryset.exclude(name__startswith="Hidden")
+
+        class PetType(DjangoObjectType):
+            class Meta:
+                model = Pet
+                fields = "__all__"
+                interfaces = (Node,)
+
+        class Query(graphene.ObjectType):
+            pets = DjangoListField(PetType)
+            all_pets = DjangoConnectionField(PetType)
+
+        self.person_type = PersonType
+        self.schema = graphene.Schema(query=Query)
+
+        alice = Person.objects.create(name="Alice")
+        bob = Person.objects.create(name="Bob")
+        hidden = Person.objects.create(name="Hidden")
+        for name, owner in [
+            ("Rex", alice),
+            ("Tom", bob),
+            ("Kit", hidden),
+            ("Stray", None),
+            ("Max", alice),
+        ]:
+            Pet.objects.create(name=name, age=1, owner=owner)
+
+        self.expected_owners = [
+            {"name": "Alice"},
+            {"name": "Bob"},
+            None,
+            None,
+            {"name": "Alice"},
+        ]
+
+    def test_foreign_keys_of_list_are_batched(self, django_assert_num_queries):
+        query = "query { pets { name owner { name } } }"
+        with django_assert_num_queries(2):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert [pet["owner"] for pet in result.data["pets"]] == self.expected_owners
+
+    def test_foreign_keys_of_connection_are_batched(self, django_assert_num_queries):
+        query = "query { allPets { edges { node { name owner { name } } } } }"
+        with django_assert_num_queries(2):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert [
+            edge["node"]["owner"] for edge in result.data["allPets"]["edges"]
+        ] == self.expected_owners
+
+    def test_foreign_keys_are_batched_with_async_execution(
+        self, django_assert_num_queries
+    ):
+        query = "query { pets { name owner { name } } }"
+        with django_assert_num_queries(2):
+            result = async_to_sync(self.schema.execute_async)(
+                query, context_value={}, middleware=[SyncToAsyncMiddleware()]
+            )
+        assert not result.errors
+        assert [pet["owner"] for pet in result.data["pets"]] == self.expected_owners
+
+    def test_foreign_keys_are_cached_per_execution(self, django_assert_num_queries):
+        query = "query { pets { owner { name } } }"
+        context = {}
+        result = self.schema.execute(query, context_value=context)
+        assert not result.errors
+
+        Person.objects.filter(name="Bob").update(name="Robert")
+        with django_assert_num_queries(2):
+            result = self.schema.execute(query, context_value=context)
+        assert not result.errors
+        assert result.data["pets"][1]["owner"] == {"name": "Robert"}
+
+    def test_custom_get_node_is_called_for_each_foreign_key(
+        self, django_assert_num_queries
+    ):
+        get_node = self.person_type.get_node.__func__
+        self.person_type.get_node = classmethod(
+            lambda cls, info, id: get_node(cls, info, id)
+        )
+
+        query = "query { pets { owner { name } } }"
+        # One query per pet, including the one without owner
+        with django_assert_num_queries(6):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert [pet["owner"] for pet in result.data["pets"]] == self.expected_owners
+
+    def test_batching_can_be_disabled(
+        self, graphene_settings, django_assert_num_queries
+    ):
+        graphene_settings.BATCH_RELATED_OBJECTS = False
+        query = "query { pets { owner { name } } }"
+        # One query per pet, including the one without owner
+        with django_assert_num_queries(6):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert [pet["owner"] for pet in result.data["pets"]] == self.expected_owners
+
+
+class TestShouldBatchReverseOneToOneThroughGetQuerySet:
+    """
+    Check that the objects pointing to the items of a list through a
+    one-to-one relation are fetched with one query going through the
+    get_queryset method of their type.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_schema(self):
+        class FilmDetailsType(DjangoObjectType):
+            class Meta:
+                model = FilmDetails
+                fields = "__all__"
+
+            @classmethod
+            def get_queryset(cls, queryset, info):
+                return queryset.exclude(location="Hidden")
+
+        class FilmType(DjangoObjectType):
+            class Meta:
+                model = Film
+                fields = "__all__"
+
+        class Query(graphene.ObjectType):
+            films = DjangoListField(FilmType)
+
+        self.schema = graphene.Schema(query=Query)
+
+        for location in ["Paris", None, "Hidden", "Rome"]:
+            film = Film.objects.create()
+            if location is not None:
+                FilmDetails.objects.create(film=film, location=location)
+
+    def test_reverse_one_to_one_of_list_are_batched(self, django_assert_num_queries):
+        query = "query { films { details { location } } }"
+        with django_assert_num_queries(2):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert [film["details"] for film in result.data["films"]] == [
+            {"location": "Paris"},
+            None,
+            None,
+            {"location": "Rome"},
+        ]
+
+    def test_batching_can_be_disabled(
+        self, graphene_settings, django_assert_num_queries
+    ):
+        graphene_settings.BATCH_RELATED_OBJECTS = False
+        query = "query { films { details { location } } }"
+        with django_assert_num_queries(5):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert result.data["films"][3] == {"details": {"location": "Rome"}}
+
+
+class TestShouldReusePrefetchedListsThroughGetQuerySet:
+    """
+    Check that the prefetched items of a list are filtered by the get_queryset
+    method of their type with one query, instead of querying each list again.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_schema(self):
+        class PetType(DjangoObjectType):
+            class Meta:
+                model = Pet
+                fields = "__all__"
+
+            @classmethod
+            def get_queryset(cls, queryset, info):
+                return queryset.filter(age__gte=2)
+
+        class PersonType(DjangoObjectType):
+            class Meta:
+                model = Person
+                fields = ("name", "pets")
+
+        class Query(graphene.ObjectType):
+            people = DjangoListField(PersonType)
+
+            def resolve_people(root, info):
+                return Person.objects.order_by("name").prefetch_related("pets")
+
+        self.schema = graphene.Schema(query=Query)
+
+        alice = Person.objects.create(name="Alice")
+        bob = Person.objects.create(name="Bob")
+        Person.objects.create(name="Carol")
+        for name, age, owner in [
+            ("Rex", 3, alice),
+            ("Puppy", 1, alice),
+            ("Tom", 1, bob),
+            ("Max", 5, bob),
+        ]:
+            Pet.objects.create(name=name, age=age, owner=owner)
+
+        self.expected_people = [
+            {"name": "Alice", "pets": [{"name": "Rex"}]},
+            {"name": "Bob", "pets": [{"name": "Max"}]},
+            {"name": "Carol", "pets": []},
+        ]
+
+    def test_prefetched_lists_are_filtered_once(self, django_assert_num_queries):
+        query = "query { people { name pets { name } } }"
+        # The people, their pets, and the pets passing `get_queryset`
+        with django_assert_num_queries(3):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert result.data["people"] == self.expected_people
+
+    def test_batching_can_be_disabled(
+        self, graphene_settings, django_assert_num_queries
+    ):
+        graphene_settings.BATCH_RELATED_OBJECTS = False
+        query = "query { people { name pets { name } } }"
+        # The prefetched pets are filtered again for each person
+        with django_assert_num_queries(5):
+            result = self.schema.execute(query, context_value={})
+        assert not result.errors
+        assert result.data["people"] == self.expected_people
+
+
+class TestShouldKeepTheOrderingAndAnnotationsOfGetQuerySet:
+    """
+    Check that the prefetched items of a list aren't reused when the
+    get_queryset method of their type orders or annotates them.
+    """
+
+    def test_prefetched_lists_are_queried_through_get_queryset(
+        self, django_assert_num_queries
+    ):
+        class PetType(DjangoObjectType):
+            double_age = graphene.Int()
+
+            class Meta:
+                model = Pet
+                fields = ("name",)
+
+            @classmethod
+            def get_queryset(cls, queryset, info):
+                return queryset.order_by("-age").annotate(double_age=F("age") * 2)
+
+        class PersonType(DjangoObjectType):
+            class Meta:
+                model = Person
+                fields = ("name", "pets")
+
+        class Query(graphene.ObjectType):
+            people = DjangoListField(PersonType)
+
+            def resolve_people(root, info):
+                return Person.objects.order_by("name").prefetch_related("pets")
+
+        schema = graphene.Schema(query=Query)
+        alice = Person.objects.create(name="Alice")
+        bob = Person.objects.create(name="Bob")
+        for name, age, owner in [
+            ("Rex", 1, alice),
+            ("Puppy", 3, alice),
+            ("Tom", 2, alice),
+            ("Max", 5, bob),
+        ]:
+            Pet.objects.create(name=name, age=age, owner=owner)
+
+        query = "query { people { name pets { name doubleAge } } }"
+        # The people, their pets, and the pets of each person again
+        with django_assert_num_queries(4):
+            result = schema.execute(query, context_value={})
+        assert not result.errors
+        assert result.data["people"] == [
+            {
+                "name": "Alice",
+                "pets": [
+                    {"name": "Puppy", "doubleAge": 6},
+                    {"name": "Tom", "doubleAge": 4},
+                    {"name": "Rex", "doubleAge": 2},
+                ],
+            },
+            {"name": "Bob", "pets": [{"name": "Max", "doubleAge": 10}]},
+        ]
+        assert schema.execute(query).data == result.data
+
+
+class TestShouldBatchNodesThroughGetQuerySet:
+    """
+    Check that the objects of a `nodes` field are fetched with one query per
+    type going through the get_queryset method of the type.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_schema(self):
+        class ReporterType(DjangoObjectType):
+            class Meta:
+                model = Reporter
+                fields = "__all__"
+                interfaces = (Node,)
+
+            @classmethod
+            def get_queryset(cls, queryset, info):
+                return queryset.exclude(first_name="Hidden")
+
+        class ArticleType(DjangoObjectType):
+            class Meta:
+                model = Article
+                fields = "__all__"
+                interfaces = (Node,)
+
+        class Query(graphene.ObjectType):
+            nodes = DjangoNodesField()
+            reporters = DjangoNodesField(Node, ReporterType)
+
+        self.reporter_type = ReporterType
+        self.schema = graphene.Schema(query=Query)
+
+        self.reporters = [
+            Reporter.objects.create(first_name=first_name, last_name="Doe")
+            for first_name in ["Jane", "Hidden", "John"]
+        ]
+        self.article = Article.objects.create(
+            headline="A fantastic article",
+            reporter=self.reporters[0],
+            editor=self.reporters[0],
+        )
+        self.query = """
+            query getNodes($ids: [ID!]!) {
+                nodes(ids: $ids) {
+                    ... on ReporterType { firstName }
+                    ... on ArticleType { headline }
+                }
+            }
+        """
+
+    def test_nodes_are_fetched_once_per_type(self, django_assert_num_queries):
+        ids = [
+            to_global_id("ReporterType", self.reporters[2].id),
+            to_global_id("ArticleType", self.article.id),
+            to_global_id("ReporterType", self.reporters[1].id),
+            to_global_id("ReporterType", 1000),
+            to_global_id("ReporterType", self.reporters[0].id),
+            to_global_id("ReporterType", self.reporters[2].id),
+        ]
+        with django_assert_num_queries(2):
+            result = self.schema.execute(self.query, variables={"ids": ids})
+        assert not result.errors
+        assert result.data["nodes"] == [
+            {"firstName": "John"},
+            {"headline": "A fantastic article"},
+            None,
+            None,
+            {"firstName": "Jane"},
+            {"firstName": "John"},
+        ]
+
+    def test_custom_get_node_is_called_for_each_node(self, django_assert_num_queries):
+        get_node = self.reporter_type.get_node.__func__
+        self.reporter_type.get_node = classmethod(
+            lambda cls, info, id: get_node(cls, info, id)
+        )
+        ids = [to_global_id("ReporterType", reporter.id) for reporter in self.reporters]
+        with django_assert_num_queries(3):
+            result = self.schema.execute(self.query, variables={"ids": ids})
+        assert not result.errors
+        assert result.data["nodes"] == [
+            {"firstName": "Jane"},
+            None,
+            {"firstName": "John"},
+        ]
+
+    def test_nodes_of_a_single_type(self):
+        query = """
+            query getReporters($ids: [ID!]!) {
+                reporters(ids: $ids) { ... on ReporterType { firstName } }
+            }
+        """
+        ids = [to_global_id("ReporterType", self.reporters[0].id)]
+        result = self.schema.execute(query, variables={"ids": ids})
+        assert not result.errors
+        assert result.data["reporters"] == [{"firstName": "Jane"}]
+
+        ids.append(to_global_id("ArticleType", self.article.id))
+        result = self.schema.execute(query, variables={"ids": ids})
+        assert len(result.errors) == 1
+        assert result.errors[0].message == "Must receive a ReporterType id."
@@ -0,0 +1,138 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core import management
+from django.core.management.base import CommandError
+
+from ..operation_manifest import OperationManifest
+from .schema_view import schema
+from .test_views import response_json, url_string
+
+MANIFEST = {
+    "hello": "{ test }",
+    "helloWho": "query helloWho($who: String) { test(who: $who) }",
+    "write": "mutation { writeTest { test } }",
+}
+
+
+def extensions(operation_id):
+    return json.dumps({"persistedQuery": {"version": 1, "sha256Hash": operation_id}})
+
+
+@pytest.fixture
+def manifest():
+    manifest = OperationManifest(MANIFEST)
+    with patch("graphene_django.views.graphene_settings.OPERATION_MANIFEST", manifest):
+        yield manifest
+
+
+def test_manifest_operation_is_executed(client, manifest):
+    response = client.get(
+        url_string(
+            extensions=extensions("helloWho"), variables=json.dumps({"who": "Dolly"})
+        )
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {"data": {"test": "Hello Dolly"}}
+
+
+def test_manifest_rejects_unknown_operations_without_parsing(client, manifest):
+    with patch("graphene_django.views.parse") as parse:
+        response = client.get(url_string(extensions=extensions("unknown")))
+
+    parse.assert_not_called()
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotInList",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_IN_LIST"},
+            }
+        ]
+    }
+
+
+def test_manifest_rejects_free_text_queries(client, manifest):
+    response = client.get(url_string(query="{ test }"))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response)["errors"][0]["message"] == (
+        "PersistedQueryNotInList"
+    )
+
+
+def test_manifest_does_not_allow_mutations_with_get(client, manifest):
+    response = client.get(url_string(extensions=extensions("write")))
+
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_manifest_compiles_documents_once(manifest):
+    graphql_schema = schema.graphql_schema
+    compiled = manifest.compile(graphql_schema)
+
+    assert set(compiled) == set(MANIFEST)
+    assert all(errors == [] for _, errors in compiled.values())
+    assert manifest.compile(graphql_schema) is compiled
+
+
+def test_manifest_from_apollo_format():
+    manifest = OperationManifest.from_dict(
+        {
+            "format": "apollo-persisted-query-manifest",
+            "version": 1,
+            "operations": [
+                {"id": "abc", "name": "Hello", "type": "query", "body": "{ test }"}
+            ],
+        }
+    )
+
+    assert manifest.operations == {"abc": "{ test }"}
+
+
+def test_validate_manifest_command(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST))
+
+    out = StringIO()
+    management.call_command(
+        "graphql_validate_manifest", str(path), schema=schema, stdout=out
+    )
+    assert f"Successfully validated 3 operations in {path}" in out.getvalue()
+
+
+def test_validate_manifest_command_reports_invalid_operations(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(dict(MANIFEST, broken="{ unknownField }")))
+
+    err = StringIO()
+    with pytest.raises(CommandError, match="1 of 4 operations"):
+        management.call_command(
+            "graphql_validate_manifest", str(path), schema=schema, stderr=err
+        )
+    assert "broken: Cannot query field 'unknownField'" in err.getvalue()
+
+
+def test_manifest_is_compiled_when_the_view_is_created(tmp_path):
+    from ..views import GraphQLView
+
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST))
+
+    with patch.object(
+        OperationManifest,
+        "compile",
+        autospec=True,
+        side_effect=OperationManifest.compile,
+    ) as compile:
+        GraphQLView.as_view(schema=schema, operation_manifest=str(path))
+
+    compile.assert_called_once()
+    manifest = compile.call_args.args[0]
+    assert set(manifest.compile(schema.graphql_schema)) == set(MANIFEST)
+    view = GraphQLView(schema=schema, operation_manifest=str(path))
+    assert view.get_operation_manifest() is manifest
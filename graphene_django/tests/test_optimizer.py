@@ -0,0 +1,421 @@
+import pytest
+
+import graphene
+from graphene.relay import Node
+
+from ..fields import DjangoConnectionField, DjangoListField
+from ..optimizer import OptimizerHint
+from ..types import DjangoObjectType
+from .models import Article, Film, FilmDetails, Reporter
+
+
+@pytest.fixture(autouse=True)
+def optimize_queries(graphene_settings):
+    graphene_settings.OPTIMIZE_QUERIES = True
+
+
+@pytest.fixture
+def reporters():
+    reporters = [
+        Reporter.objects.create(first_name=f"First {i}", last_name=f"Last {i}")
+        for i in range(3)
+    ]
+    for i, reporter in enumerate(reporters):
+        for j in range(2):
+            Article.objects.create(
+                headline=f"Article {i}.{j}",
+                reporter=reporter,
+                editor=reporters[(i + 1) % 3],
+            )
+    return reporters
+
+
+def get_schema(
+    reporter_meta=None, article_meta=None, article_attrs=None, connection=False
+):
+    reporter_options = {
+        "model": Reporter,
+        "fields": ("id", "first_name", "articles", "films"),
+    }
+    reporter_options.update(reporter_meta or {})
+    article_options = {
+        "model": Article,
+        "fields": ("id", "headline", "reporter", "editor"),
+    }
+    article_options.update(article_meta or {})
+    if connection:
+        reporter_options["interfaces"] = (Node,)
+        article_options["interfaces"] = (Node,)
+
+    class ReporterType(DjangoObjectType):
+        article_count = graphene.Int()
+
+        Meta = type("Meta", (), reporter_options)
+
+        def resolve_article_count(self, info):
+            return len(self.articles.all())
+
+    ArticleType = type(
+        "ArticleType",
+        (DjangoObjectType,),
+        dict(article_attrs or {}, Meta=type("Meta", (), article_options)),
+    )
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+            fields = ("id", "genre", "details")
+
+    class FilmDetailsType(DjangoObjectType):
+        class Meta:
+            model = FilmDetails
+            fields = ("id", "location")
+
+    class Query(graphene.ObjectType):
+        if connection:
+            reporters = DjangoConnectionField(ReporterType)
+            articles = DjangoConnectionField(ArticleType)
+        else:
+            reporters = DjangoListField(ReporterType)
+            articles = DjangoListField(ArticleType)
+
+    return graphene.Schema(query=Query)
+
+
+def test_optimizer_selects_related_foreign_keys(reporters, django_assert_num_queries):
+    schema = get_schema()
+    query = """
+        query {
+            articles {
+                headline
+                reporter { firstName }
+                editor { firstName }
+            }
+        }
+    """
+    with django_assert_num_queries(1):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data["articles"][0] == {
+        "headline": "Article 0.0",
+        "reporter": {"firstName": "First 0"},
+        "editor": {"firstName": "First 1"},
+    }
+
+
+def test_optimizer_prefetches_reverse_relations(reporters, django_assert_num_queries):
+    schema = get_schema()
+    query = """
+        query {
+            reporters {
+                firstName
+                articles {
+                    headline
+                    editor { firstName }
+                }
+            }
+        }
+    """
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    # The nested foreign key is joined to the prefetch query
+    assert "INNER JOIN" in captured.captured_queries[1]["sql"]
+    assert result.data["reporters"][1] == {
+        "firstName": "First 1",
+        "articles": [
+            {"headline": "Article 1.0", "editor": {"firstName": "First 2"}},
+            {"headline": "Article 1.1", "editor": {"firstName": "First 2"}},
+        ],
+    }
+
+
+def test_optimizer_follows_fragments_and_aliases(reporters, django_assert_num_queries):
+    schema = get_schema(connection=True)
+    query = """
+        query {
+            reporters {
+                edges {
+                    node {
+                        ...ReporterFields
+                        ... on ReporterType {
+                            others: articles { edges { node { id } } }
+                        }
+                    }
+                }
+            }
+        }
+        fragment ReporterFields on ReporterType {
+            firstName
+            articles { edges { node { headline reporter { firstName } } } }
+        }
+    """
+    with django_assert_num_queries(2):
+        result = schema.execute(query)
+    assert not result.errors
+    node = result.data["reporters"]["edges"][0]["node"]
+    assert node["articles"]["edges"][0]["node"] == {
+        "headline": "Article 0.0",
+        "reporter": {"firstName": "First 0"},
+    }
+    assert len(node["others"]["edges"]) == 2
+
+
+def test_optimizer_doesnt_prefetch_connections_paginated_together(
+    reporters, django_assert_num_queries
+):
+    schema = get_schema(connection=True)
+    query = """
+        query {
+            reporters {
+                edges {
+                    node {
+                        articles(first: 1) {
+                            edges { node { headline editor { firstName } } }
+                        }
+                    }
+                }
+            }
+        }
+    """
+    # The reporters, then the first page of the articles of every reporter,
+    # with their editor
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert "ROW_NUMBER" in captured.captured_queries[1]["sql"]
+    assert "INNER JOIN" in captured.captured_queries[1]["sql"]
+    node = result.data["reporters"]["edges"][1]["node"]
+    assert node["articles"]["edges"] == [
+        {"node": {"headline": "Article 1.0", "editor": {"firstName": "First 2"}}}
+    ]
+
+
+def test_optimizer_uses_hints_for_custom_resolvers(
+    reporters, django_assert_num_queries
+):
+    query = """
+        query {
+            reporters { firstName articleCount }
+        }
+    """
+    schema = get_schema()
+    with django_assert_num_queries(4):
+        result = schema.execute(query)
+    assert not result.errors
+
+    schema = get_schema(
+        reporter_meta={
+            "optimizer_hints": {
+                "article_count": OptimizerHint(prefetch_related=("articles",))
+            }
+        }
+    )
+    with django_assert_num_queries(2):
+        result = schema.execute(query)
+    assert not result.errors
+    assert [reporter["articleCount"] for reporter in result.data["reporters"]] == [
+        2,
+        2,
+        2,
+    ]
+
+
+def test_optimizer_keeps_custom_get_queryset(reporters, django_assert_num_queries):
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return queryset.exclude(headline__endswith=".1")
+
+    schema = get_schema(article_attrs={"get_queryset": get_queryset})
+    query = """
+        query {
+            reporters { articles { headline } }
+        }
+    """
+    with django_assert_num_queries(4):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data["reporters"][0] == {"articles": [{"headline": "Article 0.0"}]}
+
+
+def test_optimizer_prefetches_lists_with_custom_get_queryset(
+    reporters, django_assert_num_queries
+):
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return queryset.exclude(headline__endswith=".1")
+
+    schema = get_schema(article_attrs={"get_queryset": get_queryset})
+    query = """
+        query {
+            reporters { articles { headline } }
+        }
+    """
+    # The reporters, their articles, and the articles passing `get_queryset`
+    with django_assert_num_queries(3):
+        result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert result.data["reporters"][0] == {"articles": [{"headline": "Article 0.0"}]}
+
+
+def test_optimizer_doesnt_prefetch_lists_ordered_by_get_queryset(
+    reporters, django_assert_num_queries
+):
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return queryset.order_by("-headline")
+
+    schema = get_schema(article_attrs={"get_queryset": get_queryset})
+    query = """
+        query {
+            reporters { articles { headline } }
+        }
+    """
+    # The reporters, then the articles of each reporter
+    with django_assert_num_queries(4):
+        result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert result.data["reporters"][0] == {
+        "articles": [{"headline": "Article 0.1"}, {"headline": "Article 0.0"}]
+    }
+
+
+def test_optimizer_selects_reverse_one_to_one(django_assert_num_queries):
+    for genre in ("do", "ot"):
+        film = Film.objects.create(genre=genre)
+        FilmDetails.objects.create(location=genre.upper(), film=film)
+
+    class FilmDetailsType(DjangoObjectType):
+        class Meta:
+            model = FilmDetails
+            fields = ("id", "location")
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+            fields = ("id", "genre", "details")
+
+    class Query(graphene.ObjectType):
+        films = DjangoListField(FilmType)
+
+    schema = graphene.Schema(query=Query)
+    with django_assert_num_queries(1):
+        result = schema.execute("query { films { details { location } } }")
+    assert not result.errors
+    assert result.data["films"] == [
+        {"details": {"location": "DO"}},
+        {"details": {"location": "OT"}},
+    ]
+
+
+def test_optimizer_is_disabled_by_default(
+    graphene_settings, reporters, django_assert_num_queries
+):
+    graphene_settings.OPTIMIZE_QUERIES = False
+    schema = get_schema()
+    with django_assert_num_queries(7):
+        result = schema.execute("query { articles { reporter { firstName } } }")
+    assert not result.errors
+
+
+@pytest.fixture
+def prune_columns(graphene_settings):
+    graphene_settings.OPTIMIZE_QUERY_COLUMNS = True
+
+
+def get_selected_columns(sql, table):
+    select = sql.split(" FROM ")[0]
+    return {
+        column.split(".")[1].strip('"')
+        for column in select[len("SELECT ") :].split(", ")
+        if column.startswith(f'"{table}".')
+    }
+
+
+def test_optimizer_prunes_columns(reporters, prune_columns, django_assert_num_queries):
+    schema = get_schema()
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute("query { articles { headline } }")
+    assert not result.errors
+    assert get_selected_columns(
+        captured.captured_queries[0]["sql"], "tests_article"
+    ) == {"id", "headline", "reporter_id", "editor_id"}
+
+
+def test_optimizer_prunes_related_columns(
+    reporters, prune_columns, django_assert_num_queries
+):
+    schema = get_schema(reporter_meta={"required_columns": ("reporter_type",)})
+    query = """
+        query {
+            reporters {
+                firstName
+                articles { headline reporter { id } }
+            }
+        }
+    """
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert get_selected_columns(
+        captured.captured_queries[0]["sql"], "tests_reporter"
+    ) == {"id", "first_name", "reporter_type"}
+    assert get_selected_columns(
+        captured.captured_queries[1]["sql"], "tests_article"
+    ) == {"id", "headline", "reporter_id", "editor_id"}
+    assert result.data["reporters"][0]["articles"][0]["headline"] == "Article 0.0"
+
+
+def test_optimizer_loads_columns_of_custom_resolvers(
+    reporters, prune_columns, django_assert_num_queries
+):
+    def resolve_title(root, info):
+        return f"{root.headline} ({root.lang})"
+
+    article_attrs = {
+        "title": graphene.String(),
+        "resolve_title": resolve_title,
+    }
+    schema = get_schema(article_attrs=article_attrs)
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute("query { articles { title } }")
+    assert not result.errors
+    assert "pub_date" in get_selected_columns(
+        captured.captured_queries[0]["sql"], "tests_article"
+    )
+
+    hint = OptimizerHint(only=("headline", "lang"))
+    schema = get_schema(
+        article_attrs=article_attrs,
+        article_meta={"optimizer_hints": {"title": hint}},
+    )
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute("query { articles { title } }")
+    assert not result.errors
+    assert result.data["articles"][0] == {"title": "Article 0.0 (es)"}
+    assert get_selected_columns(
+        captured.captured_queries[0]["sql"], "tests_article"
+    ) == {"id", "headline", "lang", "reporter_id", "editor_id"}
+
+
+def test_optimizer_keeps_columns_chosen_by_resolver(
+    reporters, prune_columns, django_assert_num_queries
+):
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            fields = ("id", "headline", "lang")
+
+    class Query(graphene.ObjectType):
+        articles = DjangoListField(ArticleType)
+
+        def resolve_articles(root, info):
+            return Article.objects.defer("pub_date_time")
+
+    schema = graphene.Schema(query=Query)
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute("query { articles { headline } }")
+    assert not result.errors
+    assert "lang" in get_selected_columns(
+        captured.captured_queries[0]["sql"], "tests_article"
+    )
@@ -0,0 +1,149 @@
+import json
+from hashlib import sha256
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+
+from ..persisted_queries import (
+    DjangoCachePersistedQueryStore,
+    InMemoryPersistedQueryStore,
+    PersistedQueryStore,
+    get_persisted_query_store,
+)
+from .test_views import batch_url_string, response_json, url_string
+
+QUERY = "{test}"
+QUERY_HASH = sha256(QUERY.encode()).hexdigest()
+
+
+def extensions(query_hash=QUERY_HASH, version=1):
+    return json.dumps(
+        {"persistedQuery": {"version": version, "sha256Hash": query_hash}}
+    )
+
+
+@pytest.fixture
+def persisted_queries():
+    with patch(
+        "graphene_django.persisted_queries.graphene_settings.PERSISTED_QUERIES", True
+    ):
+        store = get_persisted_query_store()
+        store.cache.clear()
+        yield store
+
+
+def test_persisted_query_not_found(client, persisted_queries):
+    response = client.get(url_string(extensions=extensions()))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotFound",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }
+        ]
+    }
+
+
+def test_persisted_query_is_registered_and_reused(client, persisted_queries):
+    response = client.post(
+        url_string(),
+        json.dumps({"query": QUERY, "extensions": json.loads(extensions())}),
+        "application/json",
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+    response = client.get(url_string(extensions=extensions()))
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+
+def test_persisted_query_hash_mismatch(client, persisted_queries):
+    response = client.get(url_string(query=QUERY, extensions=extensions("abc")))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response)["errors"][0] == {
+        "message": "Provided sha does not match query.",
+        "extensions": {"code": "INVALID_PERSISTED_QUERY"},
+    }
+    assert persisted_queries.get("abc") is None
+
+
+def test_persisted_query_unsupported_version(client, persisted_queries):
+    response = client.get(url_string(extensions=extensions(version=2)))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response)["errors"][0]["message"] == (
+        "Unsupported persisted query version."
+    )
+
+
+def test_persisted_queries_not_supported(client):
+    response = client.get(url_string(extensions=extensions()))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotSupported",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+            }
+        ]
+    }
+
+
+def test_invalid_extensions_json(client):
+    response = client.get(url_string(query=QUERY, extensions="{"))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [{"message": "Extensions are invalid JSON."}]
+    }
+
+
+@patch("graphene_django.views.graphene_settings.BATCH_CONCURRENCY", 2)
+@patch.object(connection, "in_atomic_block", False)
+def test_batched_persisted_queries_are_looked_up_once(client, persisted_queries):
+    persisted_queries.set(QUERY_HASH, QUERY)
+    entry = {"extensions": json.loads(extensions())}
+
+    with patch.object(
+        persisted_queries, "get", wraps=persisted_queries.get
+    ) as get_query:
+        response = client.post(
+            batch_url_string(),
+            json.dumps([{"id": 1, **entry}, {"id": 2, **entry}]),
+            "application/json",
+        )
+
+    assert response_json(response) == [
+        {"id": 1, "data": {"test": "Hello World"}, "status": 200},
+        {"id": 2, "data": {"test": "Hello World"}, "status": 200},
+    ]
+    assert get_query.call_count == 2
+
+
+def test_persisted_query_store_is_abstract():
+    with pytest.raises(TypeError):
+        PersistedQueryStore()
+
+
+def test_in_memory_store_is_bounded():
+    store = InMemoryPersistedQueryStore(maxsize=1)
+    store.set("a", "{a}")
+    store.set("b", "{b}")
+
+    assert store.get("a") is None
+    assert store.get("b") == "{b}"
+
+
+def test_django_cache_store():
+    store = DjangoCachePersistedQueryStore(key_prefix="test-apq:")
+    store.set(QUERY_HASH, QUERY)
+
+    assert store.get(QUERY_HASH) == QUERY
+    assert store.cache.get("test-apq:" + QUERY_HASH) == QUERY
@@ -1662,7 +1662,8 @@ class TestBackwardPagination:
         assert result.data["allReporters"]["edges"][0]["node"]["firstName"] == "First 4"
 
 
-def test_should_preserve_prefetch_related(django_assert_num_queries):
+@pytest.mark.parametrize("context_value", [None, {}])
+def test_should_preserve_prefetch_related(django_assert_num_queries, context_value):
     class ReporterType(DjangoObjectType):
         class Meta:
             model = Reporter
@@ -1711,8 +1712,8 @@ def test_should_preserve_prefetch_related(django_assert_num_queries):
     """
     schema = graphene.Schema(query=Query)
 
-    with django_assert_num_queries(3):
-        result = schema.execute(query)
+    with django_assert_num_queries(2):
+        result = schema.execute(query, context_value=context_value)
         assert not result.errors
 
 
@@ -2182,3 +2183,398 @@ def test_should_query_nullable_one_to_one_relation_with_custom_resolver():
         "location": "London",
         "film": None,
     }
+
+
+def get_reporter_counting_schema():
+    class ReporterConnection(graphene.relay.Connection):
+        total_count = graphene.Int()
+
+        class Meta:
+            abstract = True
+
+        def resolve_total_count(self, info):
+            return self.length
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = "__all__"
+            connection_class = ReporterConnection
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def test_connection_should_not_count_without_total(django_assert_num_queries):
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+    schema = get_reporter_counting_schema()
+    query = """
+        query {
+            allReporters(first: 2) {
+                __typename
+                edges { node { firstName } }
+                ...PageInfo
+            }
+        }
+        fragment PageInfo on ReporterTypeConnection {
+            pageInfo { hasNextPage }
+        }
+    """
+
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert "COUNT" not in captured.captured_queries[0]["sql"]
+    assert result.data["allReporters"]["pageInfo"] == {"hasNextPage": True}
+    assert [
+        edge["node"]["firstName"] for edge in result.data["allReporters"]["edges"]
+    ] == ["First 0", "First 1"]
+
+
+def test_connection_should_count_with_total(django_assert_num_queries):
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+    schema = get_reporter_counting_schema()
+    query = """
+        query {
+            allReporters(first: 2) {
+                totalCount
+                edges { node { firstName } }
+            }
+        }
+    """
+
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert "COUNT" in captured.captured_queries[0]["sql"]
+    assert result.data["allReporters"]["totalCount"] == 6
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        "first: 2",
+        "first: 5",
+        "first: 6",
+        "first: 10",
+        "first: 2, offset: 3",
+        "first: 2, offset: 4",
+        "first: 2, offset: 10",
+        'first: 2, after: "YXJyYXljb25uZWN0aW9uOjE="',
+        'first: 2, after: "YXJyYXljb25uZWN0aW9uOjQ="',
+        'first: 5, before: "YXJyYXljb25uZWN0aW9uOjI="',
+        'first: 2, before: "YXJyYXljb25uZWN0aW9uOjQ="',
+        'first: 2, before: "YXJyYXljb25uZWN0aW9uOjEw"',
+        'after: "YXJyYXljb25uZWN0aW9uOjE=", before: "YXJyYXljb25uZWN0aW9uOjQ="',
+        "last: 2",
+    ],
+)
+def test_connection_pagination_without_count_matches_count(args):
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+    schema = get_reporter_counting_schema()
+    selection = """
+        edges { cursor node { firstName } }
+        pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+    """
+    query = "query {{ allReporters({}) {{ {} {} }} }}"
+
+    result = schema.execute(query.format(args, selection, ""))
+    counted_result = schema.execute(query.format(args, selection, "totalCount"))
+    assert not result.errors
+    assert not counted_result.errors
+    counted_data = counted_result.data["allReporters"]
+    assert counted_data.pop("totalCount") == 6
+    assert result.data["allReporters"] == counted_data
+
+
+def get_keyset_schema(ordering, **field_kwargs):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = "__all__"
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType, **field_kwargs)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by(*ordering)
+
+    return graphene.Schema(query=Query)
+
+
+KEYSET_QUERY = """
+    query ($first: Int, $last: Int, $after: String, $before: String) {
+        allReporters(first: $first, last: $last, after: $after, before: $before) {
+            edges { node { firstName } }
+            pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+        }
+    }
+"""
+
+
+def create_keyset_reporters():
+    # Reporters sharing a last name are ordered by their primary key.
+    for i, last_name in enumerate(["B", "A", "B", "C", "A", "B"]):
+        Reporter.objects.create(first_name=f"First {i}", last_name=last_name)
+
+
+@pytest.mark.parametrize(
+    "ordering,expected",
+    [
+        (("last_name",), [1, 4, 0, 2, 5, 3]),
+        (("-last_name",), [3, 0, 2, 5, 1, 4]),
+        (("-last_name", "-id"), [3, 5, 2, 0, 4, 1]),
+    ],
+)
+def test_keyset_connection_paginates_forward(
+    django_assert_num_queries, ordering, expected
+):
+    create_keyset_reporters()
+    schema = get_keyset_schema(ordering, pagination="keyset")
+
+    names = []
+    after = None
+    while True:
+        with django_assert_num_queries(1) as captured:
+            result = schema.execute(
+                KEYSET_QUERY, variables={"first": 4, "after": after}
+            )
+        assert not result.errors
+        assert "OFFSET" not in captured.captured_queries[0]["sql"]
+        connection = result.data["allReporters"]
+        names += [edge["node"]["firstName"] for edge in connection["edges"]]
+        after = connection["pageInfo"]["endCursor"]
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+
+    assert names == [f"First {i}" for i in expected]
+
+
+def test_keyset_connection_paginates_backward():
+    create_keyset_reporters()
+    schema = get_keyset_schema(("last_name",), pagination="keyset")
+
+    result = schema.execute(KEYSET_QUERY, variables={"last": 2})
+    assert not result.errors
+    connection = result.data["allReporters"]
+    assert [edge["node"]["firstName"] for edge in connection["edges"]] == [
+        "First 5",
+        "First 3",
+    ]
+    assert connection["pageInfo"]["hasPreviousPage"] is True
+    assert connection["pageInfo"]["hasNextPage"] is False
+
+    result = schema.execute(
+        KEYSET_QUERY,
+        variables={"last": 3, "before": connection["pageInfo"]["startCursor"]},
+    )
+    assert not result.errors
+    connection = result.data["allReporters"]
+    assert [edge["node"]["firstName"] for edge in connection["edges"]] == [
+        "First 4",
+        "First 0",
+        "First 2",
+    ]
+    assert connection["pageInfo"]["hasPreviousPage"] is True
+
+
+def test_keyset_connection_between_cursors():
+    create_keyset_reporters()
+    schema = get_keyset_schema(("last_name",), pagination="keyset")
+
+    result = schema.execute(KEYSET_QUERY, variables={"first": 6})
+    cursors = [
+        result.data["allReporters"]["pageInfo"]["startCursor"],
+        result.data["allReporters"]["pageInfo"]["endCursor"],
+    ]
+    result = schema.execute(
+        KEYSET_QUERY, variables={"after": cursors[0], "before": cursors[1]}
+    )
+    assert not result.errors
+    assert [
+        edge["node"]["firstName"] for edge in result.data["allReporters"]["edges"]
+    ] == ["First 4", "First 0", "First 2", "First 5"]
+
+
+def test_keyset_connection_from_settings(graphene_settings):
+    graphene_settings.RELAY_CONNECTION_PAGINATION = "keyset"
+    create_keyset_reporters()
+    schema = get_keyset_schema(())
+
+    result = schema.execute(KEYSET_QUERY, variables={"first": 2})
+    assert not result.errors
+    end_cursor = result.data["allReporters"]["pageInfo"]["endCursor"]
+    assert base64.b64decode(end_cursor).startswith(b"keyset:")
+
+
+def test_keyset_connection_requires_field_ordering():
+    create_keyset_reporters()
+    schema = get_keyset_schema(("?",), pagination="keyset")
+
+    result = schema.execute(KEYSET_QUERY, variables={"first": 2})
+    assert len(result.errors) == 1
+    assert "ordered by fields" in result.errors[0].message
+
+
+def test_connection_rejects_unknown_pagination():
+    with raises(AssertionError):
+        DjangoConnectionField(graphene.String, pagination="page")
+
+
+def get_nested_connection_schema():
+    class CountedConnection(graphene.relay.Connection):
+        total_count = graphene.Int()
+
+        class Meta:
+            abstract = True
+
+        def resolve_total_count(self, info):
+            return self.length
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name", "articles", "films")
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+            connection_class = CountedConnection
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+            interfaces = (Node,)
+            fields = ("genre",)
+            connection_class = CountedConnection
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def create_nested_connection_objects():
+    reporters = Reporter.objects.bulk_create(
+        [Reporter(**kwargs) for kwargs in REPORTERS[:4]]
+    )
+    films = Film.objects.bulk_create(
+        [Film(genre=genre) for genre in "do ac ot".split()]
+    )
+    for i, reporter in enumerate(reporters):
+        for j in range(i):
+            Article.objects.create(
+                headline=f"Article {i}.{j}",
+                reporter=reporter,
+                editor=reporter,
+                pub_date=datetime.date.today(),
+                pub_date_time=datetime.datetime.now(),
+            )
+        reporter.films.set(films[: 3 - i])
+
+
+def test_nested_connections_are_paginated_together(django_assert_num_queries):
+    create_nested_connection_objects()
+    schema = get_nested_connection_schema()
+    query = """
+        query {
+            allReporters {
+                edges {
+                    node {
+                        articles(first: 2) {
+                            totalCount
+                            edges { node { headline } }
+                            pageInfo { hasNextPage }
+                        }
+                        films(first: 1) {
+                            edges { node { genre } }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    # The reporters, then the pages and the totals of their articles, and the
+    # pages of their films.
+    with django_assert_num_queries(4) as captured:
+        result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert "ROW_NUMBER" in captured.captured_queries[1]["sql"]
+    assert "COUNT" in captured.captured_queries[2]["sql"]
+    reporters = [edge["node"] for edge in result.data["allReporters"]["edges"]]
+    assert [reporter["articles"]["totalCount"] for reporter in reporters] == [
+        0,
+        1,
+        2,
+        3,
+    ]
+    assert reporters[3]["articles"] == {
+        "totalCount": 3,
+        "edges": [
+            {"node": {"headline": "Article 3.0"}},
+            {"node": {"headline": "Article 3.1"}},
+        ],
+        "pageInfo": {"hasNextPage": True},
+    }
+    assert [len(reporter["films"]["edges"]) for reporter in reporters] == [
+        1,
+        1,
+        1,
+        0,
+    ]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        "first: 1",
+        "first: 2, offset: 1",
+        'first: 1, after: "YXJyYXljb25uZWN0aW9uOjA="',
+        'first: 5, before: "YXJyYXljb25uZWN0aW9uOjI="',
+        "last: 1",
+        "",
+    ],
+)
+def test_nested_connections_paginated_together_match_unbatched(args):
+    create_nested_connection_objects()
+    schema = get_nested_connection_schema()
+    selection = """
+        totalCount
+        edges { cursor node { id } }
+        pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+    """
+    # Films aren't ordered, only their number is compared
+    film_selection = "totalCount pageInfo { hasNextPage hasPreviousPage }"
+    query = f"""
+        query {{
+            allReporters {{
+                edges {{
+                    node {{
+                        articles{f"({args})" if args else ""} {{ {selection} }}
+                        films{f"({args})" if args else ""} {{ {film_selection} }}
+                    }}
+                }}
+            }}
+        }}
+    """
+
+    # Without a context, the connections are paginated one at a time
+    result = schema.execute(query)
+    batched_result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert not batched_result.errors
+    assert batched_result.data == result.data
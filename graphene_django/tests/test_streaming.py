@@ -0,0 +1,74 @@
+import json
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.db.models.query import QuerySet
+
+from .models import Pet
+from .test_views import batch_url_string, url_string
+
+pytestmark = pytest.mark.urls("graphene_django.tests.urls_streaming")
+
+
+def streaming_json(response):
+    assert response.streaming
+    return json.loads(b"".join(response.streaming_content).decode())
+
+
+def test_streams_response(client):
+    for i in range(5):
+        Pet.objects.create(name=f"Pet {i}", age=i)
+
+    iterator_calls = []
+    original_iterator = QuerySet.iterator
+
+    def iterator(self, *args, **kwargs):
+        iterator_calls.append(kwargs)
+        return original_iterator(self, *args, **kwargs)
+
+    with patch.object(QuerySet, "iterator", iterator):
+        response = client.get(url_string(query="{ pets { name age } }"))
+        content = streaming_json(response)
+
+    assert iterator_calls == [{"chunk_size": 2000}]
+    assert response.status_code == HTTPStatus.OK
+    assert content == {
+        "data": {"pets": [{"name": f"Pet {i}", "age": i} for i in range(5)]}
+    }
+
+
+def test_streams_pretty_response(client):
+    response = client.get(url_string(query="{test}", pretty="1"))
+
+    assert response.streaming
+    assert b"".join(response.streaming_content).decode() == (
+        "{\n" '  "data": {\n' '    "test": "Hello World"\n' "  }\n" "}"
+    )
+
+
+def test_streams_errors(client):
+    response = client.get(url_string(query="{ unknown }"))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert streaming_json(response)["errors"][0]["message"] == (
+        "Cannot query field 'unknown' on type 'QueryRoot'."
+    )
+
+
+def test_streams_batch_response(client):
+    response = client.post(
+        batch_url_string(),
+        json.dumps(
+            [
+                {"id": 1, "query": "{test}"},
+                {"id": 2, "query": '{test(who: "Dolly")}'},
+            ]
+        ),
+        "application/json",
+    )
+
+    assert streaming_json(response) == [
+        {"id": 1, "data": {"test": "Hello World"}, "status": 200},
+        {"id": 2, "data": {"test": "Hello Dolly"}, "status": 200},
+    ]
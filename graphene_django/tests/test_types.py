@@ -12,6 +12,7 @@ from graphene.relay import Node
 from .. import registry
 from ..filter import DjangoFilterConnectionField
 from ..types import DjangoObjectType, DjangoObjectTypeOptions
+from ..utils.utils import is_attribute_resolver
 from .models import (
     Article as ArticleModel,
     Reporter as ReporterModel,
@@ -832,3 +833,33 @@ def test_django_objecttype_name_connection_propagation():
     assert "type Reporter implements Node {" not in schema
     assert "type ReporterConnection {" not in schema
     assert "type ReporterEdge {" not in schema
+
+
+def test_django_objecttype_resolves_model_attributes_directly():
+    class Reporter(DjangoObjectType):
+        class Meta:
+            model = ReporterModel
+            fields = ("id", "first_name", "last_name", "a_choice", "pets")
+
+        def resolve_last_name(root, info):
+            return root.last_name.upper()
+
+    fields = Reporter._meta.fields
+    assert is_attribute_resolver(fields["first_name"].resolver)
+    assert fields["last_name"].resolver is None
+    assert not is_attribute_resolver(fields["a_choice"].resolver)
+    assert not is_attribute_resolver(getattr(fields["pets"], "resolver", None))
+
+    resolver = fields["first_name"].resolver
+    assert resolver({"first_name": "John"}, None) == "John"
+    assert resolver(object(), None) is None
+
+    class Query(ObjectType):
+        reporter = Field(Reporter)
+
+        def resolve_reporter(root, info):
+            return ReporterModel(first_name="Jane", last_name="Doe")
+
+    result = Schema(query=Query).execute("{ reporter { firstName lastName } }")
+    assert not result.errors
+    assert result.data == {"reporter": {"firstName": "Jane", "lastName": "DOE"}}
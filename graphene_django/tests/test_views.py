@@ -5,6 +5,11 @@ from unittest.mock import patch
 import pytest
 from django.db import connection
 
+import graphene
+
+from ..encoders import OrjsonEncoder, StdlibJSONEncoder, orjson
+from ..types import DjangoObjectType
+from ..views import AttributeSkippingMiddlewareManager, GraphQLView
 from .models import Pet
 
 try:
@@ -216,6 +221,70 @@ def test_batch_fails_if_is_empty(client):
     }
 
 
+@patch("graphene_django.views.graphene_settings.BATCH_MAX_SIZE", 2)
+def test_batch_fails_if_exceeds_max_size(client):
+    response = client.post(
+        batch_url_string(),
+        json.dumps([{"id": i, "query": "{test}"} for i in range(3)]),
+        "application/json",
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [{"message": "Batch requests may contain at most 2 operations."}]
+    }
+
+
+@patch("graphene_django.views.graphene_settings.BATCH_CONCURRENCY", 4)
+@patch.object(connection, "in_atomic_block", False)
+def test_batch_executes_queries_concurrently(client):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with patch(
+        "graphene_django.views.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+    ) as executor:
+        response = client.post(
+            batch_url_string(),
+            json.dumps(
+                [
+                    {"id": 1, "query": "{test}"},
+                    {"id": 2, "query": "{thrower}"},
+                    {"id": 3, "query": "{unknown}"},
+                    {"id": 4, "query": '{test(who: "Dolly")}'},
+                ]
+            ),
+            "application/json",
+        )
+
+    executor.assert_called_once_with(max_workers=4)
+    content = response_json(response)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert [entry["id"] for entry in content] == [1, 2, 3, 4]
+    assert [entry["status"] for entry in content] == [200, 200, 400, 200]
+    assert content[0]["data"] == {"test": "Hello World"}
+    assert content[3]["data"] == {"test": "Hello Dolly"}
+
+
+@patch("graphene_django.views.graphene_settings.BATCH_CONCURRENCY", 4)
+@patch.object(connection, "in_atomic_block", False)
+def test_batch_executes_mutations_sequentially(client):
+    with patch("graphene_django.views.ThreadPoolExecutor") as executor:
+        response = client.post(
+            batch_url_string(),
+            json.dumps(
+                [
+                    {"id": 1, "query": "{test}"},
+                    {"id": 2, "query": "mutation { writeTest { test } }"},
+                ]
+            ),
+            "application/json",
+        )
+
+    executor.assert_not_called()
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response)[1]["data"] == {"writeTest": {"test": "Hello World"}}
+
+
 def test_allows_sending_a_mutation_via_post(client):
     response = client.post(
         url_string(),
@@ -922,3 +991,199 @@ def test_exceeds_max_validation_errors(client, url):
 
     error_messages = (error["message"].lower() for error in json_response["errors"])
     assert any(MAX_VALIDATION_ERRORS_EXCEEDED_MESSAGE in msg for msg in error_messages)
+
+
+def test_caches_parsed_and_validated_documents(client):
+    from ..views import get_document_cache
+
+    cache = get_document_cache()
+    cache.clear()
+
+    for _ in range(3):
+        response = client.get(url_string(query="{test}"))
+        assert response.status_code == HTTPStatus.OK
+        assert response_json(response) == {"data": {"test": "Hello World"}}
+
+    info = cache.info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert info.currsize == 1
+
+
+def test_caches_validation_errors(client):
+    from ..views import get_document_cache
+
+    cache = get_document_cache()
+    cache.clear()
+
+    for _ in range(2):
+        response = client.get(url_string(query="{unknownField}"))
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response_json(response)["errors"][0]["message"] == (
+            "Cannot query field 'unknownField' on type 'QueryRoot'."
+        )
+
+    assert cache.info().hits == 1
+
+
+@patch("graphene_django.settings.graphene_settings.DOCUMENT_CACHE_ENABLED", False)
+def test_document_cache_can_be_disabled(client):
+    from ..views import get_document_cache
+
+    cache = get_document_cache()
+    cache.clear()
+
+    response = client.get(url_string(query="{test}"))
+    assert response.status_code == HTTPStatus.OK
+    assert cache.info() == (0, 0, cache.maxsize, 0)
+
+
+@patch("graphene_django.views.graphene_settings.DOCUMENT_CACHE_MAX_QUERY_LENGTH", 10)
+def test_document_cache_skips_long_queries(client):
+    from ..views import get_document_cache
+
+    cache = get_document_cache()
+    cache.clear()
+
+    for query in ("{test}", "{    test    }"):
+        response = client.get(url_string(query=query))
+        assert response.status_code == HTTPStatus.OK
+        assert response_json(response) == {"data": {"test": "Hello World"}}
+
+    assert cache.info().currsize == 1
+
+
+def test_document_cache_is_keyed_on_validation_rules():
+    from graphene.validation import DisableIntrospection
+
+    from ..views import GraphQLView, get_document_cache
+    from .schema_view import schema
+
+    cache = get_document_cache()
+    cache.clear()
+
+    query = "{ __schema { queryType { name } } }"
+    graphql_schema = schema.graphql_schema
+
+    _, errors = GraphQLView(schema=schema).parse_and_validate(graphql_schema, query)
+    assert errors == []
+
+    _, errors = GraphQLView(
+        schema=schema, validation_rules=(DisableIntrospection,)
+    ).parse_and_validate(graphql_schema, query)
+    assert len(errors) == 1
+    assert cache.info().currsize == 2
+
+
+def test_validates_schema_once(client):
+    from ..views import invalidate_schema_validation
+    from .schema_view import schema
+
+    invalidate_schema_validation(schema.graphql_schema)
+    with patch(
+        "graphene_django.views.validate_schema", return_value=[]
+    ) as validate_schema:
+        for _ in range(2):
+            response = client.get(url_string(query="{test}"))
+            assert response.status_code == HTTPStatus.OK
+
+    assert validate_schema.call_count == 1
+
+
+def test_invalidate_schema_validation_revalidates(client):
+    from graphql import GraphQLError
+
+    from ..views import invalidate_schema_validation
+    from .schema_view import schema
+
+    invalidate_schema_validation(schema.graphql_schema)
+    with patch(
+        "graphene_django.views.validate_schema",
+        return_value=[GraphQLError("Invalid schema.")],
+    ):
+        response = client.get(url_string(query="{test}"))
+    assert response_json(response) == {"errors": [{"message": "Invalid schema."}]}
+
+    invalidate_schema_validation(schema.graphql_schema)
+    response = client.get(url_string(query="{test}"))
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+
+@pytest.mark.parametrize("encoder_class", [StdlibJSONEncoder, OrjsonEncoder])
+def test_batch_mixes_encodings(rf, encoder_class):
+    if encoder_class is OrjsonEncoder and orjson is None:
+        pytest.skip("orjson is not installed")
+
+    class Query(graphene.ObjectType):
+        big = graphene.BigInt()
+
+        def resolve_big(root, info):
+            return 2**70
+
+    view = GraphQLView.as_view(schema=graphene.Schema(query=Query), batch=True)
+    request = rf.post(
+        "/graphql/batch",
+        json.dumps(
+            [{"id": 1, "query": "{ __typename }"}, {"id": 2, "query": "{ big }"}]
+        ),
+        "application/json",
+    )
+    with patch(
+        "graphene_django.encoders.graphene_settings.JSON_ENCODER", encoder_class
+    ):
+        response = view(request)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response_json(response) == [
+        {"id": 1, "data": {"__typename": "Query"}, "status": 200},
+        {"id": 2, "data": {"big": 2**70}, "status": 200},
+    ]
+
+
+def test_invalid_schema_returns_its_errors(rf):
+    class Q(graphene.ObjectType):
+        pass
+
+    class Query(graphene.ObjectType):
+        q = graphene.Field(Q)
+
+    view = GraphQLView.as_view(schema=graphene.Schema(query=Query))
+    response = view(rf.get(url_string(query="{ q { __typename } }")))
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response_json(response) == {
+        "errors": [{"message": "Type Q must define one or more fields."}]
+    }
+
+
+def test_middleware_skips_model_attributes(graphene_settings):
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            fields = ("name", "age")
+
+        def resolve_age(root, info):
+            return root.age
+
+    class Query(graphene.ObjectType):
+        pet = graphene.Field(PetType)
+
+        def resolve_pet(root, info):
+            return Pet(name="Rex", age=2)
+
+    resolved_fields = []
+
+    def middleware(next, root, info, **args):
+        resolved_fields.append(info.field_name)
+        return next(root, info, **args)
+
+    graphene_settings.MIDDLEWARE_SKIP_MODEL_ATTRIBUTES = True
+    view = GraphQLView(schema=graphene.Schema(query=Query), middleware=[middleware])
+    assert isinstance(view.middleware, AttributeSkippingMiddlewareManager)
+
+    result = view.schema.execute(
+        "{ pet { name age } }", middleware=view.get_middleware(None)
+    )
+    assert not result.errors
+    assert result.data == {"pet": {"name": "Rex", "age": 2}}
+    assert resolved_fields == ["pet", "age"]
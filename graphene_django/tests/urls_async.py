@@ -0,0 +1,74 @@
+import asyncio
+
+from django.urls import path
+
+import graphene
+
+from ..fields import DjangoListField
+from ..types import DjangoObjectType
+from ..views import AsyncGraphQLView
+from .models import Pet
+from .schema_view import MutationRoot
+from .types import PetType
+
+# The number of slow resolvers running at the same time
+slow_calls = {"running": 0, "max_running": 0}
+
+
+class PetDetailsType(DjangoObjectType):
+    owner_name = graphene.String()
+
+    class Meta:
+        model = Pet
+        fields = ("name", "age")
+
+
+class QueryRoot(graphene.ObjectType):
+    pets = DjangoListField(PetType)
+    pet_details = DjangoListField(PetDetailsType)
+    pets_with_deferred_age = graphene.List(PetType)
+    pet_count = graphene.Int()
+    slow = graphene.String(delay=graphene.Float())
+    thrower = graphene.String(required=True)
+
+    def resolve_pets_with_deferred_age(self, info):
+        return Pet.objects.only("name")
+
+    def resolve_pet_count(self, info):
+        return Pet.objects.count()
+
+    async def resolve_slow(self, info, delay):
+        slow_calls["running"] += 1
+        slow_calls["max_running"] = max(
+            slow_calls["max_running"], slow_calls["running"]
+        )
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            slow_calls["running"] -= 1
+        return "slept %s" % delay
+
+    def resolve_thrower(self, info):
+        raise Exception("Throws!")
+
+
+# The fields resolved through PassThroughMiddleware
+middleware_calls = []
+
+
+class PassThroughMiddleware:
+    def resolve(self, next, root, info, **args):
+        middleware_calls.append(info.field_name)
+        return next(root, info, **args)
+
+
+schema = graphene.Schema(query=QueryRoot, mutation=MutationRoot)
+
+urlpatterns = [
+    path("graphql/batch", AsyncGraphQLView.as_view(schema=schema, batch=True)),
+    path(
+        "graphql/middleware",
+        AsyncGraphQLView.as_view(schema=schema, middleware=[PassThroughMiddleware()]),
+    ),
+    path("graphql", AsyncGraphQLView.as_view(schema=schema, graphiql=True)),
+]
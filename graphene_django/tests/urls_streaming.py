@@ -0,0 +1,26 @@
+from django.urls import path
+
+import graphene
+
+from ..fields import DjangoListField
+from ..views import GraphQLView
+from .types import PetType
+
+
+class QueryRoot(graphene.ObjectType):
+    pets = DjangoListField(PetType)
+    test = graphene.String(who=graphene.String())
+
+    def resolve_test(self, info, who=None):
+        return "Hello %s" % (who or "World")
+
+
+schema = graphene.Schema(query=QueryRoot)
+
+urlpatterns = [
+    path(
+        "graphql/batch",
+        GraphQLView.as_view(schema=schema, batch=True, streaming=True),
+    ),
+    path("graphql", GraphQLView.as_view(schema=schema, streaming=True)),
+]
@@ -2,11 +2,18 @@ import warnings
 from collections import OrderedDict
 from typing import Type  # noqa: F401
 
+from django.core.exceptions import ValidationError
+from django.db import models
 from django.db.models import Model  # noqa: F401
 
 import graphene
 from graphene.relay import Connection, Node
 from graphene.types.objecttype import ObjectType, ObjectTypeOptions
+from graphene.types.resolver import (
+    attr_resolver,
+    dict_or_attr_resolver,
+    get_default_resolver,
+)
 from graphene.types.utils import yank_fields_from_attrs
 
 from .converter import convert_django_field_with_choices
@@ -18,6 +25,7 @@ from .utils import (
     get_model_fields,
     is_valid_django_model,
 )
+from .utils.utils import get_attribute_resolver
 
 ALL_FIELDS = "__all__"
 
@@ -62,6 +70,32 @@ def construct_fields(
     return fields
 
 
+def install_attribute_resolvers(type_, model, django_fields):
+    """
+    Resolves the fields of the concrete, non-relational model fields that use
+    the default resolver by reading the model attribute directly.
+    """
+    if type_._meta.default_resolver or get_default_resolver() not in (
+        attr_resolver,
+        dict_or_attr_resolver,
+    ):
+        return
+
+    model_fields = dict(get_model_fields(model))
+    for name, field in django_fields.items():
+        model_field = model_fields.get(name)
+        if (
+            # Choice fields resolve through EnumValueField
+            type(field) is graphene.Field
+            and field.resolver is None
+            and type_._meta.fields.get(name) is field
+            and isinstance(model_field, models.Field)
+            and not model_field.is_relation
+            and getattr(type_, f"resolve_{name}", None) is None
+        ):
+            field.resolver = get_attribute_resolver(model_field.attname)
+
+
 def validate_fields(type_, model, fields, only_fields, exclude_fields):
     # Validate the given fields against the model's fields and custom fields
     all_field_names = set(fields.keys())
@@ -127,6 +161,8 @@ class DjangoObjectTypeOptions(ObjectTypeOptions):
 
     filter_fields = ()
     filterset_class = None
+    optimizer_hints = None
+    required_columns = ()
 
 
 class DjangoObjectType(ObjectType):
@@ -147,6 +183,8 @@ class DjangoObjectType(ObjectType):
         use_connection=None,
         interfaces=(),
         convert_choices_to_enum=None,
+        optimizer_hints=None,
+        required_columns=(),
         _meta=None,
         **options,
     ):
@@ -252,11 +290,15 @@ class DjangoObjectType(ObjectType):
         _meta.fields = django_fields
         _meta.connection = connection
         _meta.convert_choices_to_enum = convert_choices_to_enum
+        _meta.optimizer_hints = optimizer_hints
+        _meta.required_columns = tuple(required_columns)
 
         super().__init_subclass_with_meta__(
             _meta=_meta, interfaces=interfaces, **options
         )
 
+        install_attribute_resolvers(cls, model, django_fields)
+
         # Validate fields
         validate_fields(cls, model, _meta.fields, fields, exclude)
 
@@ -292,6 +334,31 @@ class DjangoObjectType(ObjectType):
         except cls._meta.model.DoesNotExist:
             return None
 
+    @classmethod
+    def get_nodes(cls, info, ids):
+        """
+        Returns the objects of the given primary keys in the same order, with
+        ``None`` for the missing ones, fetched with a single query.
+        """
+        if cls.get_node.__func__ is not DjangoObjectType.get_node.__func__:
+            # Keep the behavior of the custom get_node
+            return [cls.get_node(info, id) for id in ids]
+
+        pk_field = cls._meta.model._meta.pk
+        pks = []
+        for id in ids:
+            try:
+                pks.append(pk_field.to_python(id))
+            except ValidationError:
+                pks.append(None)
+
+        queryset = cls.get_queryset(cls._meta.model.objects, info)
+        objects = {
+            obj.pk: obj
+            for obj in queryset.filter(pk__in=[pk for pk in pks if pk is not None])
+        }
+        return [objects.get(pk) for pk in pks]
+
 
 class ErrorType(ObjectType):
     field = graphene.String(required=True)
@@ -0,0 +1,153 @@
+"""
+Helpers for keyset (a.k.a. seek) pagination.
+
+Instead of an offset, the cursor of an edge holds the values of the ordering
+keys of its row. Paginating after or before a cursor filters the queryset
+with a predicate equivalent to ``(k1, k2, ...) > (v1, v2, ...)``, which
+databases answer through an index, so deep pages cost as much as the first
+one.
+"""
+
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Model, Q
+from django.db.models.expressions import OrderBy
+from graphql_relay.utils import base64, unbase64
+
+KEYSET_CURSOR_PREFIX = "keyset:"
+
+
+def get_ordering_keys(queryset):
+    """
+    Returns the ordering of the queryset as a list of ``(field_name,
+    descending)`` tuples. The primary key is appended when the ordering
+    doesn't already contain it, so that the ordering is total. Raises
+    ``ValueError`` when the queryset is ordered by expressions or by fields
+    that can be null, which the keyset filters can't compare.
+    """
+    query = queryset.query
+    if query.order_by:
+        ordering = query.order_by
+    elif query.default_ordering:
+        ordering = query.get_meta().ordering
+    else:
+        ordering = ()
+
+    keys = []
+    for field in ordering:
+        if isinstance(field, str) and field != "?":
+            keys.append((field.lstrip("-+"), field.startswith("-")))
+        elif isinstance(field, F):
+            keys.append((field.name, False))
+        elif isinstance(field, OrderBy) and isinstance(field.expression, F):
+            keys.append((field.expression.name, field.descending))
+        else:
+            raise ValueError(
+                "Keyset pagination requires the queryset to be ordered by fields, "
+                f"got {field!r}."
+            )
+
+    for name, _ in keys:
+        check_ordering_field(queryset.model, name)
+
+    pk = queryset.model._meta.pk
+    if not any(name in ("pk", pk.name, pk.attname) for name, _ in keys):
+        keys.append(("pk", False))
+    return keys
+
+
+def check_ordering_field(model, name):
+    opts = model._meta
+    for attname in name.split("__"):
+        if opts is None:
+            field = None
+        else:
+            try:
+                field = opts.pk if attname == "pk" else opts.get_field(attname)
+            except FieldDoesNotExist:
+                field = None
+        if field is None:
+            raise ValueError(
+                "Keyset pagination requires the queryset to be ordered by fields, "
+                f"got {name!r}."
+            )
+        if field.null:
+            raise ValueError(
+                "Keyset pagination requires the ordering fields not to be "
+                f"nullable, got {name!r}."
+            )
+        opts = field.related_model._meta if field.is_relation else None
+
+
+def order_by_keys(queryset, keys, reverse=False):
+    return queryset.order_by(
+        *("-" + name if descending != reverse else name for name, descending in keys)
+    )
+
+
+def get_keyset_values(instance, keys):
+    values = []
+    for name, _ in keys:
+        value = instance
+        for attname in name.split("__"):
+            value = getattr(value, attname)
+        if isinstance(value, Model):
+            value = value.pk
+        values.append(value)
+    return values
+
+
+class KeysetJSONEncoder(DjangoJSONEncoder):
+    """
+    Encodes times with their microseconds, which ``DjangoJSONEncoder`` drops,
+    so that the cursors hold the exact values of the ordering keys.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def keyset_to_cursor(values):
+    return base64(
+        KEYSET_CURSOR_PREFIX
+        + json.dumps(values, cls=KeysetJSONEncoder, separators=(",", ":"))
+    )
+
+
+def cursor_to_keyset(cursor, keys):
+    """
+    Returns the ordering key values held by ``cursor``, or ``None`` if the
+    cursor isn't a valid keyset cursor for ``keys``.
+    """
+    try:
+        unbased_cursor = unbase64(cursor)
+    except Exception:
+        return None
+    if not unbased_cursor.startswith(KEYSET_CURSOR_PREFIX):
+        return None
+    try:
+        values = json.loads(unbased_cursor[len(KEYSET_CURSOR_PREFIX) :])
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != len(keys):
+        return None
+    return values
+
+
+def get_keyset_filter(keys, values, reverse=False):
+    """
+    Returns the predicate selecting the rows that follow (or precede, when
+    ``reverse`` is set) the row whose ordering keys are ``values``.
+    """
+    predicate = Q()
+    equal = {}
+    for (name, descending), value in zip(keys, values):
+        lookup = "{}__{}".format(name, "lt" if descending != reverse else "gt")
+        predicate |= Q(**equal, **{lookup: value})
+        equal[name] = value
+    return predicate
@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+from django.db.models import F
+
+from ...tests.models import Article, Reporter
+from ..keyset import (
+    cursor_to_keyset,
+    get_keyset_filter,
+    get_ordering_keys,
+    keyset_to_cursor,
+)
+
+
+def test_get_ordering_keys_appends_pk():
+    assert get_ordering_keys(Reporter.objects.all()) == [("pk", False)]
+    assert get_ordering_keys(Reporter.objects.order_by("-last_name")) == [
+        ("last_name", True),
+        ("pk", False),
+    ]
+    assert get_ordering_keys(
+        Reporter.objects.order_by(F("first_name").desc(), "id")
+    ) == [("first_name", True), ("id", False)]
+
+
+def test_get_ordering_keys_rejects_expressions():
+    with pytest.raises(ValueError):
+        get_ordering_keys(Reporter.objects.order_by("?"))
+
+
+def test_get_ordering_keys_rejects_nullable_fields():
+    with pytest.raises(ValueError, match="'a_choice'"):
+        get_ordering_keys(Reporter.objects.order_by("a_choice"))
+    with pytest.raises(ValueError, match="'reporter__a_choice'"):
+        get_ordering_keys(Article.objects.order_by("reporter__a_choice"))
+    assert get_ordering_keys(Article.objects.order_by("reporter__last_name")) == [
+        ("reporter__last_name", False),
+        ("pk", False),
+    ]
+
+
+def test_keyset_cursor_round_trip():
+    keys = [("last_name", False), ("pk", False)]
+    cursor = keyset_to_cursor(["Doe", 1])
+    assert cursor_to_keyset(cursor, keys) == ["Doe", 1]
+    assert cursor_to_keyset(cursor, keys[:1]) is None
+    assert cursor_to_keyset("YXJyYXljb25uZWN0aW9uOjE=", keys) is None
+    assert cursor_to_keyset("not a cursor", keys) is None
+
+
+@pytest.mark.django_db
+def test_get_keyset_filter():
+    for first_name, last_name in [("A", "X"), ("B", "X"), ("C", "Y"), ("D", "Z")]:
+        Reporter.objects.create(first_name=first_name, last_name=last_name)
+    b = Reporter.objects.get(first_name="B")
+    keys = [("last_name", True), ("pk", False)]
+
+    after = Reporter.objects.filter(get_keyset_filter(keys, ["X", b.pk]))
+    assert set(after.values_list("first_name", flat=True)) == set()
+    before = Reporter.objects.filter(get_keyset_filter(keys, ["X", b.pk], reverse=True))
+    assert set(before.values_list("first_name", flat=True)) == {"A", "C", "D"}
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_keeps_microseconds():
+    reporter = Reporter.objects.create(first_name="A", last_name="X")
+    article = Article.objects.create(headline="A", reporter=reporter, editor=reporter)
+    pub_date_time = datetime.datetime(
+        2024, 1, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc
+    )
+    other_pub_date_time = pub_date_time + datetime.timedelta(microseconds=1)
+    Article.objects.filter(pk=article.pk).update(pub_date_time=pub_date_time)
+    Article.objects.create(headline="B", reporter=reporter, editor=reporter)
+    Article.objects.exclude(pk=article.pk).update(pub_date_time=other_pub_date_time)
+    keys = [("pub_date_time", False), ("pk", False)]
+
+    values = cursor_to_keyset(keyset_to_cursor([pub_date_time, article.pk]), keys)
+    assert values == ["2024-01-01T12:00:00.123456+00:00", article.pk]
+    after = Article.objects.filter(get_keyset_filter([keys[0]], values[:1]))
+    assert list(after.values_list("headline", flat=True)) == ["B"]
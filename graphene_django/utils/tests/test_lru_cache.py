@@ -0,0 +1,27 @@
+from ..lru_cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(maxsize=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b", "default") == "default"
+
+    assert cache.info() == (1, 2, 10, 1)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 10, 0)
@@ -1,10 +1,12 @@
 import inspect
+from operator import attrgetter
 
 import django
 from django.db import connection, models, transaction
 from django.db.models.manager import Manager
 from django.utils.encoding import force_str
 from django.utils.functional import Promise
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
 
 from graphene.utils.str_converters import to_camel_case
 
@@ -122,6 +124,61 @@ def set_rollback():
         transaction.set_rollback(True)
 
 
+def iter_selected_fields(selection_set, fragments):
+    """
+    Yields the field nodes of a selection set, expanding inline fragments and
+    fragment spreads.
+    """
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from iter_selected_fields(selection.selection_set, fragments)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                yield from iter_selected_fields(fragment.selection_set, fragments)
+
+
+def get_selected_field_names(info):
+    """
+    Returns the names (not the aliases) of the fields selected on the field
+    being resolved.
+    """
+    return {
+        field_node.name.value
+        for node in info.field_nodes
+        for field_node in iter_selected_fields(node.selection_set, info.fragments)
+    }
+
+
+def get_attribute_resolver(attname):
+    """
+    Returns a resolver reading the ``attname`` attribute of the root, like
+    graphene's default resolver but without its per-call overhead. It is
+    marked so that middlewares can be skipped for it.
+    """
+    get_attribute = attrgetter(attname)
+
+    def attribute_resolver(root, info, **args):
+        if isinstance(root, dict):
+            return root.get(attname)
+        try:
+            return get_attribute(root)
+        except AttributeError:
+            return None
+
+    attribute_resolver._is_attribute_resolver = True
+    attribute_resolver._attname = attname
+    return attribute_resolver
+
+
+def is_attribute_resolver(resolver):
+    return getattr(resolver, "_is_attribute_resolver", False)
+
+
 def bypass_get_queryset(resolver):
     """
     Adds a bypass_get_queryset attribute to the resolver, which is used to
@@ -1,10 +1,18 @@
+import asyncio
 import inspect
 import json
 import re
-
-from django.db import connection, transaction
-from django.http import HttpResponse, HttpResponseNotAllowed
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from weakref import WeakKeyDictionary
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection, connections, transaction
+from django.db.models.query import QuerySet
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.http.response import HttpResponseBadRequest
+from django.middleware.csrf import get_token
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -13,7 +21,9 @@ from graphql import (
     ExecutionResult,
     OperationType,
     execute,
+    get_named_type,
     get_operation_ast,
+    is_leaf_type,
     parse,
     validate_schema,
 )
@@ -22,8 +32,23 @@ from graphql.execution.middleware import MiddlewareManager
 from graphql.validation import validate
 
 from graphene import Schema
-from graphene_django.constants import MUTATION_ERRORS_FLAG
-from graphene_django.utils.utils import set_rollback
+from graphene.relay import Connection
+from graphene.types.resolver import get_default_resolver
+from graphene_django.constants import MUTATION_ERRORS_FLAG, STREAMING_RESPONSE_FLAG
+from graphene_django.encoders import get_json_encoder
+from graphene_django.operation_manifest import load_operation_manifest
+from graphene_django.persisted_queries import (
+    PersistedQueryError,
+    get_persisted_query_hash,
+    resolve_persisted_query,
+)
+from graphene_django.types import DjangoObjectType
+from graphene_django.utils.lru_cache import LRUCache
+from graphene_django.utils.utils import (
+    is_attribute_resolver,
+    maybe_queryset,
+    set_rollback,
+)
 
 from .settings import graphene_settings
 
@@ -51,6 +76,28 @@ def get_accepted_content_types(request):
     ]
 
 
+class AttributeSkippingMiddlewareManager(MiddlewareManager):
+    """
+    Doesn't apply the middlewares to the fields resolved by reading a model
+    attribute, which DjangoObjectType installs for the scalar model fields.
+    Only the ``attribute_middlewares`` are applied to them.
+    """
+
+    def __init__(self, *middlewares, attribute_middlewares=()):
+        super().__init__(*middlewares)
+        self.attribute_middlewares = attribute_middlewares
+        self.attribute_middleware_manager = (
+            MiddlewareManager(*attribute_middlewares) if attribute_middlewares else None
+        )
+
+    def get_field_resolver(self, field_resolver):
+        if is_attribute_resolver(field_resolver):
+            if self.attribute_middleware_manager is None:
+                return field_resolver
+            return self.attribute_middleware_manager.get_field_resolver(field_resolver)
+        return super().get_field_resolver(field_resolver)
+
+
 def instantiate_middleware(middlewares):
     for middleware in middlewares:
         if inspect.isclass(middleware):
@@ -59,6 +106,48 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
+_document_cache = None
+
+
+def get_document_cache():
+    """
+    Returns the process-wide cache of parsed and validated documents, sized
+    according to the ``DOCUMENT_CACHE_SIZE`` setting.
+    """
+    global _document_cache
+    if (
+        _document_cache is None
+        or _document_cache.maxsize != graphene_settings.DOCUMENT_CACHE_SIZE
+    ):
+        _document_cache = LRUCache(graphene_settings.DOCUMENT_CACHE_SIZE)
+    return _document_cache
+
+
+_schema_validation_errors = WeakKeyDictionary()
+
+
+def get_schema_validation_errors(schema):
+    """
+    Validates the GraphQL schema the first time it is used and returns the
+    remembered errors for every subsequent call.
+    """
+    try:
+        return _schema_validation_errors[schema]
+    except KeyError:
+        errors = _schema_validation_errors[schema] = validate_schema(schema)
+        return errors
+
+
+def invalidate_schema_validation(schema):
+    """
+    Forgets the validation state of the GraphQL schema so it is checked again
+    on next use. Call this after mutating a schema in place.
+    """
+    _schema_validation_errors.pop(schema, None)
+    # graphql-core memoizes the result on the schema object as well.
+    schema._validation_errors = None
+
+
 class GraphQLView(View):
     graphiql_template = "graphene/graphiql.html"
 
@@ -94,9 +183,16 @@ class GraphQLView(View):
     root_value = None
     pretty = False
     batch = False
+    streaming = False
+    batch_max_size = None
+    batch_concurrency = None
     subscription_path = None
     execution_context_class = None
     validation_rules = None
+    operation_manifest = None
+    # The documents of the batched operations resolved by
+    # `can_execute_batch_concurrently`, by id of the operation
+    _batch_documents = None
 
     def __init__(
         self,
@@ -106,9 +202,13 @@ class GraphQLView(View):
         graphiql=False,
         pretty=False,
         batch=False,
+        streaming=False,
+        batch_max_size=None,
+        batch_concurrency=None,
         subscription_path=None,
         execution_context_class=None,
         validation_rules=None,
+        operation_manifest=None,
     ):
         if not schema:
             schema = graphene_settings.SCHEMA
@@ -122,10 +222,26 @@ class GraphQLView(View):
                 self.middleware = middleware
             else:
                 self.middleware = list(instantiate_middleware(middleware))
+                if (
+                    self.middleware
+                    and graphene_settings.MIDDLEWARE_SKIP_MODEL_ATTRIBUTES
+                ):
+                    self.middleware = AttributeSkippingMiddlewareManager(
+                        *self.middleware
+                    )
         self.root_value = root_value
         self.pretty = pretty or self.pretty
         self.graphiql = graphiql or self.graphiql
         self.batch = batch or self.batch
+        self.streaming = streaming or self.streaming
+        self.batch_max_size = (
+            batch_max_size or self.batch_max_size or graphene_settings.BATCH_MAX_SIZE
+        )
+        self.batch_concurrency = (
+            batch_concurrency
+            or self.batch_concurrency
+            or graphene_settings.BATCH_CONCURRENCY
+        )
         self.execution_context_class = (
             execution_context_class or self.execution_context_class
         )
@@ -138,6 +254,20 @@ class GraphQLView(View):
         assert not all((graphiql, batch)), "Use either graphiql or batch processing"
 
         self.validation_rules = validation_rules or self.validation_rules
+        self.operation_manifest = operation_manifest or self.operation_manifest
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if (
+            initkwargs.get("operation_manifest")
+            or cls.operation_manifest
+            or graphene_settings.OPERATION_MANIFEST
+        ):
+            # Views are instantiated for every request: parse and validate the
+            # operations when the URLs are loaded rather than on the first one.
+            cls(**initkwargs).compile_operation_manifest()
+        return view
 
     # noinspection PyUnusedLocal
     def get_root_value(self, request):
@@ -152,65 +282,157 @@ class GraphQLView(View):
     @method_decorator(ensure_csrf_cookie)
     def dispatch(self, request, *args, **kwargs):
         try:
-            if request.method.lower() not in ("get", "post"):
-                raise HttpError(
-                    HttpResponseNotAllowed(
-                        ["GET", "POST"], "GraphQL only supports GET and POST requests."
-                    )
-                )
-
-            data = self.parse_body(request)
-            show_graphiql = self.graphiql and self.can_display_graphiql(request, data)
+            data, show_graphiql = self.get_request_data(request)
 
             if show_graphiql:
-                return self.render_graphiql(
-                    request,
-                    # Dependency parameters.
-                    whatwg_fetch_version=self.whatwg_fetch_version,
-                    whatwg_fetch_sri=self.whatwg_fetch_sri,
-                    react_version=self.react_version,
-                    react_sri=self.react_sri,
-                    react_dom_sri=self.react_dom_sri,
-                    graphiql_version=self.graphiql_version,
-                    graphiql_sri=self.graphiql_sri,
-                    graphiql_css_sri=self.graphiql_css_sri,
-                    subscriptions_transport_ws_version=self.subscriptions_transport_ws_version,
-                    subscriptions_transport_ws_sri=self.subscriptions_transport_ws_sri,
-                    graphiql_plugin_explorer_version=self.graphiql_plugin_explorer_version,
-                    graphiql_plugin_explorer_sri=self.graphiql_plugin_explorer_sri,
-                    graphiql_plugin_explorer_css_sri=self.graphiql_plugin_explorer_css_sri,
-                    # The SUBSCRIPTION_PATH setting.
-                    subscription_path=self.subscription_path,
-                    # GraphiQL headers tab,
-                    graphiql_header_editor_enabled=graphene_settings.GRAPHIQL_HEADER_EDITOR_ENABLED,
-                    graphiql_should_persist_headers=graphene_settings.GRAPHIQL_SHOULD_PERSIST_HEADERS,
-                    graphiql_input_value_deprecation=graphene_settings.GRAPHIQL_INPUT_VALUE_DEPRECATION,
-                )
+                return self.render_graphiql(request, **self.get_graphiql_options())
+
+            if self.streaming:
+                setattr(request, STREAMING_RESPONSE_FLAG, True)
 
             if self.batch:
-                responses = [self.get_response(request, entry) for entry in data]
-                result = "[{}]".format(
-                    ",".join([response[0] for response in responses])
-                )
-                status_code = (
-                    responses
-                    and max(responses, key=lambda response: response[1])[1]
-                    or 200
-                )
+                responses = self.get_batch_responses(request, data)
+                result, status_code = self.format_batch_responses(responses)
             else:
                 result, status_code = self.get_response(request, data, show_graphiql)
 
-            return HttpResponse(
-                status=status_code, content=result, content_type="application/json"
-            )
+            return self.get_http_response(result, status_code)
 
         except HttpError as e:
-            response = e.response
-            response["Content-Type"] = "application/json"
-            response.content = self.json_encode(
-                request, {"errors": [self.format_error(e)]}
+            return self.get_error_response(request, e)
+
+    def get_request_data(self, request):
+        if request.method.lower() not in ("get", "post"):
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["GET", "POST"], "GraphQL only supports GET and POST requests."
+                )
+            )
+
+        data = self.parse_body(request)
+        show_graphiql = self.graphiql and self.can_display_graphiql(request, data)
+        return data, show_graphiql
+
+    def get_graphiql_options(self):
+        return {
+            # Dependency parameters.
+            "whatwg_fetch_version": self.whatwg_fetch_version,
+            "whatwg_fetch_sri": self.whatwg_fetch_sri,
+            "react_version": self.react_version,
+            "react_sri": self.react_sri,
+            "react_dom_sri": self.react_dom_sri,
+            "graphiql_version": self.graphiql_version,
+            "graphiql_sri": self.graphiql_sri,
+            "graphiql_css_sri": self.graphiql_css_sri,
+            "subscriptions_transport_ws_version": self.subscriptions_transport_ws_version,
+            "subscriptions_transport_ws_sri": self.subscriptions_transport_ws_sri,
+            "graphiql_plugin_explorer_version": self.graphiql_plugin_explorer_version,
+            "graphiql_plugin_explorer_sri": self.graphiql_plugin_explorer_sri,
+            "graphiql_plugin_explorer_css_sri": self.graphiql_plugin_explorer_css_sri,
+            # The SUBSCRIPTION_PATH setting.
+            "subscription_path": self.subscription_path,
+            # GraphiQL headers tab,
+            "graphiql_header_editor_enabled": graphene_settings.GRAPHIQL_HEADER_EDITOR_ENABLED,
+            "graphiql_should_persist_headers": graphene_settings.GRAPHIQL_SHOULD_PERSIST_HEADERS,
+            "graphiql_input_value_deprecation": graphene_settings.GRAPHIQL_INPUT_VALUE_DEPRECATION,
+        }
+
+    def get_batch_responses(self, request, data):
+        try:
+            if self.can_execute_batch_concurrently(request, data):
+                max_workers = min(self.batch_concurrency, len(data))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    return list(
+                        executor.map(partial(self.get_threaded_response, request), data)
+                    )
+
+            return [self.get_response(request, entry) for entry in data]
+        finally:
+            self._batch_documents = None
+
+    def get_threaded_response(self, request, data):
+        try:
+            return self.get_response(request, data)
+        finally:
+            # Each worker thread opens its own database connections.
+            connections.close_all()
+
+    def can_execute_batch_concurrently(self, request, data):
+        """
+        Batched operations are only executed concurrently when they are all
+        queries and the request isn't wrapped in a transaction, as worker
+        threads use their own database connections.
+        """
+        if not self.batch_concurrency or self.batch_concurrency < 2 or len(data) < 2:
+            return False
+        if connection.in_atomic_block:
+            return False
+
+        # Persisted queries are only looked up once, the documents are reused
+        # to execute the operations
+        self._batch_documents = batch_documents = {}
+        for entry in data:
+            query, _, operation_name, _ = self.get_graphql_params(request, entry)
+            try:
+                document, validation_errors = self.get_document(request, entry, query)
+            except PersistedQueryError as e:
+                batch_documents[id(entry)] = e
+                continue
+            batch_documents[id(entry)] = document, validation_errors
+            if document is None:
+                continue
+            operation_ast = get_operation_ast(document, operation_name)
+            if operation_ast is not None and (
+                operation_ast.operation != OperationType.QUERY
+            ):
+                return False
+        return True
+
+    def format_batch_responses(self, responses):
+        results = [response[0] for response in responses]
+        if self.streaming:
+            result = chain(
+                [b"["],
+                *(
+                    chain([b","], result) if i else result
+                    for i, result in enumerate(results)
+                ),
+                [b"]"],
             )
-            return response
+        elif any(isinstance(result, bytes) for result in results):
+            # `json_encode` may return `str` for some entries, e.g. when
+            # overridden
+            result = (
+                b"["
+                + b",".join(
+                    result.encode() if isinstance(result, str) else result
+                    for result in results
+                )
+                + b"]"
+            )
+        else:
+            result = "[{}]".format(",".join(results))
+        status_code = (
+            responses and max(responses, key=lambda response: response[1])[1] or 200
+        )
+        return result, status_code
+
+    def get_http_response(self, result, status_code):
+        if self.streaming and result is not None:
+            return StreamingHttpResponse(
+                result, status=status_code, content_type="application/json"
+            )
+        return HttpResponse(
+            status=status_code, content=result, content_type="application/json"
+        )
+
+    def get_error_response(self, request, error):
+        response = error.response
+        response["Content-Type"] = "application/json"
+        response.content = self.json_encode(
+            request, {"errors": [self.format_error(error)]}
+        )
+        return response
 
     def get_response(self, request, data, show_graphiql=False):
         query, variables, operation_name, id = self.get_graphql_params(request, data)
@@ -219,6 +441,13 @@ class GraphQLView(View):
             request, data, query, variables, operation_name, show_graphiql
         )
 
+        return self.format_execution_result(
+            request, execution_result, id, show_graphiql
+        )
+
+    def format_execution_result(
+        self, request, execution_result, id=None, show_graphiql=False
+    ):
         if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
             set_rollback()
 
@@ -243,7 +472,12 @@ class GraphQLView(View):
                 response["id"] = id
                 response["status"] = status_code
 
-            result = self.json_encode(request, response, pretty=show_graphiql)
+            if self.streaming:
+                result = self.json_encode_stream(
+                    request, response, pretty=show_graphiql
+                )
+            else:
+                result = self.json_encode(request, response, pretty=show_graphiql)
         else:
             result = None
 
@@ -253,10 +487,16 @@ class GraphQLView(View):
         return render(request, self.graphiql_template, data)
 
     def json_encode(self, request, d, pretty=False):
-        if not (self.pretty or pretty) and not request.GET.get("pretty"):
-            return json.dumps(d, separators=(",", ":"))
+        pretty = bool(self.pretty or pretty or request.GET.get("pretty"))
+        return get_json_encoder().encode(d, pretty=pretty)
 
-        return json.dumps(d, sort_keys=True, indent=2, separators=(",", ": "))
+    def json_encode_stream(self, request, d, pretty=False):
+        pretty = bool(self.pretty or pretty or request.GET.get("pretty"))
+        encoder = get_json_encoder()
+        if pretty:
+            result = encoder.encode(d, pretty=True)
+            return iter([result.encode() if isinstance(result, str) else result])
+        return encoder.iterencode(d)
 
     def parse_body(self, request):
         content_type = self.get_content_type(request)
@@ -280,6 +520,12 @@ class GraphQLView(View):
                     assert (
                         len(request_json) > 0
                     ), "Received an empty list in the batch request."
+                    assert (
+                        not self.batch_max_size
+                        or len(request_json) <= self.batch_max_size
+                    ), "Batch requests may contain at most {} operations.".format(
+                        self.batch_max_size
+                    )
                 else:
                     assert isinstance(
                         request_json, dict
@@ -301,22 +547,50 @@ class GraphQLView(View):
     def execute_graphql_request(
         self, request, data, query, variables, operation_name, show_graphiql=False
     ):
-        if not query:
-            if show_graphiql:
-                return None
-            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+        document, operation_ast, result = self.prepare_graphql_request(
+            request, data, query, operation_name, show_graphiql
+        )
+        if document is None:
+            return result
 
         schema = self.schema.graphql_schema
+        try:
+            execute_options = self.get_execute_options(
+                request, variables, operation_name
+            )
 
-        schema_validation_errors = validate_schema(schema)
-        if schema_validation_errors:
-            return ExecutionResult(data=None, errors=schema_validation_errors)
+            if self.is_atomic_mutation(operation_ast):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
 
-        try:
-            document = parse(query)
+            return execute(schema, document, **execute_options)
         except Exception as e:
             return ExecutionResult(errors=[e])
 
+    def prepare_graphql_request(
+        self, request, data, query, operation_name, show_graphiql=False
+    ):
+        """
+        Runs every check that happens before execution and returns a tuple of
+        ``(document, operation_ast, result)``. When the document is ``None`` the
+        request must not be executed and ``result`` should be returned instead.
+        """
+        try:
+            document, validation_errors = self.get_document(request, data, query)
+        except PersistedQueryError as e:
+            return None, None, ExecutionResult(errors=[e])
+
+        if document is None and validation_errors is None:
+            if show_graphiql:
+                return None, None, None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        if document is None:
+            return None, None, ExecutionResult(errors=validation_errors)
+
         operation_ast = get_operation_ast(document, operation_name)
 
         if (
@@ -325,7 +599,7 @@ class GraphQLView(View):
             and operation_ast.operation != OperationType.QUERY
         ):
             if show_graphiql:
-                return None
+                return None, None, None
 
             raise HttpError(
                 HttpResponseNotAllowed(
@@ -336,46 +610,134 @@ class GraphQLView(View):
                 )
             )
 
-        validation_errors = validate(
-            schema,
-            document,
-            self.validation_rules,
-            graphene_settings.MAX_VALIDATION_ERRORS,
+        if validation_errors:
+            return None, None, ExecutionResult(data=None, errors=validation_errors)
+
+        return document, operation_ast, None
+
+    def get_execute_options(self, request, variables, operation_name):
+        execute_options = {
+            "root_value": self.get_root_value(request),
+            "context_value": self.get_context(request),
+            "variable_values": variables,
+            "operation_name": operation_name,
+            "middleware": self.get_middleware(request),
+        }
+        if self.execution_context_class:
+            execute_options["execution_context_class"] = self.execution_context_class
+        return execute_options
+
+    @staticmethod
+    def is_atomic_mutation(operation_ast):
+        return (
+            operation_ast is not None
+            and operation_ast.operation == OperationType.MUTATION
+            and (
+                graphene_settings.ATOMIC_MUTATIONS is True
+                or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+            )
         )
 
-        if validation_errors:
-            return ExecutionResult(data=None, errors=validation_errors)
+    def get_document(self, request, data, query):
+        """
+        Returns a tuple of the parsed document of the request and its
+        validation errors, or ``(None, None)`` if no query was provided. The
+        document is ``None`` when the schema itself is invalid, with the errors
+        of the schema. Persisted queries and manifest operations are resolved
+        here and raise a ``PersistedQueryError`` when they can't be found.
+        """
+        if self._batch_documents is not None:
+            try:
+                batch_document = self._batch_documents.pop(id(data))
+            except KeyError:
+                pass
+            else:
+                if isinstance(batch_document, PersistedQueryError):
+                    raise batch_document
+                return batch_document
 
-        try:
-            execute_options = {
-                "root_value": self.get_root_value(request),
-                "context_value": self.get_context(request),
-                "variable_values": variables,
-                "operation_name": operation_name,
-                "middleware": self.get_middleware(request),
-            }
-            if self.execution_context_class:
-                execute_options[
-                    "execution_context_class"
-                ] = self.execution_context_class
-
-            if (
-                operation_ast is not None
-                and operation_ast.operation == OperationType.MUTATION
-                and (
-                    graphene_settings.ATOMIC_MUTATIONS is True
-                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
-                )
-            ):
-                with transaction.atomic():
-                    result = execute(schema, document, **execute_options)
-                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
-                        transaction.set_rollback(True)
-                return result
+        schema = self.schema.graphql_schema
+        extensions = self.get_graphql_extensions(request, data)
 
-            return execute(schema, document, **execute_options)
+        manifest = self.get_operation_manifest()
+        if manifest is None:
+            query = resolve_persisted_query(extensions, query)
+            if not query:
+                return None, None
+
+        # Documents can't be validated against an invalid schema
+        schema_validation_errors = get_schema_validation_errors(schema)
+        if schema_validation_errors:
+            return None, schema_validation_errors
+
+        if manifest is not None:
+            # Only operations of the manifest are allowed, the query text sent
+            # by the client is ignored.
+            return manifest.get_document(
+                get_persisted_query_hash(extensions),
+                schema,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+        return self.parse_and_validate(schema, query)
+
+    def get_operation_manifest(self):
+        manifest = self.operation_manifest or graphene_settings.OPERATION_MANIFEST
+        if isinstance(manifest, str):
+            manifest = load_operation_manifest(manifest)
+        return manifest
+
+    def compile_operation_manifest(self):
+        manifest = self.get_operation_manifest()
+        if manifest is not None and not get_schema_validation_errors(
+            self.schema.graphql_schema
+        ):
+            manifest.compile(
+                self.schema.graphql_schema,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+
+    def parse_and_validate(self, schema, query):
+        """
+        Parses and validates the query against the schema, returning a tuple of
+        the document (``None`` if the query could not be parsed) and the list
+        of errors. Results are cached by query text and validation rules when
+        the ``DOCUMENT_CACHE_ENABLED`` setting is on, for queries not longer
+        than ``DOCUMENT_CACHE_MAX_QUERY_LENGTH``.
+        """
+        cache = None
+        max_length = graphene_settings.DOCUMENT_CACHE_MAX_QUERY_LENGTH
+        if graphene_settings.DOCUMENT_CACHE_ENABLED and (
+            max_length is None or len(query) <= max_length
+        ):
+            cache = get_document_cache()
+            cache_key = (
+                schema,
+                query,
+                tuple(self.validation_rules or ()),
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            document = parse(query)
         except Exception as e:
-            return ExecutionResult(errors=[e])
+            result = (None, [e])
+        else:
+            validation_errors = validate(
+                schema,
+                document,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+            result = (document, validation_errors)
+
+        if cache is not None:
+            cache.set(cache_key, result)
+        return result
 
     @classmethod
     def can_display_graphiql(cls, request, data):
@@ -419,6 +781,18 @@ class GraphQLView(View):
 
         return query, variables, operation_name, id
 
+    @staticmethod
+    def get_graphql_extensions(request, data):
+        extensions = request.GET.get("extensions") or data.get("extensions")
+
+        if extensions and isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except Exception:
+                raise HttpError(HttpResponseBadRequest("Extensions are invalid JSON."))
+
+        return extensions
+
     @staticmethod
     def format_error(error):
         if isinstance(error, GraphQLError):
@@ -431,3 +805,238 @@ class GraphQLView(View):
         meta = request.META
         content_type = meta.get("CONTENT_TYPE", meta.get("HTTP_CONTENT_TYPE", ""))
         return content_type.split(";", 1)[0].lower()
+
+
+class SyncToAsyncMiddleware:
+    """
+    Runs synchronous resolvers through ``sync_to_async`` so they can use the
+    Django ORM from an async view. Fields with an async resolver are resolved
+    inline, as are the leaf fields known not to touch the database: the
+    concrete model columns already loaded on the instance, and the fields of
+    the relay connections.
+
+    It must be the innermost middleware, i.e. the first one, so that ``next``
+    is the resolver of the field rather than another middleware.
+    """
+
+    _inline_fields = {}
+    _async_fields = {}
+
+    def __init__(self, thread_sensitive=True):
+        self.thread_sensitive = thread_sensitive
+
+    def resolve(self, next, root, info, **args):
+        if self.is_async_field(info) or self.is_inline_field(info, root):
+            return next(root, info, **args)
+        return self.resolve_async(next, root, info, **args)
+
+    async def resolve_async(self, next, root, info, **args):
+        result = await sync_to_async(
+            self.resolve_sync, thread_sensitive=self.thread_sensitive
+        )(next, root, info, **args)
+        if inspect.isawaitable(result):
+            # A sync wrapper of an async resolver
+            result = await result
+        return result
+
+    @staticmethod
+    def resolve_sync(next, root, info, **args):
+        result = maybe_queryset(next(root, info, **args))
+        if isinstance(result, QuerySet) or inspect.isgenerator(result):
+            # Evaluate the queryset while we're still in the sync thread
+            result = list(result)
+        return result
+
+    @classmethod
+    def is_async_field(cls, info):
+        key = (info.parent_type, info.field_name)
+        try:
+            return cls._async_fields[key]
+        except KeyError:
+            pass
+
+        resolver = info.parent_type.fields[info.field_name].resolve
+        is_async = resolver is not None and inspect.iscoroutinefunction(
+            inspect.unwrap(resolver)
+        )
+        cls._async_fields[key] = is_async
+        return is_async
+
+    @classmethod
+    def is_inline_field(cls, info, root):
+        key = (info.parent_type, info.field_name)
+        try:
+            inline = cls._inline_fields[key]
+        except KeyError:
+            inline = cls._inline_fields[key] = cls.get_inline_field(info)
+        if isinstance(inline, str):
+            # Reading a deferred column would query the database
+            return inline in getattr(root, "__dict__", ())
+        return inline
+
+    @staticmethod
+    def get_inline_field(info):
+        """
+        Returns the attname of the model column read by the field, True if the
+        field can always be resolved inline or False if it must be resolved
+        through ``sync_to_async``.
+        """
+        if info.path.prev is None or not is_leaf_type(get_named_type(info.return_type)):
+            return False
+
+        resolver = info.parent_type.fields[info.field_name].resolve
+        if resolver is None:
+            name = info.field_name
+        else:
+            resolver = inspect.unwrap(resolver)
+            if is_attribute_resolver(resolver):
+                name = resolver._attname
+            elif (
+                isinstance(resolver, partial)
+                and resolver.func is get_default_resolver()
+            ):
+                name = resolver.args[0]
+            else:
+                return False
+
+        graphene_type = getattr(info.parent_type, "graphene_type", None)
+        if not inspect.isclass(graphene_type):
+            return False
+        if any(
+            base.__module__ == Connection.__module__ for base in graphene_type.__mro__
+        ):
+            # The connections, edges and page infos only hold the values
+            # computed by the connection resolver
+            return True
+        if not issubclass(graphene_type, DjangoObjectType):
+            return False
+        # Model properties and methods may query the database
+        for field in graphene_type._meta.model._meta.concrete_fields:
+            if not field.is_relation and name in (field.name, field.attname):
+                return field.attname
+        return False
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class AsyncGraphQLView(GraphQLView):
+    """
+    An async version of ``GraphQLView`` to serve GraphQL requests from an
+    ASGI worker. Requests are parsed, batched and rendered exactly like the
+    sync view, but execution is awaited so async resolvers of independent
+    fields run concurrently, while sync resolvers are run through
+    ``sync_to_async``.
+    """
+
+    view_is_async = True
+    # Passed to ``sync_to_async`` when running sync resolvers.
+    thread_sensitive = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Same as the ensure_csrf_cookie decorator of the sync view.
+        get_token(request)
+        try:
+            data, show_graphiql = self.get_request_data(request)
+
+            if show_graphiql:
+                return self.render_graphiql(request, **self.get_graphiql_options())
+
+            if self.streaming:
+                setattr(request, STREAMING_RESPONSE_FLAG, True)
+
+            if self.batch:
+                responses = await self.get_batch_responses(request, data)
+                result, status_code = self.format_batch_responses(responses)
+            else:
+                result, status_code = await self.get_response(
+                    request, data, show_graphiql
+                )
+
+            return self.get_http_response(result, status_code)
+
+        except HttpError as e:
+            return self.get_error_response(request, e)
+
+    async def get_batch_responses(self, request, data):
+        try:
+            if not self.can_execute_batch_concurrently(request, data):
+                return [await self.get_response(request, entry) for entry in data]
+
+            semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+            async def get_response(entry):
+                async with semaphore:
+                    return await self.get_response(request, entry)
+
+            return await asyncio.gather(*[get_response(entry) for entry in data])
+        finally:
+            self._batch_documents = None
+
+    async def get_response(self, request, data, show_graphiql=False):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        execution_result = await self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+
+        return self.format_execution_result(
+            request, execution_result, id, show_graphiql
+        )
+
+    def get_middleware(self, request):
+        middleware = super().get_middleware(request)
+        # The innermost middleware, wrapping the resolvers of the fields
+        sync_to_async_middleware = SyncToAsyncMiddleware(self.thread_sensitive)
+        if isinstance(middleware, AttributeSkippingMiddlewareManager):
+            # The attribute resolvers still need to be run off the event loop
+            # when they read a deferred column
+            return type(middleware)(
+                sync_to_async_middleware,
+                *middleware.middlewares,
+                attribute_middlewares=(
+                    sync_to_async_middleware,
+                    *middleware.attribute_middlewares,
+                ),
+            )
+        if isinstance(middleware, MiddlewareManager):
+            return type(middleware)(sync_to_async_middleware, *middleware.middlewares)
+        return [sync_to_async_middleware, *(middleware or ())]
+
+    async def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        document, operation_ast, result = self.prepare_graphql_request(
+            request, data, query, operation_name, show_graphiql
+        )
+        if document is None:
+            return result
+
+        schema = self.schema.graphql_schema
+        try:
+            execute_options = self.get_execute_options(
+                request, variables, operation_name
+            )
+
+            if self.is_atomic_mutation(operation_ast):
+                return await sync_to_async(
+                    self.execute_atomic_mutation, thread_sensitive=True
+                )(request, schema, document, execute_options)
+
+            result = execute(schema, document, **execute_options)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    @staticmethod
+    def execute_atomic_mutation(request, schema, document, execute_options):
+        with transaction.atomic():
+            result = execute(schema, document, **execute_options)
+            if inspect.isawaitable(result):
+                result = async_to_sync(_await)(result)
+            if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                transaction.set_rollback(True)
+        return result